@@ -17,6 +17,8 @@ rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
 sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
 from wbgyr import cmap_wbgyr
+from pyio.layers import LayerFrames,read_modes
+from pyio.render import render_frames
 
 # Ensure latex fonts throughout:
 rc('font',**{'family': 'Times New Roman'})
@@ -75,43 +77,17 @@ def contint(fmin,fmax):
 
     return ci
 
-#=================================================================
-# Function to calculate global min and max for a field across all frames
-def get_layer_min_max(field_data,is_pv=False):
-    layer_min=np.full(nz, np.inf)
-    layer_max=np.full(nz,-np.inf)
-    data_array=np.zeros((nx,ny,nz,nt))
-
-    for frame in range(nt):
-        for iz in range(nz):
-            if option=="m":
-                # Project data onto vertical modes:
-                for jz in range(nz):
-                    offset=frame*N+jz*NH+1
-                    data_array[:,:,iz,frame]+=vec[jz,iz]*field_data[offset:offset+NH].reshape(nx,ny)
-                if is_pv and pv_vis=="a" and iz==0:
-                    data_array[:,:,0,frame]=data_array[:,:,0,frame]-bety
-
-            else:
-                # Use existing layer data:
-                offset=frame*N+iz*NH+1
-                data_array[:,:,iz,frame]=field_data[offset:offset+NH].reshape(nx,ny)
-                if is_pv and pv_vis=="a":
-                    data_array[:,:,iz,frame]=data_array[:,:,iz,frame]-bety
-
-            layer_min[iz]=min(layer_min[iz],np.min(data_array[:,:,iz,frame]))
-            layer_max[iz]=max(layer_max[iz],np.max(data_array[:,:,iz,frame]))
-
-    return layer_min,layer_max,data_array
-
 # Ensure the script is called with the correct number of arguments
-if len(sys.argv) != 3:
-    print("Usage: ./image_sequence.py <PV option: a/t> <View option: l/m>")
+if len(sys.argv) not in (3,4):
+    print("Usage: ./image_sequence.py <PV option: a/t> <View option: l/m> [<number of processes>]")
     sys.exit(1)
 
 # Read the arguments
 pv_vis = sys.argv[1].lower()  # First argument: PV option ('a' or 't')
 option = sys.argv[2].lower()  # Second argument: View option ('l' or 'm')
+# Optional third argument: number of processes used to render the
+# images (default: all available cores)
+nproc = int(sys.argv[3]) if len(sys.argv) == 4 else None
 
 # Validate the arguments
 if pv_vis not in ['a', 't']:
@@ -163,39 +139,26 @@ with open('evolution/energy.asc','r') as in_file:
 tsim=time[-1]
 
 # Read in vertical mode matrix if required:
-vec=np.empty((nz,nz))
+vec=None
 if option == "m":
-    in_file=open('modes.asc','r')
-    for m in range(nz):
-        line=in_file.readline()
-    for m in range(nz):
-        for iz in range(nz):
-            line=in_file.readline()
-            string=line.split()
-            vec[iz,m]=string[0]
-    in_file.close()
+    vec=read_modes('modes.asc',nz)
+
+# Background PV (beta*y) removed to show the PV anomaly, from every
+# layer or, when viewing modes, from the first mode only:
+qq_back=None
+if pv_vis == "a":
+    qq_back=np.zeros((nz,nx,ny))
+    if option == "m":
+        qq_back[0]=bety
+    else:
+        qq_back[:]=bety
 
 #=================================================================
-# Set up figure:
 # Layout is nz rows and 3 columns:
 nrow=nz
 ncol=3
 nim=nrow*ncol
 
-# The following figure might need to be adjusted depending on the problem
-fig,ax=plt.subplots(figsize=[12+1*(nz>2),1+3*nrow],nrows=nrow,ncols=ncol)
-ax=ax.flatten()
-
-# Set up an array to store all images to be plotted:
-d=np.empty((nim,nx,ny))
-
-# Number of horizontal grid points:
-NH=nx*ny
-
-# Total number of data elements per time frame:
-N=nz*NH+1
-# The "+1" includes the time element
-
 # Field titles over each column:
 field=['$\\psi$','$q$','$\\zeta$']
 
@@ -203,37 +166,29 @@ min_vals=np.full((nz,ncol), np.inf)
 max_vals=np.full((nz,ncol),-np.inf)
 
 #=================================================================
-# Read streamfunction data into array for plotting:
-with open('evolution/pp.r4','rb') as in_file:
-    pp_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read PV data into array for plotting:
-with open('evolution/qq.r4','rb') as in_file:
-    qq_array=np.fromfile(in_file,dtype=np.float32)
+# Memory-map the streamfunction, PV and relative vorticity data; each
+# frame is read (and projected onto the modes if required) when used:
+pp_array=LayerFrames('evolution/pp.r4',nz,nx,ny,vec)
+qq_array=LayerFrames('evolution/qq.r4',nz,nx,ny,vec,qq_back)
+zz_array=LayerFrames('evolution/zz.r4',nz,nx,ny,vec)
 
-# Read relative vorticity data into array for plotting:
-with open('evolution/zz.r4','rb') as in_file:
-    zz_array=np.fromfile(in_file,dtype=np.float32)
+nt=len(pp_array)
 
-nt=len(pp_array) // N
+# Find the min/max values in each layer over all frames:
+min_vals[:,0],max_vals[:,0]=pp_array.min_max()
+min_vals[:,1],max_vals[:,1]=qq_array.min_max()
+min_vals[:,2],max_vals[:,2]=zz_array.min_max()
 
-min_vals[:,0],max_vals[:,0],pp_array=get_layer_min_max(pp_array)
-min_vals[:,1],max_vals[:,1],qq_array=get_layer_min_max(qq_array,True)
-min_vals[:,2],max_vals[:,2],zz_array=get_layer_min_max(zz_array)
-
-im=[] # To store the images
-cbar=[] # To store the colorbars
-cax=[0]*nim
+# Work out the colour limits and colourbar ticks of each image from
+# the overall min/max values:
 zmin_arr=[0]*nim
 zmax_arr=[0]*nim
 clevels_arr=[[] for _ in range(nim)]
 
 for j in range(nim):
-    ax[j].set_aspect('equal')
     row=int(j/ncol)
     col=j-ncol*row
 
-    # Work out the overall min/max values:
     zmin=min_vals[row,col]
     zmax=max_vals[row,col]
 
@@ -246,61 +201,85 @@ for j in range(nim):
     z=dz*float(jj)
     clevels_arr[j]=np.linspace(-z,z,max(3,jj+1))
 
-    ax[j].set_xlim([xmin,xmax])
-    ax[j].set_ylim([ymin,ymax])
-
-    # Label x axis only for images in the bottom row:
-    if row < nz - 1:
-        plt.setp(ax[j].get_xticklabels(),visible=False)
-    else:
-        ax[j].set_xlabel('$x$',fontsize=20)
-
-    # Label y axis only for images in the leftmost column:
-    if col > 0:
-        plt.setp(ax[j].get_yticklabels(),visible=False)
-    else:
-        ax[j].set_ylabel('$y$',fontsize=20)
-
-    if row == 0:
-        ax[j].set_title(field[col],fontsize=36)
-
-    # Initialize imshow with placeholder data
-    img=ax[j].imshow( np.zeros((nx,ny)).T,cmap=cmap_wbgyr(),vmin=zmin_arr[j],vmax=zmax_arr[j],
-                      extent=(xmin,xmax,ymin,ymax),origin='lower',interpolation='bilinear' )
-
-    # Create colorbar for each subplot (only once)
-    divider=make_axes_locatable(ax[j])
-    cax[j]=divider.append_axes("right",size="4%",pad=0.1)
-    cbar_j=fig.colorbar(img,cax=cax[j],ticks=clevels_arr[j])
-
-    im.append(img)
-    cbar.append(cbar_j)
-
-#=========================================================================
-# Adjust figure size to make it divisible by 2
-# Get the current size of the figure in pixels
-fig.canvas.draw()
-width,height=fig.canvas.get_width_height()
+#=================================================================
+def setup_figure():
+    # Sets up the figure, with a placeholder image in each panel, in each
+    # rendering process.
 
-# Check if width and height are divisible by 2
-new_width=width if width % 2 == 0 else width-1
-new_height=height if height % 2 == 0 else height-1
+    # The following figure might need to be adjusted depending on the problem
+    fig,ax=plt.subplots(figsize=[12+1*(nz>2),1+3*nrow],nrows=nrow,ncols=ncol)
+    ax=ax.flatten()
 
-# Resize the figure if necessary
-if new_width != width or new_height != height:
-    fig.set_size_inches(new_width/fig.dpi,new_height/fig.dpi)
-#=========================================================================
+    im=[] # To store the images
+    cax=[0]*nim
 
-t=0.0
-while t<=tsim:
-    frame=int(t/dtsave+0.5)
+    for j in range(nim):
+        ax[j].set_aspect('equal')
+        row=int(j/ncol)
+        col=j-ncol*row
+
+        ax[j].set_xlim([xmin,xmax])
+        ax[j].set_ylim([ymin,ymax])
+
+        # Label x axis only for images in the bottom row:
+        if row < nz - 1:
+            plt.setp(ax[j].get_xticklabels(),visible=False)
+        else:
+            ax[j].set_xlabel('$x$',fontsize=20)
+
+        # Label y axis only for images in the leftmost column:
+        if col > 0:
+            plt.setp(ax[j].get_yticklabels(),visible=False)
+        else:
+            ax[j].set_ylabel('$y$',fontsize=20)
+
+        if row == 0:
+            ax[j].set_title(field[col],fontsize=36)
+
+        # Initialize imshow with placeholder data
+        img=ax[j].imshow( np.zeros((nx,ny)).T,cmap=cmap_wbgyr(),vmin=zmin_arr[j],vmax=zmax_arr[j],
+                          extent=(xmin,xmax,ymin,ymax),origin='lower',interpolation='bilinear' )
+
+        # Create colorbar for each subplot (only once)
+        divider=make_axes_locatable(ax[j])
+        cax[j]=divider.append_axes("right",size="4%",pad=0.1)
+        fig.colorbar(img,cax=cax[j],ticks=clevels_arr[j])
+
+        im.append(img)
+
+    #=====================================================================
+    # Adjust figure size to make it divisible by 2
+    # Get the current size of the figure in pixels
+    fig.canvas.draw()
+    width,height=fig.canvas.get_width_height()
+
+    # Check if width and height are divisible by 2
+    new_width=width if width % 2 == 0 else width-1
+    new_height=height if height % 2 == 0 else height-1
+
+    # Resize the figure if necessary
+    if new_width != width or new_height != height:
+        fig.set_size_inches(new_width/fig.dpi,new_height/fig.dpi)
+    #=====================================================================
+
+    return fig,im
+
+def render_frame(state,frame):
+    # Plots all layers at one time and saves the image:
+    fig,im=state
+    t=frame_times[frame]
     fig.suptitle(f"Time: {t:05.1f}", fontsize=24)
 
+    # Set up an array to store all images to be plotted:
+    d=np.empty((nim,nx,ny))
+    pp=pp_array[frame]
+    qq=qq_array[frame]
+    zz=zz_array[frame]
     for iz in range(nz):
         i=ncol*iz
-        d[i  ,:,:]=pp_array[:,:,iz,frame]
-        d[i+1,:,:]=qq_array[:,:,iz,frame]
-        d[i+2,:,:]=zz_array[:,:,iz,frame]
+        d[i  ,:,:]=pp[iz]
+        d[i+1,:,:]=qq[iz]
+        d[i+2,:,:]=zz[iz]
 
     for j in range(nim):
         im[j].set_data(d[j].T)
@@ -308,4 +287,15 @@ while t<=tsim:
 
     fig.subplots_adjust(wspace=0.0,hspace=0.0)
     fig.savefig(f"{frame:04d}.png",dpi=150)
+
+#=================================================================
+# Frames to render and the corresponding times:
+frame_times={}
+t=0.0
+while t<=tsim:
+    frame=int(t/dtsave+0.5)
+    frame_times[frame]=t
     t+=dtsave
+
+# Render the frames, shared out over the available processes:
+render_frames(setup_figure,render_frame,frame_times,nproc)
@@ -4,7 +4,9 @@
 # This script calculates the PV measure in each layer, defined to be
 # the fractional area of the domain with PV above a given threshold.
 # We use ncontq discrete thresholds spanning the range [q_min,q_max],
-# where ncontq is read from parameters.f90.
+# where ncontq is read from parameters.f90.  With the -g option, the
+# thresholds span the range over all times, rather than the range at
+# each time, so that the results at different times can be compared.
 
 # Outputs the results (for all times saved in qq.r4) in the file
 # evolution/far.asc. This is an ascii file containing the following:
@@ -20,10 +22,22 @@
 #  @@@@   Run from the current job directory   @@@@
 #==================================================
 
-import sys
+import sys,os
 import warnings
 import numpy as np
 import matplotlib.pyplot as plt
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.render import render_frames
+from pyio.layers import LayerFrames,area_distribution
+
+# Optional arguments: the number of processes used (default: all
+# available cores) and -g to use the same PV thresholds, spanning the
+# min/max values in each layer over all times, at all times:
+args=sys.argv[1:]
+global_bins='-g' in args
+if global_bins:
+    args.remove('-g')
+nproc = int(args[0]) if args else None
 
 #-------------------------------------------------------
 # Extract nx, ny, nz and ncontq from src/parameters.f90:
@@ -43,14 +57,6 @@ with open('src/parameters.f90','r') as in_file:
 nx=nx+1
 ny=ny+1
 
-# Number of horizontal grid points:
-NH=nx*ny
-da=1.0/float(NH)
-
-# Total number of data elements per time frame:
-N=nz*NH+1
-# The "+1" includes the time element.
-
 #=================================================================
 # Read energy data to get the data save times:
 in_file=open('evolution/energy.asc','r')
@@ -60,118 +66,80 @@ in_file.close()
 # Number of times in the data:
 nt=len(time)
 
-# Read all PV data into an array for processing:
-with open('evolution/qq.r4','rb') as in_file:
-    qq_array=np.fromfile(in_file,dtype=np.float32)
-
-print(' Determining min/max values for each layer.')
-
-global_farea_min = float('inf')
-global_farea_max = float('-inf')
-
-global_qmin = [float('inf')] * nz
-global_qmax = [float('-inf')] * nz
-
-for frame in range(nt):
-    offset=frame*N
-    for iz in range(nz):
-        q = qq_array[offset + iz * NH + 1:offset + (iz + 1) * NH + 1]
-        qmin = np.min(q)
-        qmax = np.max(q)
-        global_qmin[iz] = min(global_qmin[iz], qmin)
-        global_qmax[iz] = max(global_qmax[iz], qmax)
-
-        dq = (qmax - qmin) / float(nq)
-        dqi = 1.0 / dq
-
-        qmin = qmin - dq / 2.0
-        qmax = qmax + dq / 2.0
-
-        farea = np.zeros([nq + 1])
-        for i in range(NH):
-            k = int(dqi * (q[i] - qmin))
-            farea[k] += da
-
-        for k in range(1, nq + 1):
-            farea[k] += farea[k - 1]
-
-        global_farea_min = min(global_farea_min, np.min(farea))
-        global_farea_max = max(global_farea_max, np.max(farea))
-
-qmax_values = [[] for _ in range(nz)]
-qmin_values = [[] for _ in range(nz)]
+# Memory-map the PV data:
+qq_array=LayerFrames('evolution/qq.r4',nz,nx,ny)
+
+bins=None
+if global_bins:
+    print(' Determining min/max values for each layer.')
+    bins=qq_array.min_max()
+
+# Compute the PV measure of each layer at all times, using thresholds
+# spanning the min/max values at each time (or over all times):
+print(' Computing the PV measure at all times.')
+qmin_values,qmax_values,farea_values=area_distribution(qq_array,nq,bins,nproc or os.cpu_count() or 1)
+qmin_values=qmin_values[0:nt].T
+qmax_values=qmax_values[0:nt].T
+farea_values=farea_values[0:nt]
+
+global_qmin=qmin_values.min(axis=1)
+global_qmax=qmax_values.max(axis=1)
+global_farea_min=farea_values.min()
+global_farea_max=farea_values.max()
+
+# Write the results:
+with open('evolution/far.asc','w') as diag_file:
+    for frame in range(nt):
+        print(time[frame], file=diag_file)
+        for iz in range(nz):
+            print(farea_values[frame,iz], file=diag_file)
 
-# Open output file:
-diag_file = open('evolution/far.asc','w+')
-
-# Loop over all times in the data:
-for frame in range(nt):
-    print(time[frame], file=diag_file)
-    print(' Processing t =',time[frame])
-
-    # Create a new figure for this time frame:
-    plt.figure(figsize=(10,5*nz))
-
-    # Process each layer in turn:
-    offset=frame*N
+#=================================================================
+def setup_figure():
+    # Sets up the figure, with axes, labels and (empty) lines for each
+    # layer, in each rendering process:
+    fig=plt.figure(figsize=(10,5*nz))
+    farea_lines=[]
+    qmax_lines=[]
+    qmin_lines=[]
+    titles=[]
     for iz in range(nz):
-        # Extract PV field in each layer:
-        q=qq_array[offset+iz*NH+1:offset+(iz+1)*NH+1]
-
-        # Compute min/max values of PV:
-        qmin=np.min(q)
-        qmax=np.max(q)
-
-        qmin_values[iz].append(qmin)
-        qmax_values[iz].append(qmax)
-
-        dq=(qmax-qmin)/float(nq)
-        dqi=1.0/dq
-
-        # Increase range to catch min/max values correctly in PV measure:
-        qmin=qmin-dq/2.0
-        qmax=qmax+dq/2.0
-
-        # Count number of grid points having PV in each interval
-        # [qmin+k*dq,qmin+(k+1)*dq):
-        farea=np.zeros([nq+1])
-        for i in range(NH):
-            k=int(dqi*(q[i]-qmin))
-            farea[k]+=da # da = 1/NH
-
-        # Form cumulative PDF:
-        for k in range(nq+1):
-            farea[k]+=farea[k-1]
-
-        # Write data for this iz:
-        print(farea, file=diag_file)
-
         # Plot farea for this layer and time frame:
-        plt.subplot(nz,2,iz*2+1)
-        plt.plot(range(nq + 1), farea)
-        plt.xlabel('Threshold Index')
-        plt.ylabel('Fractional Area')
-        plt.title(f'farea at t={time[frame]:.2f}, Layer {iz + 1}')
-        plt.xlim(0, nq)
-        plt.ylim(global_farea_min, global_farea_max)
-        plt.grid()
+        ax=fig.add_subplot(nz,2,iz*2+1)
+        farea_lines.append(ax.plot(range(nq + 1), np.zeros(nq + 1))[0])
+        ax.set_xlabel('Threshold Index')
+        ax.set_ylabel('Fractional Area')
+        titles.append(ax.set_title(f'farea at t={time[0]:.2f}, Layer {iz + 1}'))
+        ax.set_xlim(0, nq)
+        ax.set_ylim(global_farea_min, global_farea_max)
+        ax.grid()
 
         # Plot qmax and qmin evolution for all layers:
-        plt.subplot(nz,2,iz*2+2)
-        plt.plot(time[:frame + 1], qmax_values[iz])
-        plt.plot(time[:frame + 1], qmin_values[iz])
-        plt.xlabel('Time')
-        plt.ylabel('qmax / qmin')
-        plt.title('Evolution of qmax and qmin')
-        plt.xlim(time[0], time[-1])
-        plt.ylim(global_qmin[iz], global_qmax[iz])
+        ax=fig.add_subplot(nz,2,iz*2+2)
+        qmax_lines.append(ax.plot(time[:1], qmax_values[iz,:1])[0])
+        qmin_lines.append(ax.plot(time[:1], qmin_values[iz,:1])[0])
+        ax.set_xlabel('Time')
+        ax.set_ylabel('qmax / qmin')
+        ax.set_title('Evolution of qmax and qmin')
+        ax.set_xlim(time[0], time[-1])
+        ax.set_ylim(global_qmin[iz], global_qmax[iz])
+    fig.tight_layout()
+    return fig,farea_lines,qmax_lines,qmin_lines,titles
+
+def render_frame(state,frame):
+    # Updates the figure for one time frame and saves it:
+    fig,farea_lines,qmax_lines,qmin_lines,titles=state
+    for iz in range(nz):
+        farea_lines[iz].set_ydata(farea_values[frame,iz,:])
+        titles[iz].set_text(f'farea at t={time[frame]:.2f}, Layer {iz + 1}')
+        qmax_lines[iz].set_data(time[:frame + 1], qmax_values[iz,:frame + 1])
+        qmin_lines[iz].set_data(time[:frame + 1], qmin_values[iz,:frame + 1])
 
     # Save the plot for this time frame:
-    plt.tight_layout()
-    plt.savefig(f'{frame:04d}.png')
-    plt.close()
+    fig.savefig(f'{frame:04d}.png')
 
-diag_file.close()
+# Render the plots, shared out over the available processes:
+render_frames(setup_figure,render_frame,range(nt),nproc)
 
 print()
 print(' All done. Results are in evolution/far.asc')
@@ -17,6 +17,7 @@ rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
 sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
 from wbgyr import cmap_wbgyr
+from pyio.layers import LayerFrames,read_modes
 
 # Ensure latex fonts throughout:
 rc('font',**{'family': 'Times New Roman'})
@@ -75,35 +76,6 @@ def contint(fmin,fmax):
 
     return ci
 
-#=================================================================
-# Function to calculate global min and max for a field across all frames
-def get_layer_min_max(field_data,is_pv=False):
-    layer_min=np.full(nz, np.inf)
-    layer_max=np.full(nz,-np.inf)
-    data_array=np.zeros((nx,ny,nz,nt))
-
-    for frame in range(nt):
-        for iz in range(nz):
-            if option=="m":
-                # Project data onto vertical modes:
-                for jz in range(nz):
-                    offset=frame*N+jz*NH+1
-                    data_array[:,:,iz,frame]+=vec[jz,iz]*field_data[offset:offset+NH].reshape(nx,ny)
-                if is_pv and pv_vis=="a" and iz==0:
-                    data_array[:,:,0,frame]=data_array[:,:,0,frame]-bety
-
-            else:
-                # Use existing layer data:
-                offset=frame*N+iz*NH+1
-                data_array[:,:,iz,frame]=field_data[offset:offset+NH].reshape(nx,ny)
-                if is_pv and pv_vis=="a":
-                    data_array[:,:,iz,frame]=data_array[:,:,iz,frame]-bety
-
-            layer_min[iz]=min(layer_min[iz],np.min(data_array[:,:,iz,frame]))
-            layer_max[iz]=max(layer_max[iz],np.max(data_array[:,:,iz,frame]))
-
-    return layer_min,layer_max,data_array
-
 # Ensure the script is called with the correct number of arguments
 if len(sys.argv) != 3:
     print("Usage: ./p_temporal_avg.py <PV option: a/t> <View option: l/m>")
@@ -163,17 +135,19 @@ with open('evolution/energy.asc','r') as in_file:
 tsim=time[-1]
 
 # Read in vertical mode matrix if required:
-vec=np.empty((nz,nz))
+vec=None
 if option == "m":
-    in_file=open('modes.asc','r')
-    for m in range(nz):
-        line=in_file.readline()
-    for m in range(nz):
-        for iz in range(nz):
-            line=in_file.readline()
-            string=line.split()
-            vec[iz,m]=string[0]
-    in_file.close()
+    vec=read_modes('modes.asc',nz)
+
+# Background PV (beta*y) removed to show the PV anomaly, from every
+# layer or, when viewing modes, from the first mode only:
+qq_back=None
+if pv_vis == "a":
+    qq_back=np.zeros((nz,nx,ny))
+    if option == "m":
+        qq_back[0]=bety
+    else:
+        qq_back[:]=bety
 
 #=================================================================
 # Set up figure:
@@ -189,13 +163,6 @@ ax=ax.flatten()
 # Set up an array to store all images to be plotted:
 d=np.empty((nim,nx,ny))
 
-# Number of horizontal grid points:
-NH=nx*ny
-
-# Total number of data elements per time frame:
-N=nz*NH+1
-# The "+1" includes the time element
-
 # Field titles over each column:
 field=['$\\psi$','$q$','$\\zeta$']
 
@@ -203,29 +170,27 @@ min_vals=np.full((nz,ncol), np.inf)
 max_vals=np.full((nz,ncol),-np.inf)
 
 #=================================================================
-# Read streamfunction data into array for plotting:
-with open('evolution/pp.r4','rb') as in_file:
-    pp_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read PV data into array for plotting:
-with open('evolution/qq.r4','rb') as in_file:
-    qq_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read relative vorticity data into array for plotting:
-with open('evolution/zz.r4','rb') as in_file:
-    zz_array=np.fromfile(in_file,dtype=np.float32)
+# Memory-map the streamfunction, PV and relative vorticity data; each
+# frame is read (and projected onto the modes if required) when used:
+pp_array=LayerFrames('evolution/pp.r4',nz,nx,ny,vec)
+qq_array=LayerFrames('evolution/qq.r4',nz,nx,ny,vec,qq_back)
+zz_array=LayerFrames('evolution/zz.r4',nz,nx,ny,vec)
 
-nt=len(pp_array) // N
+nt=len(pp_array)
 
-min_vals[:,0],max_vals[:,0],pp_array=get_layer_min_max(pp_array)
-min_vals[:,1],max_vals[:,1],qq_array=get_layer_min_max(qq_array,True)
-min_vals[:,2],max_vals[:,2],zz_array=get_layer_min_max(zz_array)
+# Find the min/max values in each layer over all frames:
+min_vals[:,0],max_vals[:,0]=pp_array.min_max()
+min_vals[:,1],max_vals[:,1]=qq_array.min_max()
+min_vals[:,2],max_vals[:,2]=zz_array.min_max()
 
 # compute temporal averages for each layer
+pp_mean=pp_array.mean()
+qq_mean=qq_array.mean()
+zz_mean=zz_array.mean()
 for iz in range(nz):
-    d[iz*ncol  ,:,:]=np.mean(pp_array[:,:,iz,:], axis=-1)
-    d[iz*ncol+1,:,:]=np.mean(qq_array[:,:,iz,:], axis=-1)
-    d[iz*ncol+2,:,:]=np.mean(zz_array[:,:,iz,:], axis=-1)
+    d[iz*ncol  ,:,:]=pp_mean[iz]
+    d[iz*ncol+1,:,:]=qq_mean[iz]
+    d[iz*ncol+2,:,:]=zz_mean[iz]
 
 im=[] # To store the images
 cbar=[] # To store the colorbars
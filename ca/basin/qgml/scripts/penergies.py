@@ -4,7 +4,7 @@
 # to obtain and plot the energies for all layers/interfaces.
 
 #=====perform various generic imports=====
-import warnings
+import sys,os,warnings
 import numpy as np
 
 from matplotlib import pyplot as plt
@@ -13,6 +13,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.layers import LayerFrames
 
 ## global settings
 
@@ -36,19 +38,6 @@ rc('font', **{'family': 'Times New Roman'})
 rc('text', usetex=True)
 #=========================================
 
-#=================================================================
-# Re-arrange the data for all frames
-def arrange_data(field_data):
-    data_array=np.zeros((nx,ny,nz,nt))
-
-    for frame in range(nt):
-        for iz in range(nz):
-            # Use existing layer data:
-            offset=frame*N+iz*NH+1
-            data_array[:,:,iz,frame]=field_data[offset:offset+NH].reshape(nx,ny)
-
-    return data_array
-
 #-------------------------------------------------
 # Work out x & y limits, grid resolution (nx, ny & nz),
 # and data save interval by reading parameters.f90:
@@ -102,20 +91,11 @@ with open('vertical.asc', 'r') as in_file:
         line = in_file.readline()
         hhat[iz], kdsq[iz] = map(float, line.split())
 
-# Number of horizontal grid points:
-NH=nx*ny
-
-# Total number of data elements per time frame:
-N=nz*NH+1
-# The "+1" includes the time element
-
 #=================================================================
-# Read streamfunction data into array for plotting:
-with open('evolution/pp.r4','rb') as in_file:
-    pp_array=np.fromfile(in_file,dtype=np.float32)
+# Memory-map the streamfunction data; each frame is read when used:
+pp_array=LayerFrames('evolution/pp.r4',nz,nx,ny)
 
-nt=len(pp_array) // N
-pp_array=arrange_data(pp_array)
+nt=len(pp_array)
 
 # Compute the wave numbers
 kx = np.fft.fftfreq(nx, d=(xmax - xmin) / (nx - 1)) * 2 * np.pi
@@ -131,24 +111,25 @@ if nz==2:
 t=0.0
 while t<=tsim:
     frame=int(t/dtsave+0.5)
+    pp=pp_array[frame]
 
     for iz in range(nz):
-        pp_fft = np.fft.fft2(pp_array[:, :, iz, frame])
+        pp_fft = np.fft.fft2(pp[iz])
         uu = np.fft.ifft2(-1j * ky * pp_fft).real
         vv = np.fft.ifft2( 1j * kx * pp_fft).real
 
         ke[frame, iz] = 0.5 * hhat[iz] * np.sum((uu**2 + vv**2) * danorm)
         if iz < nz-1:
-            pe[frame,iz] = 0.5 * kdsq[iz] * np.sum((pp_array[:,:,iz+1,frame] - pp_array[:,:,iz,frame])**2 * danorm)
+            pe[frame,iz] = 0.5 * kdsq[iz] * np.sum((pp[iz+1] - pp[iz])**2 * danorm)
 
     if nz==2:
-        psiB = hhat[0]*pp_array[:,:,0,frame] + hhat[1]*pp_array[:,:,1,frame]
+        psiB = hhat[0]*pp[0] + hhat[1]*pp[1]
         psiB_fft = np.fft.fft2(psiB)
         psiB_x = np.fft.ifft2(1j * kx * psiB_fft).real
         psiB_y = np.fft.ifft2(1j * ky * psiB_fft).real
         bt[frame] = 0.5 * np.sum((psiB_x**2 + psiB_y**2) * danorm)
 
-        psiT = pp_array[:,:,0,frame] - pp_array[:,:,1,frame]
+        psiT = pp[0] - pp[1]
         psiT_fft = np.fft.fft2(psiT)
         psiT_x = np.fft.ifft2(1j * kx * psiT_fft).real
         psiT_y = np.fft.ifft2(1j * ky * psiT_fft).real
@@ -18,6 +18,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -184,9 +186,7 @@ fig, ax = plt.subplots(figsize=[10,float(nrow)*(7.8*aspect/float(ncol)+0.5)], nr
 ax = ax.flatten()
 
 # Read data into array for plotting:
-in_file=open(fname,'r')
-raw_array=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
+raw_array=FrameFile(fname,N,np.float32)
 
 for j,frame in enumerate(frame_list):
     t=float(frame)*dtsave
@@ -211,7 +211,7 @@ for j,frame in enumerate(frame_list):
             ax1.set_ylabel('$y$', fontsize=20)
 
     Z=np.empty([nx,ny])
-    Z=raw_array[int(frame)*(N+1)+1:(int(frame)+1)*(N+1)].reshape(nx,ny)
+    Z=raw_array[int(frame)].reshape(nx,ny)
 
     # Work out the overall min/max values:
     zmin=np.amin(Z)
@@ -6,7 +6,7 @@
 #  @@@@   Run from the current job directory   @@@@
 
 #========== Perform the generic imports =========
-import sys
+import sys,os
 import warnings
 import numpy as np
 import matplotlib.pyplot as plt
@@ -17,6 +17,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.layers import LayerFrames,read_modes
 
 # Ensure latex fonts throughout:
 rc('font',**{'family': 'Times New Roman'})
@@ -75,35 +77,6 @@ def contint(fmin,fmax):
 
     return ci
 
-#=================================================================
-# Function to calculate global min and max for a field across all frames
-def get_layer_min_max(field_data,is_pv=False):
-    layer_min=np.full(nz, np.inf)
-    layer_max=np.full(nz,-np.inf)
-    data_array=np.zeros((nx,ny,nz,nt))
-
-    for frame in range(nt):
-        for iz in range(nz):
-            if option=="m":
-                # Project data onto vertical modes:
-                for jz in range(nz):
-                    offset=frame*N+jz*NH+1
-                    data_array[:,:,iz,frame]+=vec[jz,iz]*field_data[offset:offset+NH].reshape(nx,ny)
-                if is_pv and pv_vis=="a" and iz==0:
-                    data_array[:,:,0,frame]=data_array[:,:,0,frame]-bety
-
-            else:
-                # Use existing layer data:
-                offset=frame*N+iz*NH+1
-                data_array[:,:,iz,frame]=field_data[offset:offset+NH].reshape(nx,ny)
-                if is_pv and pv_vis=="a":
-                    data_array[:,:,iz,frame]=data_array[:,:,iz,frame]-bety
-
-            layer_min[iz]=min(layer_min[iz],np.min(data_array[:,:,iz,frame]))
-            layer_max[iz]=max(layer_max[iz],np.max(data_array[:,:,iz,frame]))
-
-    return layer_min,layer_max,data_array
-
 # Ensure the script is called with the correct number of arguments
 if len(sys.argv) != 3:
     print("Usage: ./zonal_avg_evol.py <PV option: a/t> <View option: l/m>")
@@ -163,17 +136,19 @@ with open('evolution/energy.asc','r') as in_file:
 tsim=time[-1]
 
 # Read in vertical mode matrix if required:
-vec=np.empty((nz,nz))
+vec=None
 if option == "m":
-    in_file=open('modes.asc','r')
-    for m in range(nz):
-        line=in_file.readline()
-    for m in range(nz):
-        for iz in range(nz):
-            line=in_file.readline()
-            string=line.split()
-            vec[iz,m]=string[0]
-    in_file.close()
+    vec=read_modes('modes.asc',nz)
+
+# Background PV (beta*y) removed to show the PV anomaly, from every
+# layer or, when viewing modes, from the first mode only:
+qq_back=None
+if pv_vis == "a":
+    qq_back=np.zeros((nz,nx,ny))
+    if option == "m":
+        qq_back[0]=bety
+    else:
+        qq_back[:]=bety
 
 #=================================================================
 # Set up figure:
@@ -189,13 +164,6 @@ ax=ax.flatten()
 # Set up an array to store all images to be plotted:
 d=np.empty((nim,ny))
 
-# Number of horizontal grid points:
-NH=nx*ny
-
-# Total number of data elements per time frame:
-N=nz*NH+1
-# The "+1" includes the time element
-
 # Field titles over each column:
 field=['$\\psi$','$q$','$\\zeta$','$u$']
 
@@ -203,35 +171,34 @@ min_vals=np.full((nz,ncol), np.inf)
 max_vals=np.full((nz,ncol),-np.inf)
 
 #=================================================================
-# Read streamfunction data into array for plotting:
-with open('evolution/pp.r4','rb') as in_file:
-    pp_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read PV data into array for plotting:
-with open('evolution/qq.r4','rb') as in_file:
-    qq_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read relative vorticity data into array for plotting:
-with open('evolution/zz.r4','rb') as in_file:
-    zz_array=np.fromfile(in_file,dtype=np.float32)
+# Memory-map the streamfunction, PV and relative vorticity data; each
+# frame is read (and projected onto the modes if required) when used:
+pp_array=LayerFrames('evolution/pp.r4',nz,nx,ny,vec)
+qq_array=LayerFrames('evolution/qq.r4',nz,nx,ny,vec,qq_back)
+zz_array=LayerFrames('evolution/zz.r4',nz,nx,ny,vec)
 
-nt=len(pp_array) // N
+nt=len(pp_array)
 
-min_vals[:,0],max_vals[:,0],pp_array=get_layer_min_max(pp_array)
-min_vals[:,1],max_vals[:,1],qq_array=get_layer_min_max(qq_array,True)
-min_vals[:,2],max_vals[:,2],zz_array=get_layer_min_max(zz_array)
+# Find the min/max values in each layer over all frames:
+min_vals[:,0],max_vals[:,0]=pp_array.min_max()
+min_vals[:,1],max_vals[:,1]=qq_array.min_max()
+min_vals[:,2],max_vals[:,2]=zz_array.min_max()
 
 dy=elly/ny
 
-# Compute zonal velocities
-uu_array=np.zeros((nx,ny,nz,nt))
-for frame in range(nt):
-    for iz in range(nz):
-        uu_array[:,1:ny-1,iz,frame]=(pp_array[:,0:ny-2,iz,frame]-pp_array[:,2:ny,iz,frame])/(2.0*dy)
-        uu_array[:,0,iz,frame]=(pp_array[:,0,iz,frame]-pp_array[:,1,iz,frame])/dy
-        uu_array[:,-1,iz,frame]=(pp_array[:,-2,iz,frame]-pp_array[:,-1,iz,frame])/dy
-        min_vals[iz,3]=min(min_vals[iz,3],np.min(uu_array[:,:,iz,frame]))
-        max_vals[iz,3]=max(max_vals[iz,3],np.max(uu_array[:,:,iz,frame]))
+# Compute zonal velocities from the streamfunction pp (of any number
+# of frames and layers, with y varying along the last axis):
+def zonal_velocity(pp):
+    uu=np.empty_like(pp)
+    uu[...,1:ny-1]=(pp[...,0:ny-2]-pp[...,2:ny])/(2.0*dy)
+    uu[...,0]=(pp[...,0]-pp[...,1])/dy
+    uu[...,-1]=(pp[...,-2]-pp[...,-1])/dy
+    return uu
+
+for start,pp in pp_array.chunks():
+    uu=zonal_velocity(pp)
+    min_vals[:,3]=np.minimum(min_vals[:,3],uu.min(axis=(0,2,3)))
+    max_vals[:,3]=np.maximum(max_vals[:,3],uu.max(axis=(0,2,3)))
 
 im=[] # To store the images
 cax=[0]*nim
@@ -296,12 +263,16 @@ while t<=tsim:
     frame=int(t/dtsave+0.5)
     fig.suptitle(f"Time: {t:05.1f}", fontsize=24)
 
+    pp=pp_array[frame]
+    qq=qq_array[frame]
+    zz=zz_array[frame]
+    uu=zonal_velocity(pp)
     for iz in range(nz):
         i=ncol*iz
-        d[i  ,:]=np.mean(pp_array[:,:,iz,frame],axis=0,keepdims=True)
-        d[i+1,:]=np.mean(qq_array[:,:,iz,frame],axis=0,keepdims=True)
-        d[i+2,:]=np.mean(zz_array[:,:,iz,frame],axis=0,keepdims=True)
-        d[i+3,:]=np.mean(uu_array[:,:,iz,frame],axis=0,keepdims=True)
+        d[i  ,:]=np.mean(pp[iz],axis=0,keepdims=True)
+        d[i+1,:]=np.mean(qq[iz],axis=0,keepdims=True)
+        d[i+2,:]=np.mean(zz[iz],axis=0,keepdims=True)
+        d[i+3,:]=np.mean(uu[iz],axis=0,keepdims=True)
 
     for j in range(nim):
         im[j][0].set_ydata(d[j])
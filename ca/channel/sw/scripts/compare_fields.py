@@ -4,7 +4,7 @@
 # several separate directories --- specified below.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -166,18 +168,16 @@ for k,direc in enumerate(dir_list):
    dt=rossby[k]*(time[1]-time[0])
 
    # Open main data file and read:
-   in_file=open(direc+'evolution/'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-
    ng=ng_list[k]
    N=ng*ng
+   raw_array=FrameFile(direc+'evolution/'+dfile,N,np.float64)
+
    d=np.empty((ng+1,ng+1))
 
    # Select frames and plot:
    for m in range(3):
       j=int((t[m]+0.0001)/dt)
-      d[0:ng,0:ng]=raw_array[j*(N+1)+1:(j+1)*(N+1)].reshape(ng,ng).T
+      d[0:ng,0:ng]=raw_array[j].reshape(ng,ng).T
       if field == 'bz':
          # Remove average:
          davg=np.mean(d[:,:])
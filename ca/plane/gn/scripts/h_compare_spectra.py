@@ -4,12 +4,15 @@
 # 4 separate directories specified below.
 
 #========== Perform the generic imports =========
+import sys,os
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 import matplotlib as mpl
 from matplotlib import rcParams
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.spectra import read_spectra
 rcParams.update({'figure.autolayout': True})
 
 ## global settings
@@ -40,19 +43,19 @@ ax1.set_xlim(0.0,2.25)
 
 #=================================================================
 # Select full, balanced or imbalanced results:
-print ' The following three options are available:'
-print
-print ' (1) Compare full fields;'
-print ' (2) Compare balanced fields;'
-print ' (3) Compare imbalanced fields;'
-print
-option=int(raw_input('Option (default 1)? ') or 1)
-print
-t=float(raw_input('Time to show (default 25)? ') or 25.0)
-print
-hbar=float(raw_input('Value of H used in GN simulations (default 0.2)? ') or 0.2)
-print
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
+print(' The following three options are available:')
+print()
+print(' (1) Compare full fields;')
+print(' (2) Compare balanced fields;')
+print(' (3) Compare imbalanced fields;')
+print()
+option=int(input('Option (default 1)? ') or 1)
+print()
+t=float(input('Time to show (default 25)? ') or 25.0)
+print()
+hbar=float(input('Value of H used in GN simulations (default 0.2)? ') or 0.2)
+print()
+ng=int(input(' Resolution (default 256)? ') or 256)
 kgn=np.sqrt(3.0)/hbar
 xgn=np.log10(kgn)
 
@@ -61,30 +64,30 @@ if option==1:
    suffix='_n'+str(ng)+'_t'+str(int(t+0.01))+'.png'
    datafile='alt-spectra.asc'
    ax1.set_ylabel('$\log_{10}k|\\hat{h}|^2$', fontsize=30)
-   print
+   print()
    # Range in log_10 spectra to show:
    yrange=12.0
-   ymax=float(raw_input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
+   ymax=float(input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
    ax1.set_ylim(ymax-yrange,ymax)
 
 elif option==2:
    suffix='_n'+str(ng)+'_bal_t'+str(int(t+0.01))+'.png'
    datafile='alt-bspectra.asc'
    ax1.set_ylabel('$\log_{10}k|\\hat{h}_b|^2$', fontsize=30)
-   print
+   print()
    # Range in log_10 spectra to show:
    yrange=12.0
-   ymax=float(raw_input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
+   ymax=float(input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
    ax1.set_ylim(ymax-12.0,ymax)
 
 else:
    suffix='_n'+str(ng)+'_imb_t'+str(int(t+0.01))+'.png'
    datafile='alt-ispectra.asc'
    ax1.set_ylabel('$\log_{10}k|\\hat{h}_i|^2$', fontsize=30)
-   print
+   print()
    # Range in log_10 spectra to show:
    yrange=12.0
-   ymax=float(raw_input('Maximum value in log_10   h   spectrum to show (default -8)? ') or -8.0)
+   ymax=float(input('Maximum value in log_10   h   spectrum to show (default -8)? ') or -8.0)
    ax1.set_ylim(ymax-yrange,ymax)
 
 #=================================================================
@@ -102,28 +105,16 @@ colorlist=[(0.4,0.4,0.4),(0.4,0.4,0.4),(0.0,0.0,0.0),(0.0,0.0,0.0)]
 # Loop over directories and plot results:
 for m,dir in enumerate(dir_list):
    # Open input file:
-   in_file=open(dir+datafile,'r')
-   # Read the first header line to get kmax:
-   first_line=in_file.readline()
-   kmax=int(first_line.split()[-1])
-   in_file.seek(0)
+   header,shaped_data=read_spectra(dir+datafile)
+   nframes,kmax=shaped_data.shape[0:2]
 
    nx=kmax
 
-   # Read in the full data to a 1d array and close input file:
-   raw_data = np.fromfile(file=in_file,dtype=float,sep='\n')
-   in_file.close()
+   print('Number of frames found %i' %nframes)
 
-   # Determine the number of frames:
-   nframes = int(len(raw_data)/(4*kmax+2))  
-   print 'Number of frames found %i' %nframes
-
-   # Shape the data array into a useful shape for plotting:
    frames=range(0,nframes)
-   time=[raw_data[i*(4*kmax+2)] for i in frames]
+   time=header[:,0]
    dt=time[1]-time[0]
-   tim_eles = [i*(4*kmax+2)+j for i in frames for j in range(2)]
-   shaped_data = np.delete(raw_data,tim_eles)[0:(4*kmax+2)*nframes].reshape((nframes,kmax,4))
    k=np.zeros((nframes,nx))
    h=np.zeros((nframes,nx))
    for i in frames:
@@ -132,8 +123,8 @@ for m,dir in enumerate(dir_list):
 
    # Select frame:
    ic=int(t/dt+0.01)
-   print
-   print ' Showing results at t = ',time[ic]
+   print()
+   print(' Showing results at t = ',time[ic])
 
    ax1.plot(k[ic],h[ic],dashes=dashlist[m],c=colorlist[m],lw=3,label=label_list[m])
    ax1.legend(loc='lower left',prop={'size':20}, shadow=True)
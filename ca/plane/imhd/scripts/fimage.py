@@ -16,7 +16,7 @@
 #   on 5/9/2017.
 #==========================================================================
 
-import os
+import sys,os
 import numpy as np
 
 lplotting_cb=True
@@ -32,6 +32,8 @@ import matplotlib as mpl
 import matplotlib.colors as clrs
 import matplotlib.cm as cm
 from matplotlib import rcParams
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 rcParams.update({'figure.autolayout': True})
 
 #--------------------------------------------------------------
@@ -59,11 +61,7 @@ mpl.rcParams['contour.negative_linestyle'] = 'solid'
 
 def read_file(filename,nx,ny,frame):
    # Read in data from the file in filename at a selected time frame:
-   in_file = open(filename,'r')
-   raw_array = np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   ngp=nx*ny
-   return raw_array[frame*(ngp+1)+1:(frame+1)*(ngp+1)].reshape(ny,nx).T
+   return FrameFile(filename,(ny,nx),np.float32)[frame].T
 
 def contint(fmin,fmax):
    # Determines a nice contour interval (giving 10-20 divisions with
@@ -6,7 +6,7 @@
 # Written 4 November 2017 by D G Dritschel @ St Andrews
 
 #=====perform the various imports========
-import warnings
+import os,sys,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -35,6 +35,8 @@ mpl.rcParams['ytick.minor.size'] = 5
 mpl.rcParams['ytick.minor.width'] = 1
 
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.contours import ContourIndex
 
 #==========================================================
 # Set default plot parameters:
@@ -52,33 +54,32 @@ linewidth=2
 figres=200
 
 #==========================================================
-# Open input data file:
-in_file=open('pvcont.dat','r')
-
-nfr=int(raw_input('Frame to plot (1 for the first - default 1)? ') or 1)
-xmax=float(raw_input('Maximum |x|,|y| to show (default 1.0)? ') or 1.0)
+# Index the frames of the input data file (only those added since the
+# last run are scanned):
+index=ContourIndex('pvcont.dat')
+nframes=len(index)
+if nframes == 0:
+   print(' pvcont.dat contains no complete frames')
+   sys.exit()
+print(' pvcont.dat contains',nframes,'frames, from t = ',index.times[0],' to ',index.times[-1])
+
+nfr=int(input('Frame to plot (1 for the first - default 1)? ') or 1)
+if nfr < 1 or nfr > nframes:
+   print(' Frame',nfr,'is not between 1 and',nframes)
+   sys.exit()
+xmax=float(input('Maximum |x|,|y| to show (default 1.0)? ') or 1.0)
 xmin=-xmax
 ymax=xmax
 ymin=-ymax
-ntint=int(raw_input('Number of tick intervals on each axis (default 4)? ') or 4)
-
-if nfr > 1:
-   # Skip frames:
-   for k in range(1,nfr):
-      record=in_file.readline()
-      nc=int(record.split()[0])
-      npt=int(record.split()[1])
-      for i in range(1,nc+npt+1):
-         record=in_file.readline()
-
-# Read the chosen frame and plot:
-record=in_file.readline()
-nc=int(record.split()[0])
-npt=int(record.split()[1])
-t=float(record.split()[2])
-
-print
-print ' nc = ',nc,'   npt = ',npt,'   t = ',t
+ntint=int(input('Number of tick intervals on each axis (default 4)? ') or 4)
+
+# Read the chosen frame (directly from its position in the file):
+t,npts,ind,x,y=index.frame(nfr-1)
+nc=len(npts)
+npt=len(x)
+
+print()
+print(' nc = ',nc,'   npt = ',npt,'   t = ',t)
 
 #========================================================
 # Create figure:
@@ -100,18 +101,10 @@ dytick=(ymax-ymin)/float(ntint)
 ax.yaxis.set_ticks(np.arange(ymin, ymax+dytick, dytick))
 
 # Loop over contours and plot:
-np=[]
-ind=[]
 # Get minimum and maximum "levels" for choosing contour colours:
-indmin=1000000
-indmax=-1000000
-for j in range(0,nc):
-   record=in_file.readline()
-   np.append(int(record.split()[0]))
-   lev=int(record.split()[2])
-   ind.append(lev)
-   indmin=min(indmin,lev)
-   indmax=max(indmax,lev)
+indmin=ind.min()
+indmax=ind.max()
+i1=np.cumsum(npts)-npts
 
 for j in range(0,nc):
    if indmin == indmax:
@@ -124,30 +117,17 @@ for j in range(0,nc):
       elif ind[j] < 0:
          color=plt.cm.Blues(satmax*float(ind[j])/float(indmin))
 
-   x=[]
-   y=[]
-
-   record=in_file.readline()
-   x0=float(record.split()[0])
-   y0=float(record.split()[1])
-   x.append(x0)
-   y.append(y0)
-
-   for i in range(1,np[j]):
-      record=in_file.readline()
-      x.append(float(record.split()[0]))
-      y.append(float(record.split()[1]))
-
-   x.append(x0)
-   y.append(y0)
+   # Nodes of the contour, closed by repeating the first:
+   xc=np.append(x[i1[j]:i1[j]+npts[j]],x[i1[j]])
+   yc=np.append(y[i1[j]:i1[j]+npts[j]],y[i1[j]])
 
-   ax.plot(x,y,color=color,lw=linewidth)
+   ax.plot(xc,yc,color=color,lw=linewidth)
 
 # Save figure after cropping:
 plt.savefig('contours.png', bbox_inches='tight', pad_inches = 0.025, dpi=figres)
 
 plt.show()
 
-print
-print ' *** Image saved in contours.png'
-print
+print()
+print(' *** Image saved in contours.png')
+print()
@@ -3,7 +3,7 @@
 # This script plots |u|^2 and |B|^2 at three selected times
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -15,6 +15,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -132,11 +134,9 @@ t1 = float(t_in or t_def)
 frame=int((t1+0.0001)/dt)
 
 Z=np.empty([ng+1,ng+1])
-in_file=open('evolution/usq.r4','r')
-raw_uarray=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
+raw_uarray=FrameFile('evolution/usq.r4',N,np.float32)
 
-Z[0:ng,0:ng]=raw_uarray[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_uarray[frame].reshape(ng,ng).T
 Z[ng,0:ng]=Z[0,0:ng]
 Z[0:ng+1,ng]=Z[0:ng+1,0]
 
@@ -152,11 +152,9 @@ cax = divider.append_axes("right", size="7%", pad=0.1)
 cbar=fig.colorbar(im1, cax=cax, ticks=clevels)
 
 Z=np.empty([ng+1,ng+1])
-in_file=open('evolution/bsq.r4','r')
-raw_barray=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
+raw_barray=FrameFile('evolution/bsq.r4',N,np.float32)
 
-Z[0:ng,0:ng]=raw_barray[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_barray[frame].reshape(ng,ng).T
 Z[ng,0:ng]=Z[0,0:ng]
 Z[0:ng+1,ng]=Z[0:ng+1,0]
 
@@ -178,7 +176,7 @@ t2 = float(t_in or t_def)
 frame=int((t2+0.0001)/dt)
 
 Z=np.empty([ng+1,ng+1])
-Z[0:ng,0:ng]=raw_uarray[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_uarray[frame].reshape(ng,ng).T
 Z[ng,0:ng]=Z[0,0:ng]
 Z[0:ng+1,ng]=Z[0:ng+1,0]
 
@@ -194,7 +192,7 @@ cax = divider.append_axes("right", size="7%", pad=0.1)
 cbar=fig.colorbar(im2, cax=cax, ticks=clevels)
 
 Z=np.empty([ng+1,ng+1])
-Z[0:ng,0:ng]=raw_barray[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_barray[frame].reshape(ng,ng).T
 Z[ng,0:ng]=Z[0,0:ng]
 Z[0:ng+1,ng]=Z[0:ng+1,0]
 
@@ -216,7 +214,7 @@ t3 = float(t_in or t_def)
 frame=int((t3+0.0001)/dt)
 
 Z=np.empty([ng+1,ng+1])
-Z[0:ng,0:ng]=raw_uarray[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_uarray[frame].reshape(ng,ng).T
 Z[ng,0:ng]=Z[0,0:ng]
 Z[0:ng+1,ng]=Z[0:ng+1,0]
 
@@ -232,7 +230,7 @@ cax = divider.append_axes("right", size="7%", pad=0.1)
 cbar=fig.colorbar(im3, cax=cax, ticks=clevels)
 
 Z=np.empty([ng+1,ng+1])
-Z[0:ng,0:ng]=raw_barray[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_barray[frame].reshape(ng,ng).T
 Z[ng,0:ng]=Z[0,0:ng]
 Z[0:ng+1,ng]=Z[0:ng+1,0]
 
@@ -4,7 +4,7 @@
 # several separate directories --- specified below.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -167,14 +169,12 @@ for k,direc in enumerate(dir_list):
    dt=rossby[k]*(time[1]-time[0])
 
    # Open main data file and read:
-   in_file=open(direc+'evolution/'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
+   raw_array=FrameFile(direc+'evolution/'+dfile,N,np.float64)
 
    # Read selected frames:
    for k in range(3):
       j=int((t[k]+0.0001)/dt)
-      d[i,0:ng,0:ng]=raw_array[j*(N+1)+1:(j+1)*(N+1)].reshape(ng,ng).T
+      d[i,0:ng,0:ng]=raw_array[j].reshape(ng,ng).T
       if field == 'bz':
          # Remove average:
          davg=np.mean(d[i,:,:])
@@ -6,7 +6,7 @@
 # at a selected resolution.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -18,6 +18,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -80,15 +82,15 @@ def contint(fmin,fmax):
 
 #=================================================================
 # Select data to compare:
-print
-print ' The following fields may be compared:'
-print
-print ' (1) h;'
-print ' (2) zeta;'
-print ' (3) delta;'
-print ' (4) gamma.'
-print
-k=int(raw_input(' Option (default 1)? ') or 1)
+print()
+print(' The following fields may be compared:')
+print()
+print(' (1) h;')
+print(' (2) zeta;')
+print(' (3) delta;')
+print(' (4) gamma.')
+print()
+k=int(input(' Option (default 1)? ') or 1)
 k=k-1
 
 field_list=['h','zeta','delta','gamma']
@@ -96,20 +98,20 @@ field_acro=['hh','zz','dd','gg']
 field=field_list[k]
 acron=field_acro[k]
 
-print
-print ' Select the field type from the following options:'
-print
-print ' (1) full;'
-print ' (2) balanced;'
-print ' (3) imbalanced.'
-print
-option=int(raw_input(' Option (default 1)? ') or 1)
+print()
+print(' Select the field type from the following options:')
+print()
+print(' (1) full;')
+print(' (2) balanced;')
+print(' (3) imbalanced.')
+print()
+option=int(input(' Option (default 1)? ') or 1)
 
-print
-t=float(raw_input(' Time to show (default 25)? ') or 25.0)
+print()
+t=float(input(' Time to show (default 25)? ') or 25.0)
 
-print
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
+print()
+ng=int(input(' Resolution (default 256)? ') or 256)
 
 # Define grid:
 #xg=np.linspace(-np.pi,np.pi,ng+1)
@@ -141,25 +143,17 @@ Z3=np.empty([ng+1,ng+1])
 Z4=np.empty([ng+1,ng+1])
 if option==1:
    # Read full fields in all directories:
-   in_file=open(direc[0]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
-
-   in_file=open(direc[1]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
-
-   in_file=open(direc[2]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
-
-   in_file=open(direc[3]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z4[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[0]+acron+'.r8',N,np.float64)
+   Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
+
+   raw_array=FrameFile(direc[1]+acron+'.r8',N,np.float64)
+   Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
+
+   raw_array=FrameFile(direc[2]+acron+'.r8',N,np.float64)
+   Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
+
+   raw_array=FrameFile(direc[3]+acron+'.r8',N,np.float64)
+   Z4[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
    # Create unique plot output file name:
    outfile=field+'_n'+str(ng)+'_t'+str(int(t+0.01))+'.eps'
@@ -170,25 +164,17 @@ if option==1:
 
 elif option==2:
    # Read balanced fields in all directories and add periodic edges:
-   in_file=open(direc[0]+'b'+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
-
-   in_file=open(direc[1]+'b'+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
-
-   in_file=open(direc[2]+'b'+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
-
-   in_file=open(direc[3]+'b'+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z4[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
+   raw_array=FrameFile(direc[0]+'b'+acron+'.r8',N,np.float64)
+   Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)
+
+   raw_array=FrameFile(direc[1]+'b'+acron+'.r8',N,np.float64)
+   Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)
+
+   raw_array=FrameFile(direc[2]+'b'+acron+'.r8',N,np.float64)
+   Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)
+
+   raw_array=FrameFile(direc[3]+'b'+acron+'.r8',N,np.float64)
+   Z4[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)
 
    # Create unique plot output file name:
    outfile=field+'_bal_n'+str(ng)+'_t'+str(int(t+0.01))+'.eps'
@@ -200,37 +186,21 @@ elif option==2:
 else:
    # Read full and balanced fields in all directories to create imbalanced
    # fields and add periodic edges:
-   in_file=open(direc[0]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   in_file=open(direc[0]+'b'+acron+'.r8','r')
-   raw_arrayb=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)-raw_arrayb[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
-
-   in_file=open(direc[1]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   in_file=open(direc[1]+'b'+acron+'.r8','r')
-   raw_arrayb=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)-raw_arrayb[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
-
-   in_file=open(direc[2]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   in_file=open(direc[2]+'b'+acron+'.r8','r')
-   raw_arrayb=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)-raw_arrayb[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
-
-   in_file=open(direc[3]+acron+'.r8','r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   in_file=open(direc[3]+'b'+acron+'.r8','r')
-   raw_arrayb=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z4[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)-raw_arrayb[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
+   raw_array=FrameFile(direc[0]+acron+'.r8',N,np.float64)
+   raw_arrayb=FrameFile(direc[0]+'b'+acron+'.r8',N,np.float64)
+   Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)-raw_arrayb[frame].reshape(ng,ng)
+
+   raw_array=FrameFile(direc[1]+acron+'.r8',N,np.float64)
+   raw_arrayb=FrameFile(direc[1]+'b'+acron+'.r8',N,np.float64)
+   Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)-raw_arrayb[frame].reshape(ng,ng)
+
+   raw_array=FrameFile(direc[2]+acron+'.r8',N,np.float64)
+   raw_arrayb=FrameFile(direc[2]+'b'+acron+'.r8',N,np.float64)
+   Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)-raw_arrayb[frame].reshape(ng,ng)
+
+   raw_array=FrameFile(direc[3]+acron+'.r8',N,np.float64)
+   raw_arrayb=FrameFile(direc[3]+'b'+acron+'.r8',N,np.float64)
+   Z4[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)-raw_arrayb[frame].reshape(ng,ng)
 
    # Create unique plot output file name:
    outfile=field+'_imb_n'+str(ng)+'_t'+str(int(t+0.01))+'.eps'
@@ -261,15 +231,15 @@ zmax2=np.amax(Z2)
 zmax3=np.amax(Z3)
 zmax4=np.amax(Z4)
 
-print
-print ' Minimum and maximum field values for each simulation:'
-print
-print ' Simulation    Min field value      Max field value'
-print ' ----------    ---------------      ---------------'
-print '   SW         ',"{:14.10f}".format(zmin1),'     ',"{:14.10f}".format(zmax1)
-print '   SW-bal     ',"{:14.10f}".format(zmin2),'     ',"{:14.10f}".format(zmax2)
-print '   GN         ',"{:14.10f}".format(zmin3),'     ',"{:14.10f}".format(zmax3)
-print '   GN-bal     ',"{:14.10f}".format(zmin4),'     ',"{:14.10f}".format(zmax4)
+print()
+print(' Minimum and maximum field values for each simulation:')
+print()
+print(' Simulation    Min field value      Max field value')
+print(' ----------    ---------------      ---------------')
+print('   SW         ',"{:14.10f}".format(zmin1),'     ',"{:14.10f}".format(zmax1))
+print('   SW-bal     ',"{:14.10f}".format(zmin2),'     ',"{:14.10f}".format(zmax2))
+print('   GN         ',"{:14.10f}".format(zmin3),'     ',"{:14.10f}".format(zmax3))
+print('   GN-bal     ',"{:14.10f}".format(zmin4),'     ',"{:14.10f}".format(zmax4))
 
 if option < 3:
    # For full and balanced fields, use same limits for SW & SW-bal, and
@@ -308,21 +278,21 @@ else:
    zmin4=-zmag
    zmax4= zmag
 
-print
-zmin1=float(raw_input('Minimum value to show in   SW   simulation? (default '+str(zmin1)+') ') or zmin1)
-zmax1=float(raw_input('Maximum value to show in   SW   simulation? (default '+str(zmax1)+') ') or zmax1)
+print()
+zmin1=float(input('Minimum value to show in   SW   simulation? (default '+str(zmin1)+') ') or zmin1)
+zmax1=float(input('Maximum value to show in   SW   simulation? (default '+str(zmax1)+') ') or zmax1)
 
-print
-zmin2=float(raw_input('Minimum value to show in SW-bal simulation? (default '+str(zmin2)+') ') or zmin2)
-zmax2=float(raw_input('Maximum value to show in SW-bal simulation? (default '+str(zmax2)+') ') or zmax2)
+print()
+zmin2=float(input('Minimum value to show in SW-bal simulation? (default '+str(zmin2)+') ') or zmin2)
+zmax2=float(input('Maximum value to show in SW-bal simulation? (default '+str(zmax2)+') ') or zmax2)
 
-print
-zmin3=float(raw_input('Minimum value to show in   GN   simulation? (default '+str(zmin3)+') ') or zmin3)
-zmax3=float(raw_input('Maximum value to show in   GN   simulation? (default '+str(zmax3)+') ') or zmax3)
+print()
+zmin3=float(input('Minimum value to show in   GN   simulation? (default '+str(zmin3)+') ') or zmin3)
+zmax3=float(input('Maximum value to show in   GN   simulation? (default '+str(zmax3)+') ') or zmax3)
 
-print
-zmin4=float(raw_input('Minimum value to show in GN-bal simulation? (default '+str(zmin4)+') ') or zmin4)
-zmax4=float(raw_input('Maximum value to show in GN-bal simulation? (default '+str(zmax4)+') ') or zmax4)
+print()
+zmin4=float(input('Minimum value to show in GN-bal simulation? (default '+str(zmin4)+') ') or zmin4)
+zmax4=float(input('Maximum value to show in GN-bal simulation? (default '+str(zmax4)+') ') or zmax4)
 
 # Obtain contour levels for plotting the colorbars:
 dz=contint(zmin1,zmax1)
@@ -418,8 +388,8 @@ fig.subplots_adjust(wspace=0.8, hspace=-0.1)
 # Save image:
 fig.savefig(outfile, format='eps', dpi=300)
 
-print
-print ' To view the image, type'
-print
-print ' gv ',outfile
-print
+print()
+print(' To view the image, type')
+print()
+print(' gv ',outfile)
+print()
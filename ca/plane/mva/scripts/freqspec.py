@@ -13,6 +13,9 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.spectra import read_samples
+from pyio.frequency import METHODS,frequency_spectrum
 
 ## global settings
 
@@ -36,18 +39,13 @@ rc('font', **{'family': 'Times New Roman'})
 rc('text', usetex=True)
 #=========================================
 
-# Get the sample size:
-file = open('src/parameters.f90').readlines()
-nsamp=''
-for line in file:
-   if 'nsamp=' in line:
-      nsamp = line.split("=")[-1].strip()
-
-n = int(nsamp)**2
-nt = sum(1 for line in open('spectra/dsamp.asc'))
+# Read the times and the divergence at each sample point:
+time,d=read_samples('spectra/dsamp.asc')
+nt=len(time)
 print(' There are ',nt,' times in the data.')
 
 # Get hbar, cgw & cof:
+file = open('src/parameters.f90').readlines()
 for line in file:
    if 'hbar=' in line:
       hbar = float(line.split("=")[-1].strip().rstrip("d0"))
@@ -62,40 +60,34 @@ twopi=2.0*np.pi
 om1=cof/twopi
 om2=bvf/twopi
 
-time=np.zeros(nt)
-d=np.zeros((nt,n))
-
-in_file=open('spectra/dsamp.asc','r')
-for j in range(nt):
-   line=in_file.readline()  
-   string=line.split()
-   time[j]=float(string[0])
-   for i in range(n):
-      d[j,i]=float(string[i+1])
+# Select the spectral estimate:
+print('')
+print(' Estimate the spectrum from')
+print('')
+print(' (1) the whole record (periodogram),')
+print(' (2) an average over overlapping segments (Welch) or')
+print(' (3) an average over multiple tapers (multitaper)?')
+print('')
+opt_in = input(' Choice (default 1)? ')
+method = METHODS[int(opt_in or 1)-1]
 
-in_file.close()
+options={}
+if method=='welch':
+   opt_in = input(' Number of segments (default 8)? ')
+   options['segments'] = int(opt_in or 8)
+elif method=='multitaper':
+   opt_in = input(' Time-bandwidth product (default 4)? ')
+   options['bandwidth'] = float(opt_in or 4.0)
 
 print('')
 print(' Creating frequency spectrum...')
 
-# Create array holding the frequencies:
-time_step = time[1] - time[0]
-freqs = np.fft.fftfreq(time.size, time_step)
-
-# Accumulate power spectra:
-Sd=np.zeros(nt)
-for k in range(n):
-   ps=np.abs(np.fft.fft(d[:,k]))**2
-   Sd+=ps
-Sd=Sd/float(n)
-   
-# As signal is real, fold over and add spectrum:
-nh_times=int((nt-1)/2)
-for i in range(1,nh_times):
-   Sd[i]=Sd[i]+Sd[nt-i]
-
-logomega=np.log10(freqs[1:nh_times])
-logSd=np.log10(Sd[1:nh_times])
+# Power spectral density averaged over the sample points, with its 95%
+# confidence interval:
+freqs,Sd,Sd_lo,Sd_hi=frequency_spectrum(time,d,method,**options)
+
+logomega=np.log10(freqs)
+logSd=np.log10(Sd)
 
 #------------------------------------------------------------------------
 # Plot S vs omega:
@@ -108,6 +100,8 @@ ax1.axvline(np.log10(om2),color='b',linestyle='--')
 # Limits in log_10{f}:
 #xlims=[-2.5,1.5]
 #ax1.set_xlim(xlims)
+if method!='periodogram':
+   ax1.fill_between(logomega,np.log10(Sd_lo),np.log10(Sd_hi),color='k',alpha=0.2,lw=0)
 ax1.plot(logomega,logSd,c='k',lw=1)
 fig1.savefig('d_fspec.eps', format='eps', dpi=600)
 
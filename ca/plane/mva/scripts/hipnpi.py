@@ -3,7 +3,7 @@
 # This script compared h_i, p_n and P_i at a chosen time.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -15,6 +15,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -120,33 +122,23 @@ ax3.set_yticklabels([r'$-\pi$',r'$-\pi/2$',r'$0$',r'$\pi/2$',r'$\pi$'],fontsize=
 #=================================================================
 # Read data into arrays for plotting:
 Z1=np.empty([ng+1,ng+1])
-in_file=open('evolution/hh.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile('evolution/hh.r8',N,np.float64)
+Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 Z=np.empty([ng+1,ng+1])
-in_file=open('evolution/bhh.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile('evolution/bhh.r8',N,np.float64)
+Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 Z1=Z1-Z
 
 Z2=np.empty([ng+1,ng+1])
-in_file=open('evolution/pn.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile('evolution/pn.r8',N,np.float64)
+Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 Z3=np.empty([ng+1,ng+1])
-in_file=open('evolution/pp.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile('evolution/pp.r8',N,np.float64)
+Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 Z=np.empty([ng+1,ng+1])
-in_file=open('evolution/bpp.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile('evolution/bpp.r8',N,np.float64)
+Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 Z3=Z3-Z
 
 # Add periodic edges:
@@ -6,7 +6,7 @@
 #   Reads data in the current directory
 #======================================================================
 
-import os,warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -18,6 +18,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -53,8 +55,8 @@ def get_ng():
     # Open input file:
     try:
         in_file = open('src/parameters.f90','r')# try opening filename  
-    except IOError, message:# error if file not found 
-        print >> sys.stderr, ' File could not be opened', message
+    except IOError as message:# error if file not found 
+        print(' File could not be opened', message, file=sys.stderr)
         sys.exit()
 
     # Read the file into a list of strings and close it:
@@ -80,8 +82,8 @@ def get_cof():
     # Open input file:
     try:
         in_file = open('src/parameters.f90','r')# try opening filename  
-    except IOError, message:# error if file not found 
-        print >> sys.stderr, ' File could not be opened', message
+    except IOError as message:# error if file not found 
+        print(' File could not be opened', message, file=sys.stderr)
         sys.exit()
 
     # Read the file into a list of strings and close it:
@@ -137,14 +139,14 @@ def make_plot(Z,cbopt):
     #------------------------------------------------------------------
     # Get contour intervals:
     zmax_def=abs(Z).max()
-    zmax=float(raw_input('Maximum magnitude of field to show? (default '+str(zmax_def)+') ') or zmax_def)
+    zmax=float(input('Maximum magnitude of field to show? (default '+str(zmax_def)+') ') or zmax_def)
     zmin=-zmax
 
     dZ=contint(zmin,zmax)
     jmax=int(zmax/dZ)
     clevels=np.linspace(-dZ*float(jmax),dZ*float(jmax),2*jmax+1)
-    print ' Contour levels:'
-    print clevels
+    print(' Contour levels:')
+    print(clevels)
 
     #------------------------------------------------------------------
     # Set up figure:
@@ -179,45 +181,45 @@ def make_plot(Z,cbopt):
     #------------------------------------------------------------------
     # Save figure after cropping:
     plt.savefig(filename+'.eps', format='eps', dpi=300)    
-    print
-    print ' *** To view the image, type'
-    print
-    print ' gv '+filename+'.eps'
-    print
+    print()
+    print(' *** To view the image, type')
+    print()
+    print(' gv '+filename+'.eps')
+    print()
     
 if __name__ == "__main__":
     #==========================================================================
     # Select field to display:
-    field=str(raw_input('Field to image (dd, gg, hh, qq or zz)? (default zz) ') or 'zz')
+    field=str(input('Field to image (dd, gg, hh, qq or zz)? (default zz) ') or 'zz')
 
     if field == 'dd':
         #Get Coriolis frequency:
         cof=get_cof()
         scf=1.0/cof
-        print 'Note: the divergence is scaled by the Coriolis frequency.'
+        print('Note: the divergence is scaled by the Coriolis frequency.')
     elif field == 'gg':
         #Get Coriolis frequency:
         cof=get_cof()
         scf=1.0/cof**2
-        print 'Note: the acceleration divergence is scaled by the Coriolis frequency squared.'
+        print('Note: the acceleration divergence is scaled by the Coriolis frequency squared.')
     elif field == 'hh':
         scf=1.0
-        print 'Note: hh is the dimensionless height anomaly.'
+        print('Note: hh is the dimensionless height anomaly.')
     elif field == 'qq':
         #Get Coriolis frequency:
         cof=get_cof()
         scf=1.0/cof
-        print 'Note: the PV is scaled by the Coriolis frequency.'
+        print('Note: the PV is scaled by the Coriolis frequency.')
     elif field == 'zz':
         #Get Coriolis frequency:
         cof=get_cof()
         scf=1.0/cof
-        print 'Note: the relative vorticity is scaled by the Coriolis frequency.'
+        print('Note: the relative vorticity is scaled by the Coriolis frequency.')
     else:
-        print ' *** Not an available field *** EXITING!'
+        print(' *** Not an available field *** EXITING!')
         quit()
 
-    kfr=int(raw_input('Time frame to image? (default 100) ') or 100)
+    kfr=int(input('Time frame to image? (default 100) ') or 100)
     if kfr < 10:
        frame='000'+str(kfr)
     elif kfr < 100:
@@ -234,18 +236,16 @@ if __name__ == "__main__":
     ng=get_ng()
 
     #Read selected frame (kfr) from the data:
-    in_file=open(field+'.r4','r')
-    raw_array=np.fromfile(in_file,dtype=np.float32)
-    in_file.close()
     N=ng*ng
+    raw_array=FrameFile(field+'.r4',N,np.float32)
 
     Z=np.empty((ng+1,ng+1))
-    Z[0:ng,0:ng]=scf*raw_array[kfr*(N+1)+1:(kfr+1)*(N+1)].reshape(ng,ng).T
+    Z[0:ng,0:ng]=scf*raw_array[kfr].reshape(ng,ng).T
 
     # Add periodic edges:
     Z[ng,0:ng]=Z[0,0:ng]
     Z[0:ng+1,ng]=Z[0:ng+1,0]
 
-    cbopt=str(raw_input('Add a colourbar? (default y) ') or 'y')
+    cbopt=str(input('Add a colourbar? (default y) ') or 'y')
 
     make_plot(Z,cbopt)
@@ -6,7 +6,7 @@
 #  @@@@   Run from the current job directory   @@@@
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.layers import LayerFrames,read_modes
 
 # Ensure latex fonts throughout:
 rc('font',**{'family': 'Times New Roman'})
@@ -74,40 +76,6 @@ def contint(fmin,fmax):
 
     return ci
 
-#=================================================================
-# Function to calculate global min and max for a field across all frames
-def get_layer_min_max(field_data,ng,nz,option="l",vec=[]):
-
-    # Number of horizontal grid points:
-    NH=ng*ng
-
-    # Total number of data elements per time frame:
-    N=nz*NH+1
-    # The "+1" includes the time element
-
-    nt=len(field_data) // N
-    layer_min=np.full(nz, np.inf)
-    layer_max=np.full(nz,-np.inf)
-    data_array=np.zeros((ng,ng,nz,nt))
-
-    for frame in range(nt):
-        for iz in range(nz):
-            if option=="m":
-                # Project data onto vertical modes:
-                for jz in range(nz):
-                    offset=frame*N+jz*NH+1
-                    data_array[:,:,iz,frame]+=vec[jz,iz]*field_data[offset:offset+NH].reshape(ng,ng)
-
-            else:
-                # Use existing layer data:
-                offset=frame*N+iz*NH+1
-                data_array[:,:,iz,frame]=field_data[offset:offset+NH].reshape(ng,ng)
-
-            layer_min[iz]=min(layer_min[iz],np.min(data_array[:,:,iz,frame]))
-            layer_max[iz]=max(layer_max[iz],np.max(data_array[:,:,iz,frame]))
-
-    return layer_min,layer_max,data_array
-
 #-------------------------------------------------
 # Work out x & y limits, grid resolution (ng & nz),
 # and data save interval by reading parameters.f90:
@@ -141,17 +109,9 @@ op_in = input(' View layers or modes (l/m) (default l)? ')
 option = str(op_in or "l")
 
 # Read in vertical mode matrix if required:
-vec=np.empty((nz,nz))
+vec=None
 if option == "m":
-    in_file=open('modes.asc','r')
-    for m in range(nz):
-        line=in_file.readline()
-    for m in range(nz):
-        for iz in range(nz):
-            line=in_file.readline()
-            string=line.split()
-            vec[iz,m]=string[0]
-    in_file.close()
+    vec=read_modes('modes.asc',nz)
 
 #=================================================================
 # Set up figure:
@@ -174,21 +134,16 @@ min_vals=np.full((nz,3),0.0)
 max_vals=np.full((nz,3),0.0)
 
 #=================================================================
-# Read streamfunction data into array for plotting:
-with open('evolution/pp.r4','rb') as in_file:
-    pp_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read PV data into array for plotting:
-with open('evolution/qq.r4','rb') as in_file:
-    qq_array=np.fromfile(in_file,dtype=np.float32)
-
-# Read vertical vorticity data into array for plotting:
-with open('evolution/zz.r4','rb') as in_file:
-    zz_array=np.fromfile(in_file,dtype=np.float32)
+# Memory-map the streamfunction, PV and vertical vorticity data; each
+# frame is read (and projected onto the modes if required) when used:
+pp_array=LayerFrames('evolution/pp.r4',nz,ng,ng,vec)
+qq_array=LayerFrames('evolution/qq.r4',nz,ng,ng,vec)
+zz_array=LayerFrames('evolution/zz.r4',nz,ng,ng,vec)
 
-min_vals[:,0],max_vals[:,0],pp_array=get_layer_min_max(pp_array,ng,nz,option,vec)
-min_vals[:,1],max_vals[:,1],qq_array=get_layer_min_max(qq_array,ng,nz,option,vec)
-min_vals[:,2],max_vals[:,2],zz_array=get_layer_min_max(zz_array,ng,nz,option,vec)
+# Find the min/max values in each layer over all frames:
+min_vals[:,0],max_vals[:,0]=pp_array.min_max()
+min_vals[:,1],max_vals[:,1]=qq_array.min_max()
+min_vals[:,2],max_vals[:,2]=zz_array.min_max()
 
 im=[] # To store the images
 cbar=[] # To store the colorbars
@@ -263,12 +218,15 @@ if new_width != width or new_height != height:
 t=0.0
 while t<=tsim:
     frame=int(t/dtsave+0.5)
+    pp=pp_array[frame]
+    qq=qq_array[frame]
+    zz=zz_array[frame]
 
     for iz in range(nz):
         k=3*iz
-        d[k  ,0:ng,0:ng]=pp_array[:,:,iz,frame]
-        d[k+1,0:ng,0:ng]=qq_array[:,:,iz,frame]
-        d[k+2,0:ng,0:ng]=zz_array[:,:,iz,frame]
+        d[k  ,0:ng,0:ng]=pp[iz]
+        d[k+1,0:ng,0:ng]=qq[iz]
+        d[k+2,0:ng,0:ng]=zz[iz]
 
     # Add periodic edges:
     for k in range(3*nz):
@@ -13,7 +13,6 @@ import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from matplotlib.artist import setp
-import matplotlib.animation as anim
 import matplotlib.colors as clrs
 import matplotlib.cm as cm
 import matplotlib as mpl
@@ -21,6 +20,9 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
+from pyio.movie import MovieWriter,select_frames
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -55,17 +57,25 @@ myx=(os.path.getsize('qq_init.r8')-8)/8
 nx=int(np.sqrt(float(myx)+1.e-6))
 ny=nx
 
-length=nx*ny+1
-frame_bytes=8*length
-
-prefix=str(raw_input('File prefix (before .r8, default qq)? ') or 'qq')
+prefix=str(input('File prefix (before .r8, default qq)? ') or 'qq')
 dataset=prefix+'.r8'
+raw_array=FrameFile(dataset,(nx,ny),np.float64)
 
 # Get final frame from chosen dataset:
-record2=os.path.getsize(dataset)/frame_bytes-1
-
-record1=int(raw_input('First record to read (default 0)? ') or 0)
-record2=int(raw_input(' Last record to read (default '+str(record2)+')? ') or record2)
+record2=len(raw_array)-1
+
+print()
+option=int(input(' Select frames by (1) record or (2) time (default 1)? ') or 1)
+if option==2:
+   t1=float(input(' Start time (default 0)? ') or 0.0)
+   t2=float(input('   End time (default '+str(raw_array.time(record2))+')? ') or raw_array.time(record2))
+   record1=raw_array.index(t1)
+   record2=raw_array.index(t2)
+else:
+   record1=int(input('First record to read (default 0)? ') or 0)
+   record2=int(input(' Last record to read (default '+str(record2)+')? ') or record2)
+stride=int(input(' Use every nth record, n (default 1)? ') or 1)
+records=select_frames(raw_array,record1,record2,stride)
 
 # Set up figure:
 fig = plt.figure(1,figsize=[width,width])
@@ -80,24 +90,23 @@ ax.yaxis.set_ticks_position('none')
 #time_template = 't = %.1f'
 time_template = 't = %.0f'
 
-# Set up list of images for animation:
-ims=[]
+# Set up the image and time, updated for each frame below:
+Z=np.zeros((nx+1,ny+1))
+im1 = ax.imshow(Z.T,cmap=cm.terrain,extent=(-np.pi,np.pi,-np.pi,np.pi),origin='lower',interpolation='bilinear')
+im2 = ax.text(0.025, 0.955, '', fontsize=16, weight='bold', transform=ax.transAxes)
 
 #-----------------------------------------------------------
-# Read selected range of frames and process:
-raw_array=np.empty(length, dtype=np.float64)
-with open(dataset,'r') as file:
-
-   for record in range(record1,record2+1):
-      file.seek(frame_bytes * record)
-      bytes=file.read(frame_bytes)
-      raw_array=np.frombuffer(bytes, dtype=np.float64).copy()
-
-      t=float(raw_array[0])
-      print ' t = ',t
-
-      Z=np.empty((nx+1,ny+1))
-      Z[0:nx,0:ny]=raw_array[1:nx*ny+1].reshape(nx,ny)
+# Read selected range of frames and write the movie one frame
+# at a time:
+movie_file=prefix+str(record1)+'-'+str(record2)+'.mp4'
+print()
+print(' Creating movie ('+movie_file+') ... (this can take some time)')
+with MovieWriter(fig, movie_file, fps=10) as movie:
+   for record in records:
+      t=raw_array.time(record)
+      print(' t = ',t)
+
+      Z[0:nx,0:ny]=raw_array[record]
       Z[nx,0:ny]=Z[0,0:ny]
       Z[0:nx+1,ny]=Z[0:nx+1,0]
 
@@ -105,23 +114,14 @@ with open(dataset,'r') as file:
       zmax=np.amax(Z)
 
       # Plot frame:
-      im1 = ax.imshow(Z.T,cmap=cm.terrain,vmin=zmin,vmax=zmax,extent=(-np.pi,np.pi,-np.pi,np.pi),origin='lower',interpolation='bilinear')
+      im1.set_data(Z.T)
+      im1.set_clim(zmin,zmax)
       # Add time as a text string:
-      im2 = ax.text(0.025, 0.955, time_template%(t), fontsize=16, weight='bold', transform=ax.transAxes)
-      # Add to list of images:
-      ims.append([im1,im2])
-
-#-----------------------------------------------------------
-# Run animation:
-ani = anim.ArtistAnimation(fig, ims, interval=200, repeat_delay=2000, blit=False)
-
-movie_file=prefix+str(record1)+'-'+str(record2)+'.mp4'
-print
-print ' Creating movie ('+movie_file+') ... (this can take some time)'
-ani.save(movie_file, fps=10, extra_args=['-vcodec', 'libx264'])
-
-print
-print ' Display the movie by typing'
-print
-print ' mplayer '+movie_file+' -loop 0'
-print
+      im2.set_text(time_template%(t))
+      movie.grab()
+
+print()
+print(' Display the movie by typing')
+print()
+print(' mplayer '+movie_file+' -loop 0')
+print()
@@ -4,7 +4,7 @@
 # from simulations initially balanced or imbalanced.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -78,24 +80,24 @@ def contint(fmin,fmax):
 
 #=================================================================
 # Select data to compare:
-print
-print ' Select the initialisation type:'
-print
-print ' (1) balanced;'
-print ' (2) imbalanced.'
-print
-iopt=int(raw_input(' Option (default 2)? ') or 2)
-
-print
-print ' Select the times to show:'
-print
+print()
+print(' Select the initialisation type:')
+print()
+print(' (1) balanced;')
+print(' (2) imbalanced.')
+print()
+iopt=int(input(' Option (default 2)? ') or 2)
+
+print()
+print(' Select the times to show:')
+print()
 if iopt == 1:
-   print ' (1) t = 0, 0.5, 1 and 1.5;'
+   print(' (1) t = 0, 0.5, 1 and 1.5;')
 else:
-   print ' (1) t = 0.1, 0.5, 1 and 1.5;'
-print ' (2) t = 3, 5, 15 and 20.'
-print
-topt=int(raw_input(' Option (default 1)? ') or 1)
+   print(' (1) t = 0.1, 0.5, 1 and 1.5;')
+print(' (2) t = 3, 5, 15 and 20.')
+print()
+topt=int(input(' Option (default 1)? ') or 1)
 
 if topt == 1:
    if iopt == 1:
@@ -108,9 +110,9 @@ else:
    times=np.array([3.0,5.0,15.0,20.0])
    title=['$t=3$','$t=5$','$t=15$','$t=20$']
 
-print
-ng=int(raw_input(' Resolution (default 512)? ') or 512)
-print
+print()
+ng=int(input(' Resolution (default 512)? ') or 512)
+print()
 
 # Total number of grid points:
 N=ng*ng
@@ -136,19 +138,15 @@ for t in times:
 # Read in all data to get max abs value for imaging:
 d=np.empty((8,ng+1,ng+1))
 
-in_file=open(gndata,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile(gndata,N,np.float64)
 for i in range(4):
    frame=frames[i]
-   d[i,0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   d[i,0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-in_file=open(swdata,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile(swdata,N,np.float64)
 for i in range(4):
    frame=frames[i]
-   d[i+4,0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   d[i+4,0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 # Add periodic edges:
 for i in range(8):
@@ -222,21 +220,21 @@ setp(cbar.ax.xaxis.set_ticklabels(clevels), fontsize=24)
 #=========================================================================
 # Save image:
 
-print
-print ' To view the image, type'
-print
+print()
+print(' To view the image, type')
+print()
 if topt == 1:
    if iopt == 1:
       fig.savefig('d_bal'+str(ng)+'early.eps', format='eps', dpi=300)
-      print ' gv d_bal'+str(ng)+'early.eps'
+      print(' gv d_bal'+str(ng)+'early.eps')
    else:
       fig.savefig('d'+str(ng)+'early.eps', format='eps', dpi=300)
-      print ' gv d'+str(ng)+'early.eps'
+      print(' gv d'+str(ng)+'early.eps')
 else:
    if iopt == 1:
       fig.savefig('d_bal'+str(ng)+'late.eps', format='eps', dpi=300)
-      print ' gv d_bal'+str(ng)+'late.eps'
+      print(' gv d_bal'+str(ng)+'late.eps')
    else:
       fig.savefig('d'+str(ng)+'late.eps', format='eps', dpi=300)
-      print ' gv d'+str(ng)+'late.eps'
-print
+      print(' gv d'+str(ng)+'late.eps')
+print()
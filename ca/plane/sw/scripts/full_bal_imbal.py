@@ -6,7 +6,7 @@
 # at a selected resolution.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -18,6 +18,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -125,18 +127,14 @@ outfile=field+'_n'+str(ng)+'_t'+str(int(t+0.01))+'.eps'
 # Read data into arrays for plotting:
 
 # Read full field:
-in_file=open('evolution/'+acron+'.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile('evolution/'+acron+'.r8',N,np.float64)
 Z1=np.empty([ng+1,ng+1])
-Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 # Read balanced field:
-in_file=open('evolution/b'+acron+'.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile('evolution/b'+acron+'.r8',N,np.float64)
 Z2=np.empty([ng+1,ng+1])
-Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng)
+Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng)
 
 # Add periodic edges:
 Z1[ng,0:ng]=Z1[0,0:ng]
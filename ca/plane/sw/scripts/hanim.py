@@ -5,10 +5,13 @@
 #=====================================================================
 
 #=====perform various generic imports=====
+import sys,os
 import numpy as np
 
 from matplotlib import pyplot as plt
-import matplotlib.animation as anim
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
+from pyio.movie import MovieWriter
 #=========================================
 
 # Get the grid resolution:
@@ -26,16 +29,14 @@ in_file.close()
 time=np.array(time)
 
 # Read in all data:
-in_file=open('evolution/hh.r8','r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile('evolution/hh.r8',N,np.float64)
 
 # For each frame, extract cross section:
 nx=int(ng/2)
 hc=np.empty([nx+1,len(time)])
 for frame in range(len(time)):
    Z1=np.empty([ng,ng])
-   Z1=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   Z1=raw_array[frame].reshape(ng,ng).T
 
    hc[0:nx,frame]=Z1[nx:ng,nx]
    hc[nx,frame]=Z1[0,nx]
@@ -56,40 +57,26 @@ ax.set_ylim([-ymax,ymax])
 # Formatting for displayed time:
 time_template = 'time = %.3f'
 
-# Set up list of images for animation:
-ims=[]
-# Repeat 1st frame 10 times:
-for k in range(10):
-   y=hc[:,0]
-
-   # Create image of profile y = u(x,t):
-   cims = ax.plot(x,y,c='k',lw=2)
-
-   # Add time as a text string:
-   cims.append(ax.text(0.02, 0.94, time_template%(0.0), transform=ax.transAxes, weight='bold', size=20))
-
-   # Add to list of images containing all contours at each time:
-   ims.append(cims)
-
-# Add remaining frames:
-for frame,t in enumerate(time):
-   y=hc[:,frame]
-
-   # Create image of profile y = u(x,t):
-   cims = ax.plot(x,y,c='k',lw=2)
-
-   # Add time as a text string:
-   cims.append(ax.text(0.02, 0.94, time_template%(t), transform=ax.transAxes, weight='bold', size=20))
-
-   # Add to list of images containing all contours at each time:
-   ims.append(cims)
-
-# Run animation:
-ani = anim.ArtistAnimation(fig, ims, interval=100, repeat_delay=100, blit=False)
+# Set up the profile and time, updated for each frame below:
+line, = ax.plot(x,hc[:,0],c='k',lw=2)
+label = ax.text(0.02, 0.94, '', transform=ax.transAxes, weight='bold', size=20)
 
 print
-print(' Creating movie (evo.mp4) ... (this can take some time)')
-ani.save('hc.mp4', fps=10, extra_args=['-vcodec', 'libx264'])
+print(' Creating movie (hc.mp4) ... (this can take some time)')
+with MovieWriter(fig, 'hc.mp4', fps=10) as movie:
+   # Repeat 1st frame 10 times:
+   label.set_text(time_template%(0.0))
+   for k in range(10):
+      movie.grab()
+
+   # Add remaining frames:
+   for frame,t in enumerate(time):
+      # Image of profile y = u(x,t):
+      line.set_ydata(hc[:,frame])
+
+      # Add time as a text string:
+      label.set_text(time_template%(t))
+      movie.grab()
 
 print
 print (' Display the movie by typing')
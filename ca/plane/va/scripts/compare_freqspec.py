@@ -15,6 +15,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frequency import METHODS,sample_spectra
 
 ## global settings
 
@@ -64,6 +66,25 @@ print()
 opt_in = input(' Add vertical lines showing N (1 = yes, 0 = no; default 0)? ')
 fshow = int(opt_in or 0)
 
+# Select the spectral estimate:
+print()
+print(' Estimate the spectra from')
+print()
+print(' (1) the whole record (periodogram),')
+print(' (2) an average over overlapping segments (Welch) or')
+print(' (3) an average over multiple tapers (multitaper)?')
+print()
+opt_in = input(' Choice (default 1)? ')
+method = METHODS[int(opt_in or 1)-1]
+
+options={}
+if method=='welch':
+   opt_in = input(' Number of segments (default 8)? ')
+   options['segments'] = int(opt_in or 8)
+elif method=='multitaper':
+   opt_in = input(' Time-bandwidth product (default 4)? ')
+   options['bandwidth'] = float(opt_in or 4.0)
+
 #=================================================================
 # Set up figure:
 fig1 = plt.figure(1,figsize=[10,6])
@@ -75,48 +96,18 @@ ax1.axvline(np.log10(om1),color='c',linestyle='--')
 #xlims=[-2.5,1.5]
 #ax1.set_xlim(xlims)
 
-# Default sample size:
-nsamp = 4
-n = int(nsamp)**2
-
 #=================================================================
-# Loop over directories and process:
-twopi=2.0*np.pi
+# Read and process the data in all directories at once; each gives the
+# power spectral density averaged over the sample points, with its 95%
+# confidence interval:
+spectra=sample_spectra([dir+'spectra/dsamp.asc' for dir in dir_list],method=method,**options)
+
+# Plot the spectra:
 sq3=np.sqrt(3.0)
 for m,dir in enumerate(dir_list):
-   nt = sum(1 for line in open(dir+'spectra/dsamp.asc'))
-
-   time=np.zeros(nt)
-   d=np.zeros((nt,n))
-
-   in_file=open(dir+'spectra/dsamp.asc','r')
-   for j in range(nt):
-      line=in_file.readline()  
-      string=line.split()
-      time[j]=float(string[0])
-      for i in range(n):
-         d[j,i]=float(string[i+1])
-
-   in_file.close()
-
-   # Create array holding the frequencies:
-   time_step = time[1] - time[0]
-   freqs = np.fft.fftfreq(time.size, time_step)
-
-   # Accumulate power spectra:
-   Sd=np.zeros(nt)
-   for k in range(n):
-      ps=np.abs(np.fft.fft(d[:,k]))**2
-      Sd+=ps
-   Sd=Sd/float(n)
-   
-   # As signal is real, fold over and add spectrum:
-   nh_times=int((nt-1)/2)
-   for i in range(1,nh_times):
-      Sd[i]=Sd[i]+Sd[nt-i]
-
-   logomega=np.log10(freqs[1:nh_times])
-   logSd=np.log10(Sd[1:nh_times])
+   freqs,Sd,Sd_lo,Sd_hi=spectra[m]
+   logomega=np.log10(freqs)
+   logSd=np.log10(Sd)
 
    if fshow==1:
       # Plot N/(2*pi):
@@ -127,6 +118,8 @@ for m,dir in enumerate(dir_list):
          om2=bvf/twopi
          ax1.axvline(np.log10(om2),color=colorlist[m],linestyle='--')
 
+   if method!='periodogram':
+      ax1.fill_between(logomega,np.log10(Sd_lo),np.log10(Sd_hi),color=colorlist[m],alpha=0.2,lw=0)
    ax1.plot(logomega,logSd,c=colorlist[m],lw=1,label=label_list[m])
    ax1.legend(loc='lower left',prop={'size':25})
 
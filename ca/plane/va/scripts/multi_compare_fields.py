@@ -4,7 +4,7 @@
 # for data at three times in 2 separate directories, as indicated below.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -195,51 +197,43 @@ ax6.set_yticklabels([r'$-\pi$',r'$-\pi/2$',r'$0$',r'$\pi/2$',r'$\pi$'],fontsize=
 
 #=================================================================
 # Read data into arrays for plotting:
-in_file=open(swdir+'evolution/'+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile(swdir+'evolution/'+dfile,N,np.float64)
 Z1=np.empty([ng+1,ng+1])
-Z1[0:ng,0:ng]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(ng,ng).T
+Z1[0:ng,0:ng]=raw_array[frame1].reshape(ng,ng).T
 Z2=np.empty([ng+1,ng+1])
-Z2[0:ng,0:ng]=raw_array[frame2*(N+1)+1:(frame2+1)*(N+1)].reshape(ng,ng).T
+Z2[0:ng,0:ng]=raw_array[frame2].reshape(ng,ng).T
 Z3=np.empty([ng+1,ng+1])
-Z3[0:ng,0:ng]=raw_array[frame3*(N+1)+1:(frame3+1)*(N+1)].reshape(ng,ng).T
+Z3[0:ng,0:ng]=raw_array[frame3].reshape(ng,ng).T
 
-in_file=open(vadir+'evolution/'+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
+raw_array=FrameFile(vadir+'evolution/'+dfile,N,np.float64)
 Z4=np.empty([ng+1,ng+1])
-Z4[0:ng,0:ng]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(ng,ng).T
+Z4[0:ng,0:ng]=raw_array[frame1].reshape(ng,ng).T
 Z5=np.empty([ng+1,ng+1])
-Z5[0:ng,0:ng]=raw_array[frame2*(N+1)+1:(frame2+1)*(N+1)].reshape(ng,ng).T
+Z5[0:ng,0:ng]=raw_array[frame2].reshape(ng,ng).T
 Z6=np.empty([ng+1,ng+1])
-Z6[0:ng,0:ng]=raw_array[frame3*(N+1)+1:(frame3+1)*(N+1)].reshape(ng,ng).T
+Z6[0:ng,0:ng]=raw_array[frame3].reshape(ng,ng).T
 
 if option==3:
-   in_file=open(swdir+'evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
+   raw_array=FrameFile(swdir+'evolution/b'+dfile,N,np.float64)
    Z=np.empty([ng+1,ng+1])
-   Z[0:ng,0:ng]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(ng,ng).T
+   Z[0:ng,0:ng]=raw_array[frame1].reshape(ng,ng).T
    Z1=Z1-Z
    Z=np.empty([ng+1,ng+1])
-   Z[0:ng,0:ng]=raw_array[frame2*(N+1)+1:(frame2+1)*(N+1)].reshape(ng,ng).T
+   Z[0:ng,0:ng]=raw_array[frame2].reshape(ng,ng).T
    Z2=Z2-Z
    Z=np.empty([ng+1,ng+1])
-   Z[0:ng,0:ng]=raw_array[frame3*(N+1)+1:(frame3+1)*(N+1)].reshape(ng,ng).T
+   Z[0:ng,0:ng]=raw_array[frame3].reshape(ng,ng).T
    Z3=Z3-Z
 
-   in_file=open(vadir+'evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
+   raw_array=FrameFile(vadir+'evolution/b'+dfile,N,np.float64)
    Z=np.empty([ng+1,ng+1])
-   Z[0:ng,0:ng]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(ng,ng).T
+   Z[0:ng,0:ng]=raw_array[frame1].reshape(ng,ng).T
    Z4=Z4-Z
    Z=np.empty([ng+1,ng+1])
-   Z[0:ng,0:ng]=raw_array[frame2*(N+1)+1:(frame2+1)*(N+1)].reshape(ng,ng).T
+   Z[0:ng,0:ng]=raw_array[frame2].reshape(ng,ng).T
    Z5=Z5-Z
    Z=np.empty([ng+1,ng+1])
-   Z[0:ng,0:ng]=raw_array[frame3*(N+1)+1:(frame3+1)*(N+1)].reshape(ng,ng).T
+   Z[0:ng,0:ng]=raw_array[frame3].reshape(ng,ng).T
    Z6=Z6-Z
 
 # Add periodic edges:
@@ -5,7 +5,7 @@
 # adjust the titles for each directory.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -17,6 +17,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -242,62 +244,46 @@ ax4.set_yticklabels([r'$-\pi$',r'$-\pi/2$',r'$0$',r'$\pi/2$',r'$\pi$'],fontsize=
 # Read data into arrays for plotting:
 k=0
 Z1=np.empty([ng+1,ng+1])
-in_file=open(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,N,np.float64)
+Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 if opt_list[k] == 2:
    Z=np.empty([ng+1,ng+1])
-   in_file=open(dir_list[k]+'evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(dir_list[k]+'evolution/b'+dfile,N,np.float64)
+   Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
    Z1=Z1-Z
 
 k=1
 Z2=np.empty([ng+1,ng+1])
-in_file=open(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,N,np.float64)
+Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 if opt_list[k] == 2:
    Z=np.empty([ng+1,ng+1])
-   in_file=open(dir_list[k]+'evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(dir_list[k]+'evolution/b'+dfile,N,np.float64)
+   Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
    Z2=Z2-Z
 
 k=2
 Z3=np.empty([ng+1,ng+1])
-in_file=open(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,N,np.float64)
+Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 if opt_list[k] == 2:
    Z=np.empty([ng+1,ng+1])
-   in_file=open(dir_list[k]+'evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(dir_list[k]+'evolution/b'+dfile,N,np.float64)
+   Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
    Z3=Z3-Z
 
 k=3
 Z4=np.empty([ng+1,ng+1])
-in_file=open(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float64)
-in_file.close()
-Z4[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+raw_array=FrameFile(dir_list[k]+'evolution/'+prefile[opt_list[k]]+dfile,N,np.float64)
+Z4[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 if opt_list[k] == 2:
    Z=np.empty([ng+1,ng+1])
-   in_file=open(dir_list[k]+'evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float64)
-   in_file.close()
-   Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(dir_list[k]+'evolution/b'+dfile,N,np.float64)
+   Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
    Z4=Z4-Z
 
 # Add periodic edges:
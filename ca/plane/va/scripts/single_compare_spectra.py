@@ -4,7 +4,7 @@
 # or acceleration divergence from data in directories specified below.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -14,6 +14,8 @@ from matplotlib import rc
 from matplotlib import rcParams
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.spectra import read_spectra
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -110,27 +112,15 @@ for m,dir in enumerate(dir_list):
    # Select data file:
    dfile='spectra/'+file_prefix[field]+file_suffix
    # Open file and read:
-   in_file=open(dir+dfile,'r')
-   first_line=in_file.readline()
-   nx=int(first_line.split()[-1])
-   in_file.seek(0)
+   header,shaped_data=read_spectra(dir+dfile)
+   nframes,nx=shaped_data.shape[0:2]
 
    kc=int(2.0*float(nx)/3.0)
    xmax=max(xmax,0.05*int(20.0*np.log10(float(kc))+1.0))
 
-   # Read in the full data to a 1d array and close input file:
-   raw_data = np.fromfile(file=in_file,dtype=float,sep='\n')
-   in_file.close()
-
-   # Determine the number of frames:
-   nframes = int(len(raw_data)/(2*nx+2))  
-
-   # Shape the data array into a useful shape for plotting:
    frames=range(0,nframes)
-   time=[raw_data[i*(2*nx+2)] for i in frames]
+   time=header[:,0]
    dt=time[1]-time[0]
-   tim_eles = [i*(2*nx+2)+j for i in frames for j in range(2)]
-   shaped_data = np.delete(raw_data,tim_eles)[0:(2*nx+2)*nframes].reshape((nframes,nx,2))
    k=np.zeros((nframes,nx))
    h=np.zeros((nframes,nx))
    for i in frames:
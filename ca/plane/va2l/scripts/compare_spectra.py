@@ -8,6 +8,7 @@
 # balanced and imbalanced spectra.
 
 #========== Perform the generic imports =========
+import sys,os
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -15,6 +16,8 @@ import matplotlib.cm as cm
 import matplotlib as mpl
 from matplotlib import rc
 from matplotlib import rcParams
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.spectra import read_spectra
 rcParams.update({'figure.autolayout': True})
 
 # Ensure latex fonts throughout:
@@ -40,21 +43,21 @@ mpl.rcParams['axes.linewidth'] = 3
 
 #=================================================================
 # Select full, balanced or imbalanced results:
-print ' The following three options are available:'
-print
-print ' (1) Compare full fields;'
-print ' (2) Compare balanced fields;'
-print ' (3) Compare imbalanced fields;'
-print
-option=int(raw_input('Option (default 1)? ') or 1)
-print
-t=float(raw_input('Time to show (default 25)? ') or 25.0)
-print
-hbar=float(raw_input('Value of H used in GN simulations (default 0.2)? ') or 0.2)
+print(' The following three options are available:')
+print()
+print(' (1) Compare full fields;')
+print(' (2) Compare balanced fields;')
+print(' (3) Compare imbalanced fields;')
+print()
+option=int(input('Option (default 1)? ') or 1)
+print()
+t=float(input('Time to show (default 25)? ') or 25.0)
+print()
+hbar=float(input('Value of H used in GN simulations (default 0.2)? ') or 0.2)
 kgn=np.sqrt(3.0)/hbar
 xgn=np.log10(kgn)
-print
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
+print()
+ng=int(input(' Resolution (default 256)? ') or 256)
 
 #=================================================================
 # Set up figure:
@@ -89,17 +92,17 @@ if option==1:
    ax2.set_ylabel('$\log_{10}S_{\\zeta}$', fontsize=30)
    ax3.set_ylabel('$\log_{10}S_{\\delta}$', fontsize=30)
    ax4.set_ylabel('$\log_{10}S_{\\gamma}$', fontsize=30)
-   print
+   print()
    # Range in log_10 spectra to show:
    yrange=12.0
-   ymax=float(raw_input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
+   ymax=float(input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
    ax1.set_ylim(ymax-yrange,ymax)
    yrange=9.0
-   ymax=float(raw_input('Maximum value in log_10  zeta spectrum to show (default  0)? ') or 0.0)
+   ymax=float(input('Maximum value in log_10  zeta spectrum to show (default  0)? ') or 0.0)
    ax2.set_ylim(ymax-yrange,ymax)
-   ymax=float(raw_input('Maximum value in log_10 delta spectrum to show (default -4)? ') or -4.0)
+   ymax=float(input('Maximum value in log_10 delta spectrum to show (default -4)? ') or -4.0)
    ax3.set_ylim(ymax-yrange,ymax)
-   ymax=float(raw_input('Maximum value in log_10 gamma spectrum to show (default  1)? ') or 1.0)
+   ymax=float(input('Maximum value in log_10 gamma spectrum to show (default  1)? ') or 1.0)
    ax4.set_ylim(ymax-yrange,ymax)
 
 elif option==2:
@@ -110,17 +113,17 @@ elif option==2:
    ax2.set_ylabel('$\log_{10}S_{\\zeta_b}$', fontsize=30)
    ax3.set_ylabel('$\log_{10}S_{\\delta_b}$', fontsize=30)
    ax4.set_ylabel('$\log_{10}S_{\\gamma_b}$', fontsize=30)
-   print
+   print()
    # Range in log_10 spectra to show:
    yrange=12.0
-   ymax=float(raw_input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
+   ymax=float(input('Maximum value in log_10   h   spectrum to show (default -3)? ') or -3.0)
    ax1.set_ylim(ymax-12.0,ymax)
    yrange=9.0
-   ymax=float(raw_input('Maximum value in log_10  zeta spectrum to show (default  0)? ') or 0.0)
+   ymax=float(input('Maximum value in log_10  zeta spectrum to show (default  0)? ') or 0.0)
    ax2.set_ylim(ymax-yrange,ymax)
-   ymax=float(raw_input('Maximum value in log_10 delta spectrum to show (default -4)? ') or -4.0)
+   ymax=float(input('Maximum value in log_10 delta spectrum to show (default -4)? ') or -4.0)
    ax3.set_ylim(ymax-yrange,ymax)
-   ymax=float(raw_input('Maximum value in log_10 gamma spectrum to show (default  1)? ') or 1.0)
+   ymax=float(input('Maximum value in log_10 gamma spectrum to show (default  1)? ') or 1.0)
    ax4.set_ylim(ymax-yrange,ymax)
 
 else:
@@ -131,17 +134,17 @@ else:
    ax2.set_ylabel('$\log_{10}S_{\\zeta_i}$', fontsize=30)
    ax3.set_ylabel('$\log_{10}S_{\\delta_i}$', fontsize=30)
    ax4.set_ylabel('$\log_{10}S_{\\gamma_i}$', fontsize=30)
-   print
+   print()
    # Range in log_10 spectra to show:
    yrange=12.0
-   ymax=float(raw_input('Maximum value in log_10   h   spectrum to show (default -8)? ') or -8.0)
+   ymax=float(input('Maximum value in log_10   h   spectrum to show (default -8)? ') or -8.0)
    ax1.set_ylim(ymax-yrange,ymax)
    yrange=9.0
-   ymax=float(raw_input('Maximum value in log_10  zeta spectrum to show (default -6)? ') or -6.0)
+   ymax=float(input('Maximum value in log_10  zeta spectrum to show (default -6)? ') or -6.0)
    ax2.set_ylim(ymax-yrange,ymax)
-   ymax=float(raw_input('Maximum value in log_10 delta spectrum to show (default -5)? ') or -5.0)
+   ymax=float(input('Maximum value in log_10 delta spectrum to show (default -5)? ') or -5.0)
    ax3.set_ylim(ymax-yrange,ymax)
-   ymax=float(raw_input('Maximum value in log_10 gamma spectrum to show (default -2)? ') or -2.0)
+   ymax=float(input('Maximum value in log_10 gamma spectrum to show (default -2)? ') or -2.0)
    ax4.set_ylim(ymax-yrange,ymax)
 
 
@@ -160,53 +163,27 @@ colorlist=[(0.4,0.4,0.4),(0.4,0.4,0.4),(0.0,0.0,0.0),(0.0,0.0,0.0)]
 # Loop over directories and plot results:
 for m,dir in enumerate(dir_list):
    # Open input file to read h spectrum:
-   in_file=open(dir+altdatafile,'r')
-   # Read the first header line to get kmax:
-   first_line=in_file.readline()
-   kmax=int(first_line.split()[-1])
-   in_file.seek(0)
+   header,shaped_data=read_spectra(dir+altdatafile)
+   nframes,kmax=shaped_data.shape[0:2]
 
    nx=kmax
 
-   # Read in the full data to a 1d array and close input file:
-   raw_data = np.fromfile(file=in_file,dtype=float,sep='\n')
-   in_file.close()
-
-   # Determine the number of frames:
-   nframes = int(len(raw_data)/(4*kmax+2))  
-
-   # Shape the data array into a useful shape for plotting:
    frames=range(0,nframes)
-   time=[raw_data[i*(4*kmax+2)] for i in frames]
+   time=header[:,0]
    dt=time[1]-time[0]
-   tim_eles = [i*(4*kmax+2)+j for i in frames for j in range(2)]
-   shaped_data = np.delete(raw_data,tim_eles)[0:(4*kmax+2)*nframes].reshape((nframes,kmax,4))
    h=np.zeros((nframes,nx))
    for i in frames:
       h[i,:]=shaped_data[i].transpose()[1][0:nx]
 
    # Open input file to read remaining spectra:
-   in_file=open(dir+datafile,'r')
-   # Read the first header line to get kmax:
-   first_line=in_file.readline()
-   kmax=int(first_line.split()[-1])
-   in_file.seek(0)
+   header,shaped_data=read_spectra(dir+datafile)
+   nframes,kmax=shaped_data.shape[0:2]
 
    nx=kmax
 
-   # Read in the full data to a 1d array and close input file:
-   raw_data = np.fromfile(file=in_file,dtype=float,sep='\n')
-   in_file.close()
-
-   # Determine the number of frames:
-   nframes = int(len(raw_data)/(4*kmax+2))  
-
-   # Shape the data array into a useful shape for plotting:
    frames=range(0,nframes)
-   time=[raw_data[i*(4*kmax+2)] for i in frames]
+   time=header[:,0]
    dt=time[1]-time[0]
-   tim_eles = [i*(4*kmax+2)+j for i in frames for j in range(2)]
-   shaped_data = np.delete(raw_data,tim_eles)[0:(4*kmax+2)*nframes].reshape((nframes,kmax,4))
    k=np.zeros((nframes,nx))
    z=np.zeros((nframes,nx))
    d=np.zeros((nframes,nx))
@@ -247,8 +224,8 @@ plt.tight_layout(pad=1.0, w_pad=1.0, h_pad=1.0)
 # Save figure:
 fig.savefig(outfile, format='eps', dpi=1200)
 
-print
-print ' To view the image, type'
-print
-print ' gv ',outfile
-print
+print()
+print(' To view the image, type')
+print()
+print(' gv ',outfile)
+print()
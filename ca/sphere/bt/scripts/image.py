@@ -4,7 +4,7 @@
 # latitude at selected times.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -101,9 +103,7 @@ nt = 2*ng
 N = ng*nt
 
 # Read all data:
-in_file = open('zz.r4','r')
-raw_array = np.fromfile(in_file,dtype = np.float32)
-in_file.close()
+raw_array = FrameFile('zz.r4',N,np.float32)
 
 d = np.empty((nim,nt+1,ng))
 time = np.empty(nim)
@@ -117,8 +117,8 @@ for i in range(nim):
     q_in = input(' Time to show for image '+str(i+1)+' (default '+str(ts)+')? ')
     ts = float(q_in or ts)
     frame = int(ts/tsave+0.5)
-    time[i] = raw_array[frame*(N+1)]
-    d[i,0:nt,0:ng] = raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(nt,ng)
+    time[i] = raw_array.time(frame)
+    d[i,0:nt,0:ng] = raw_array[frame].reshape(nt,ng)
     if i == 0:
         dts = tsave
     else:
@@ -8,7 +8,7 @@
 #     @@@@ Specify job directories below @@@@
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -20,6 +20,9 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
+from pyio.sphere import Orthographic
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -104,11 +107,8 @@ nt=2*ng
 # Total number of grid points:
 N=ng*nt
 
-# Define f = 4*pi*cos(lat) and projection constants:
+# Define f = 4*pi*cos(lat):
 dl=np.pi/float(ng)
-dli=float(ng)/(np.pi+1.e-12)
-hpidl=(np.pi+dl)/2.0
-h=2.0/float(ng)
 lat=np.linspace(-(np.pi-dl)/2.0,(np.pi-dl)/2.0,ng)
 cof=4.0*np.pi*np.sin(lat)
 
@@ -186,15 +186,13 @@ rlatc = float(rlatc_in or 0.0)
 rlonc_in = input(' Longitude of the direction of view (degrees, default 0)? ')
 rlonc = float(rlonc_in or 0.0)
 
-clatc=np.cos(rlatc*np.pi/180.)
-slatc=np.sin(rlatc*np.pi/180.)
-
-clonc=np.cos(rlonc*np.pi/180.)
-slonc=np.sin(rlonc*np.pi/180.)
-
 # Output filename:
 outfile='comp_'+field+'_n'+str(ng)+'_lat'+str(int(rlatc))+'_lon'+str(int(rlonc))+'.eps'
 
+# Orthographic projection for this view, used for every panel (the
+# interpolation weights are kept in the first directory for re-use):
+proj=Orthographic(ng,rlatc,rlonc,cachedir=dir_list[0]+'evolution')
+
 print()
 opt_in = input(' Add colourbars (default y)? ')
 cbopt = str(opt_in or 'y')
@@ -218,15 +216,11 @@ ax = ax.flatten()
 
 # Read data into arrays for plotting:
 for row in range(nr):
-   in_file=open(dir_list[row]+'evolution/'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
+   raw_array=FrameFile(dir_list[row]+'evolution/'+dfile,N,np.float32)
 
    if option==3:
       # Read balanced data and subtract from full data to get imbalanced data:
-      in_file=open(dir_list[row]+'evolution/b'+dfile,'r')
-      braw_array=np.fromfile(in_file,dtype=np.float32)
-      in_file.close()
+      braw_array=FrameFile(dir_list[row]+'evolution/b'+dfile,N,np.float32)
 
     # Select data for each time, project orthographically, and plot:
    for col in range(nc):
@@ -235,26 +229,15 @@ for row in range(nr):
       frame1=int(frame[i])
       t1=float(t[i])
 
-      Z=np.empty([nt,ng+2])
-      Z[0:nt,1:ng+1]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(nt,ng)
+      Z=np.array(raw_array[frame1],dtype=float).reshape(nt,ng)
 
       if option==3:
          # Read balanced data and subtract from full data to get imbalanced data:
-         Zb=np.empty([nt,ng+2])
-         Zb[0:nt,1:ng+1]=braw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(nt,ng)
-         Z=Z-Zb
+         Z=Z-braw_array[frame1].reshape(nt,ng)
 
       if fopt==2:
          # Subtract f to define PV anomaly (assume Omega = 2*pi):
-         for i in range(nt):
-            Z[i,1:ng+1]-=cof
-
-      # Copy latitudes adjacent to poles with a pi shift
-      # in longitude to simplify interpolation below:
-      Z[0:ng-1,0]=Z[ng+1:nt,1]
-      Z[ng+1:nt,0]=Z[0:ng-1,1]
-      Z[0:ng-1,ng+1]=Z[ng+1:nt,ng]
-      Z[ng+1:nt,ng+1]=Z[0:ng-1,ng]
+         Z-=cof
 
       # Work out the overall min/max values:
       zmin=np.amin(Z)
@@ -272,36 +255,7 @@ for row in range(nr):
       clevels=np.linspace(dz*float(jmin),dz*float(jmax),jmax-jmin+1)
 
       # Project data orthographically:
-      P=np.empty([ng,ng])
-      for iy in range(ng):
-         yp=h*(float(iy)+0.5)-1.0
-         for iz in range(ng):
-            zp=h*(float(iz)+0.5)-1.0
-            det=1.0-yp**2-zp**2
-            if det > 0.0:
-               xp=np.sqrt(det)
-               xm=xp*clatc-zp*slatc
-               zt=zp*clatc+xp*slatc
-               xm=xp*clatc-zp*slatc
-               yt=yp*clonc+xm*slonc
-               xt=xm*clonc-yp*slonc
-
-               # Find longitude & latitude then bi-linearly interpolate Z:
-               ri=dli*(np.pi+np.arctan2(yt,xt))
-               i=int(ri)
-               ip1=(i+1)%nt
-               bb=float(i)-ri
-               aa=1.0-bb
-
-               rj=dli*(hpidl+np.arcsin(zt))
-               j=int(rj)
-               jp1=j+1
-               cc=rj-float(j)
-               dd=1.0-cc
-
-               P[iy,iz]=bb*(dd*Z[i,j]+cc*Z[i,jp1])+aa*(dd*Z[ip1,j]+cc*Z[ip1,jp1])
-            else:
-               P[iy,iz]=0.0
+      P=proj(Z)
 
       # Plot the image in an array with an optional colourbar:
       im1=ax1.imshow(P.T,cmap=cm.seismic,vmin=zmin,vmax=zmax,extent=(-1.0,1.0,-1.0,1.0),origin='lower',interpolation='bilinear')
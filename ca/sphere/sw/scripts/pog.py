@@ -6,7 +6,7 @@
 #     @@@@   Run from the current job directory   @@@@
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -18,6 +18,9 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
+from pyio.sphere import Orthographic
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -93,11 +96,8 @@ nt=2*ng
 # Total number of grid points:
 N=ng*nt
 
-# Define f = 4*pi*cos(lat) and projection constants:
+# Define f = 4*pi*cos(lat):
 dl=np.pi/float(ng)
-dli=float(ng)/(np.pi+1.e-12)
-hpidl=(np.pi+dl)/2.0
-h=2.0/float(ng)
 lat=np.linspace(-(np.pi-dl)/2.0,(np.pi-dl)/2.0,ng)
 cof=4.0*np.pi*np.sin(lat)
 
@@ -157,12 +157,6 @@ rlatc = float(rlatc_in or 0.0)
 rlonc_in = input(' Longitude of the direction of view (degrees, default 0)? ')
 rlonc = float(rlonc_in or 0.0)
 
-clatc=np.cos(rlatc*np.pi/180.)
-slatc=np.sin(rlatc*np.pi/180.)
-
-clonc=np.cos(rlonc*np.pi/180.)
-slonc=np.sin(rlonc*np.pi/180.)
-
 opt_in = input(' Add a colourbar (default y)? ')
 cbopt = str(opt_in or 'y')
 
@@ -171,32 +165,17 @@ outfile=field+'_n'+str(ng)+'_t'+str(int(t1))+'_lat'+str(int(rlatc))+'_lon'+str(i
 
 #=================================================================
 # Read data into arrays for plotting:
-in_file=open('evolution/'+dfile,'r')
-raw_array=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
-Z=np.empty([nt,ng+2])
-Z[0:nt,1:ng+1]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(nt,ng)
+raw_array=FrameFile('evolution/'+dfile,N,np.float32)
+Z=np.array(raw_array[frame1],dtype=float).reshape(nt,ng)
 
 if option==3:
    # Read balanced data and subtract from full data to get imbalanced data:
-   in_file=open('evolution/b'+dfile,'r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Zb=np.empty([nt,ng+2])
-   Zb[0:nt,1:ng+1]=raw_array[frame1*(N+1)+1:(frame1+1)*(N+1)].reshape(nt,ng)
-   Z=Z-Zb
+   raw_array=FrameFile('evolution/b'+dfile,N,np.float32)
+   Z=Z-raw_array[frame1].reshape(nt,ng)
 
 if k==2:
    # Subtract f to define PV anomaly (assume Omega = 2*pi):
-   for i in range(nt):
-      Z[i,1:ng+1]-=cof
-   
-# Copy latitudes adjacent to poles with a pi shift
-# in longitude to simplify interpolation below:
-Z[0:ng-1,0]=Z[ng+1:nt,1]
-Z[ng+1:nt,0]=Z[0:ng-1,1]
-Z[0:ng-1,ng+1]=Z[ng+1:nt,ng]
-Z[ng+1:nt,ng+1]=Z[0:ng-1,ng]
+   Z-=cof
 
 # Work out the overall min/max values:
 zmin=np.amin(Z)
@@ -214,38 +193,9 @@ jmax= int( zmax/dz)
 clevels=np.linspace(dz*float(jmin),dz*float(jmax),jmax-jmin+1)
 
 #=================================================================
-# Project data orthographically:
-
-P=np.empty([ng,ng])
-for iy in range(ng):
-   yp=h*(float(iy)+0.5)-1.0
-   for iz in range(ng):
-      zp=h*(float(iz)+0.5)-1.0
-      det=1.0-yp**2-zp**2
-      if det > 0.0:
-         xp=np.sqrt(det)
-         xm=xp*clatc-zp*slatc
-         zt=zp*clatc+xp*slatc
-         xm=xp*clatc-zp*slatc
-         yt=yp*clonc+xm*slonc
-         xt=xm*clonc-yp*slonc
-
-         # Find longitude & latitude then bi-linearly interpolate Z:
-         ri=dli*(np.pi+np.arctan2(yt,xt))
-         i=int(ri)
-         ip1=(i+1)%nt
-         bb=float(i)-ri
-         aa=1.0-bb
-
-         rj=dli*(hpidl+np.arcsin(zt))
-         j=int(rj)
-         jp1=j+1
-         cc=rj-float(j)
-         dd=1.0-cc
-
-         P[iy,iz]=bb*(dd*Z[i,j]+cc*Z[i,jp1])+aa*(dd*Z[ip1,j]+cc*Z[ip1,jp1])
-      else:
-         P[iy,iz]=0.0
+# Project data orthographically (the interpolation weights for this
+# view are kept in evolution for re-use):
+P=Orthographic(ng,rlatc,rlonc,cachedir='evolution')(Z)
 
 #==============================================================================
 # Set up figure:
@@ -5,7 +5,7 @@
 #================================================================
 
 #=====perform various generic imports=====
-import warnings,os
+import sys,warnings,os
 import numpy as np
 
 from matplotlib import pyplot as plt
@@ -16,6 +16,8 @@ import matplotlib.colors as clrs
 import matplotlib.cm as cm
 from matplotlib import rcParams
 from matplotlib import rc
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 rcParams.update({'figure.autolayout': True})
 
 ## global settings
@@ -91,60 +93,58 @@ lon=np.linspace(-np.pi,np.pi,nt+1)
 
 X, Y = np.meshgrid(lon, lat)
 
-print
-prefix=str(raw_input(' Data file prefix (hh, dd, gg, qq, ...; default hh)? ') or 'hh')
+print()
+prefix=str(input(' Data file prefix (hh, dd, gg, qq, ...; default hh)? ') or 'hh')
 filename=prefix+'.r4'
 
 #Read in data and find min/max values:
-in_file = open(filename,'r')
-raw_array = np.fromfile(in_file,dtype=np.float32)
-in_file.close()
+N=ng*nt
+raw_array = FrameFile(filename,N,np.float32)
 
-frame=int(raw_input(' Frame to read (0 for first; default 30)? ') or 30)
+frame=int(input(' Frame to read (0 for first; default 30)? ') or 30)
 
-N=ng*nt
 Z=np.zeros([ng+2,nt+1])
 #Grab frame:
-Z[1:ng+1,0:nt]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(nt,ng).T
+Z[1:ng+1,0:nt]=raw_array[frame].reshape(nt,ng).T
 #Add polar values by extrapolation:
 Z[0,0:nt]=1.5*Z[1,0:nt]-0.5*Z[2,0:nt]
 Z[ng+1,0:nt]=1.5*Z[ng,0:nt]-0.5*Z[ng-1,0:nt]
 #Add periodic edge in longitude:
 Z[0:ng+2,nt]=Z[0:ng+2,0]
 
-opt=str(raw_input(' Add axis labels and ticks (y/n; default y)? ') or 'y')
+opt=str(input(' Add axis labels and ticks (y/n; default y)? ') or 'y')
 
 #-------------------------------------------
 #Next plot results:
 Zmin=np.amin(Z)
 Zmax=np.amax(Z)
-print ' Min field value = ',Zmin,'  Max field value = ',Zmax
+print(' Min field value = ',Zmin,'  Max field value = ',Zmax)
 
 if prefix=='hh':
    dZ=120/9522.958
-   print
-   print ' *** Contour interval used in the paper = ',dZ
-   print
+   print()
+   print(' *** Contour interval used in the paper = ',dZ)
+   print()
 elif prefix=='qq':
    dZ=2*np.pi*9.3385e-6/7.292e-5
-   print
-   print ' *** Contour interval used in the paper = ',dZ
-   print
+   print()
+   print(' *** Contour interval used in the paper = ',dZ)
+   print()
 elif prefix=='dd':
    dZ=4*np.pi*0.001
-   print
-   print ' *** Contour interval used in the paper = ',dZ
-   print
+   print()
+   print(' *** Contour interval used in the paper = ',dZ)
+   print()
 elif prefix=='gg':
    dZ=(4*np.pi)**2*0.02
-   print
-   print ' *** Contour interval used in the paper = ',dZ
-   print
+   print()
+   print(' *** Contour interval used in the paper = ',dZ)
+   print()
 
 Zmax=max(Zmax,abs(Zmin))
 Zmin=-Zmax
 dZ_def=contint(Zmin,Zmax)/2.0
-dZ=float(raw_input(' Contour interval? (default '+str(dZ_def)+') ') or dZ_def)
+dZ=float(input(' Contour interval? (default '+str(dZ_def)+') ') or dZ_def)
 jmax=int(Zmax/dZ+0.5)
 Zmax=dZ*(float(jmax)-0.5)
 clevels=np.linspace(-Zmax,Zmax,2*jmax)
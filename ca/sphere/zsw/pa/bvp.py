@@ -13,6 +13,45 @@ import numpy
 
 #-----------------------------------------------------------------------------
 
+def rk4( f, x0, t ):
+    """Fourth-order Runge-Kutta solution of the initial value problem
+
+        x' = f(x,t), x(t[0]) = x0
+
+    USAGE:
+        x = rk4(f, x0, t)
+
+    INPUT:
+        f     - function of x and t returning an array of the same shape
+                as x.
+        x0    - the initial value of x, of any shape: e.g. a 2 element
+                array for one second order equation written as a first
+                order system, or a 2 x m array for m such problems (e.g.
+                m trial slopes y'(t[0])) integrated together.
+        t     - array of n time values to determine x at.
+
+    OUTPUT:
+        x     - array of solution values, of shape (n,) + x0.shape, with
+                x[i] the solution at t[i].
+    """
+
+    x0 = numpy.asarray( x0, dtype=float )
+    n = len( t )
+    x = numpy.zeros( ( n, ) + x0.shape )
+    x[0] = x0
+
+    for i in range( n - 1 ):
+        h = t[i+1] - t[i]
+        k1 = h * f( x[i], t[i] )
+        k2 = h * f( x[i] + 0.5 * k1, t[i] + 0.5 * h )
+        k3 = h * f( x[i] + 0.5 * k2, t[i] + 0.5 * h )
+        k4 = h * f( x[i] + k3, t[i+1] )
+        x[i+1] = x[i] + ( k1 + 2.0 * ( k2 + k3 ) + k4 ) / 6.0
+
+    return x
+
+#-----------------------------------------------------------------------------
+
 def shoot( f, a, b, z1, z2, t, tol ):
     """Implements the shooting method to solve second order BVPs
 
@@ -42,8 +81,6 @@ def shoot( f, a, b, z1, z2, t, tol ):
         refine the initial values of y' used for the initial value problems.
     """
 
-    from diffeq import rk4
-
     max_iter = 25   # Maximum number of shooting iterations
 
     n = len( t )    # Determine the size of the arrays we will generate
@@ -56,7 +93,7 @@ def shoot( f, a, b, z1, z2, t, tol ):
     y = rk4( f, [a,z1], t )
     w1 = y[n-1,0]
 
-    print "%2d: z = %10.3e, error = %10.3e" % ( 0, z1, b - w1 )
+    print( "%2d: z = %10.3e, error = %10.3e" % ( 0, z1, b - w1 ) )
 
     # Begin the main loop.  We will compute the solution of a second IVP and
     # then use the both solutions to refine our estimate of y'(a).  This
@@ -65,7 +102,7 @@ def shoot( f, a, b, z1, z2, t, tol ):
     # within the specified tolerance or we exceed the maximum number of
     # allowable iterations.
 
-    for i in xrange( max_iter ):
+    for i in range( max_iter ):
 
         # Solve second initial value problem, using y'(a) = z2.  We need to
         # retain the entire solution vector y since if y(t(n)) is close enough
@@ -75,7 +112,7 @@ def shoot( f, a, b, z1, z2, t, tol ):
         y = rk4( f, [a,z2], t )
         w2 = y[n-1,0]
 
-        print "%2d: z = %10.3e, error = %10.3e" % ( i+1, z2, b - w2 )
+        print( "%2d: z = %10.3e, error = %10.3e" % ( i+1, z2, b - w2 ) )
 
         # Check to see if we are done...
     
@@ -96,10 +133,10 @@ def shoot( f, a, b, z1, z2, t, tol ):
     # the solution.
 
     if abs( b - w2 ) >= tol:
-        print "\a**** ERROR ****"
-        print "Maximum number of iterations (%d) exceeded" % max_iter
-        print "Returned values may not have desired accuracy"
-        print "Error estimate of returned solution is %e" % ( b - w2 )
+        print( "\a**** ERROR ****" )
+        print( "Maximum number of iterations (%d) exceeded" % max_iter )
+        print( "Returned values may not have desired accuracy" )
+        print( "Error estimate of returned solution is %e" % ( b - w2 ) )
 
     return y[:,0]
 
@@ -180,7 +217,7 @@ def fd( u, v, w, t, a, b ):
 
     # Solve tridiagonal system
 
-    for i in xrange( 1, n ):
+    for i in range( 1, n ):
         xmult = A[i-1] / D[i-1]
         D[i] = D[i] - xmult * C[i-1]
         B[i] = B[i] - xmult * B[i-1]
@@ -188,15 +225,248 @@ def fd( u, v, w, t, a, b ):
     x = numpy.zeros( n )
     x[n-1] = B[n-1] / D[n-1]
 
-    for i in xrange( n - 2, -1, -1 ):
+    for i in range( n - 2, -1, -1 ):
         x[i] = ( B[i] - C[i] * x[i+1] ) / D[i]
 
     return x
 
 #-----------------------------------------------------------------------------
 
+def fd_batch( u, v, w, t, a, b ):
+    """Finite difference solution of many linear second order BVPs at once
+
+    Solves the m problems
+
+        x_k'' = u_k(t) + v_k(t) x_k + w_k(t) x_k'
+        x_k(t[0]) = a_k, x_k(t[n-1]) = b_k,   k = 0, ..., m-1
+
+    on the same n points t, as fd() does for one of them.  The m
+    tridiagonal systems are eliminated together, each step of the
+    elimination acting on all m systems at once, so the cost in Python
+    is that of a single call to fd().
+
+    USAGE:
+        x = fd_batch(u, v, w, t, a, b)
+
+    INPUT:
+        u,v,w - coefficients, each either an m x n array (one row per
+                problem), an n element array or a scalar (shared by all
+                of the problems).
+        t     - array of n time values to determine x at
+        a     - left boundary values: a scalar or an m element array
+        b     - right boundary values: a scalar or an m element array
+
+    OUTPUT:
+        x     - m x n array of solutions, x[k] corresponding to the values
+                in t.  If all of the inputs describe a single problem, an
+                n element array is returned as by fd().
+    """
+
+    t = numpy.asarray( t, dtype=float )
+    n = len( t )
+
+    u = numpy.asarray( u, dtype=float )
+    v = numpy.asarray( v, dtype=float )
+    w = numpy.asarray( w, dtype=float )
+    a = numpy.asarray( a, dtype=float )
+    b = numpy.asarray( b, dtype=float )
+
+    # Work out the number of problems from the shapes given.  The arrays
+    # below are stored transposed, n x m, so that each step of the
+    # elimination works on a contiguous row of m values.
+
+    shape = numpy.broadcast( numpy.zeros( n ), u, v, w,
+                             a[...,numpy.newaxis], b[...,numpy.newaxis] ).shape
+    single = len( shape ) == 1
+    if single:
+        shape = ( 1, n )
+    m = shape[0]
+
+    def columns( c ):
+        return numpy.array( numpy.broadcast_to( c, shape ).T )
+
+    u = columns( u )
+    v = columns( v )
+    w = columns( w )
+
+    h = t[1] - t[0]
+
+    # Construct the tridiagonal systems as in fd(), with one column per
+    # problem.
+
+    A = -( 1.0 + w[1:n] * h / 2.0 )
+    A[-1] = 0.0
+
+    C = -( 1.0 - w[0:n-1] * h / 2.0 )
+    C[0] = 0.0
+
+    D = 2.0 + h * h * v
+    D[0] = D[n-1] = 1.0
+
+    B = - h * h * u
+    B[0] = numpy.broadcast_to( a, ( m, ) )
+    B[n-1] = numpy.broadcast_to( b, ( m, ) )
+
+    # Solve the tridiagonal systems together
+
+    for i in range( 1, n ):
+        xmult = A[i-1] / D[i-1]
+        D[i] -= xmult * C[i-1]
+        B[i] -= xmult * B[i-1]
+
+    x = numpy.zeros( ( n, m ) )
+    x[n-1] = B[n-1] / D[n-1]
+
+    for i in range( n - 2, -1, -1 ):
+        x[i] = ( B[i] - C[i] * x[i+1] ) / D[i]
+
+    if single:
+        return x[:,0]
+    return x.T
+
+#-----------------------------------------------------------------------------
+
+def shoot_batch( f, a, b, z1, z2, t, tol, max_iter = 25 ):
+    """Implements the shooting method for many second order BVPs at once
+
+    USAGE:
+        y = shoot_batch(f, a, b, z1, z2, t, tol)
+
+    INPUT:
+        f     - function dy/dt = f(y,t) as for shoot(), but called with y
+                a 2 x m array holding y and y' for all m problems, and
+                returning a 2 x m array.  It may depend on parameters
+                that differ between the problems (e.g. through m element
+                arrays), as the m problems are always integrated together
+                in the same order.
+        a     - left boundary values y(t[0]): a scalar or m element array.
+        b     - right boundary values y(t[n-1]): a scalar or m element
+                array.
+        z1    - first initial estimates of y'(t[0]), as for a and b.
+        z2    - second initial estimates of y'(t[0]), as for a and b.
+        t     - array of n time values to determine y at.
+        tol   - allowable tolerance on right boundary: | b - y[n-1] | < tol
+        max_iter - maximum number of shooting iterations.
+
+    OUTPUT:
+        y     - m x n array of solutions, y[k] corresponding to the values
+                in the supplied array t.  If a, b, z1 and z2 are all
+                scalars, an n element array is returned as by fd_batch().
+
+    NOTE:
+        As in shoot(), each estimate of y'(t[0]) is refined by the secant
+        method, but here all m trial slopes are integrated together by one
+        call to rk4() per iteration.  The slope of a problem is no longer
+        changed once it meets the tolerance, and the iteration stops when
+        all of them do (or after max_iter iterations, with a warning).
+    """
+
+    n = len( t )
+
+    a, b, z1, z2 = numpy.broadcast_arrays( *[ numpy.asarray( c, dtype=float )
+                                              for c in ( a, b, z1, z2 ) ] )
+    single = a.ndim == 0
+    m = a.size
+    a = a.ravel()
+    b = b.ravel()
+    z1 = z1.ravel().copy()
+    z2 = z2.ravel().copy()
+
+    y = rk4( f, numpy.array( [a, z1] ), t )
+    w1 = y[n-1,0]
+
+    for i in range( max_iter ):
+        y = rk4( f, numpy.array( [a, z2] ), t )
+        w2 = y[n-1,0]
+
+        done = abs( b - w2 ) < tol
+        if done.all():
+            break
+
+        # Secant step for those problems which have not converged:
+
+        with numpy.errstate( divide = 'ignore', invalid = 'ignore' ):
+            znew = z2 + ( z2 - z1 ) / ( w2 - w1 ) * ( b - w2 )
+        z1 = numpy.where( done, z1, z2 )
+        z2 = numpy.where( done, z2, znew )
+        w1 = numpy.where( done, w1, w2 )
+
+    err = abs( b - w2 )
+    if ( err >= tol ).any():
+        print( "\a**** ERROR ****" )
+        print( "Maximum number of iterations (%d) exceeded" % max_iter )
+        print( "%d of %d problems may not have desired accuracy" %
+               ( ( err >= tol ).sum(), m ) )
+        print( "Largest error estimate of returned solutions is %e" %
+               err.max() )
+
+    if single:
+        return y[:,0,0]
+    return y[:,0].T
+
+#-----------------------------------------------------------------------------
+
+def benchmark( m = 200, n = 1000 ):
+    """Compares the batched solvers with the per-call loops they replace
+
+    Solves m problems x'' = u_k(t) + x, with u_k = 4 c_k exp(t), on n
+    points, by calling fd() for each problem and by one call to
+    fd_batch(), and integrates the m corresponding initial value problems
+    by calling rk4() for each trial slope and once for all of them (as in
+    one iteration of shoot() and of shoot_batch()).  The times taken and
+    the largest differences between the solutions are printed.
+    """
+
+    import time
+
+    t = numpy.linspace( 0.0, 0.5, n )
+    c = numpy.linspace( 0.5, 2.0, m )
+    u = 4.0 * c[:,numpy.newaxis] * numpy.exp( t )
+    a = c
+    b = 2.0 * c * numpy.exp( 0.5 )
+
+    t0 = time.time()
+    x1 = numpy.array( [ fd( u[k], 1.0, 0.0, t, a[k], b[k] )
+                        for k in range( m ) ] )
+    t1 = time.time()
+    x2 = fd_batch( u, 1.0, 0.0, t, a, b )
+    t2 = time.time()
+
+    print( "Finite differences, %d problems of %d points:" % ( m, n ) )
+    print( "   fd() loop:  %8.4f s" % ( t1 - t0 ) )
+    print( "   fd_batch(): %8.4f s  (speed-up %.1f, max difference %.2e)" %
+           ( t2 - t1, ( t1 - t0 ) / ( t2 - t1 ), abs( x2 - x1 ).max() ) )
+
+    def f( x, t ):
+        return numpy.array( [x[1], x[0] + 4.0 * c * numpy.exp( t )] )
+
+    z = 3.0 * c
+
+    t0 = time.time()
+    y1 = numpy.array( [ rk4( lambda x, s: numpy.array(
+                                 [x[1], x[0] + 4.0 * c[k] * numpy.exp( s )] ),
+                             [a[k], z[k]], t )[:,0] for k in range( m ) ] )
+    t1 = time.time()
+    y2 = rk4( f, numpy.array( [a, z] ), t )[:,0].T
+    t2 = time.time()
+
+    print( "Shooting trajectories, %d slopes of %d points:" % ( m, n ) )
+    print( "   rk4() loop: %8.4f s" % ( t1 - t0 ) )
+    print( "   batched:    %8.4f s  (speed-up %.1f, max difference %.2e)" %
+           ( t2 - t1, ( t1 - t0 ) / ( t2 - t1 ), abs( y2 - y1 ).max() ) )
+
+#-----------------------------------------------------------------------------
+
 if __name__ == "__main__":
 
+    import sys
+
+    # "bvp.py benchmark" times the batched solvers instead of the demo.
+
+    if sys.argv[1:2] == ['benchmark']:
+        benchmark()
+        sys.exit()
+
     import math
     from pylab import *
 
@@ -248,7 +518,7 @@ if __name__ == "__main__":
     ylabel( '$x$' )
     legend( ( '%3d points' % n1, '%3d points' % n2 ), loc='lower right' )
     draw()
-    z = raw_input( "Press ENTER to continue..." );
+    z = input( "Press ENTER to continue..." );
 
     cla()
     plot( t1, xs1, 'ro', t2, xs2, 'b-' )
@@ -257,7 +527,7 @@ if __name__ == "__main__":
     ylabel( '$x$' )
     legend( ( '%3d points' % n1, '%3d points' % n2 ), loc='lower right' )
     draw()
-    z = raw_input( "Press ENTER to continue..." )
+    z = input( "Press ENTER to continue..." )
 
     # Plot errors
 
@@ -268,7 +538,7 @@ if __name__ == "__main__":
     ylabel( '$x$' )
     legend( ( '%3d points' % n1, '%3d points' % n2 ), loc='center' )
     draw()
-    z = raw_input( "Press ENTER to continue..." );
+    z = input( "Press ENTER to continue..." );
 
     cla()
     plot( t1, xs1 - x1, 'ro', t2, xs2 - x2, 'b-' )
@@ -277,7 +547,7 @@ if __name__ == "__main__":
     ylabel( '$x$' )
     legend( ( '%3d points' % n1, '%3d points' % n2 ), loc='center' )
     draw()
-    z = raw_input( "Press ENTER to continue..." );
+    z = input( "Press ENTER to continue..." );
 
     cla() 
     plot( t1, xfd1 - x1, 'ro-', t1, xs1 - x1, 'b-' )
@@ -291,4 +561,4 @@ if __name__ == "__main__":
     ylabel( '$x$' )
     legend( ( 'Finite Differences', 'Shooting' ), loc='center' )
     draw()
-    z = raw_input( "Press ENTER to quit..." );
+    z = input( "Press ENTER to quit..." );
@@ -1,6 +1,8 @@
 #======================================================================
-# Creates frequency power spectra for phi_j(t)-phi_j(0) and v_j(t) from
-# data previously generated by pam.f90.
+# Creates frequency power spectra for phi_j(t)-phi_j(0), u_j(t) and
+# v_j(t) from data previously generated by pam.f90, either summed over
+# all intervals j (weighted by mass) or as diagrams of the spectrum at
+# each latitude (or mass coordinate) against frequency.
 #======================================================================
 
 #=====perform various generic imports=====
@@ -8,11 +10,15 @@ import warnings,os,sys
 import numpy as np
 
 import matplotlib.pyplot as plt
+import matplotlib.cm as cm
 import matplotlib as mpl
 from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
+from pyio.frequency import frame_spectra
 
 ## global settings
 
@@ -52,70 +58,34 @@ phi0[1:]=0.5*(x0[0:n-1]+x0[1:n])
 # Mass weight array:
 w=x1
 
-# Read data:
-datafile='phi.r8'
-file_bytes = os.path.getsize(datafile)
-nt = int(file_bytes/((n+1)*8))
+print()
+print(' Show (1) the spectra summed over all intervals or')
+print('      (2) latitude-frequency diagrams as well?')
+opt_in = input(' Choice (default 1)? ')
+mode = int(opt_in or 1)
+
+if mode==2:
+   opt_in = input(' Plot against (1) latitude or (2) mass coordinate (default 1)? ')
+   ycoord = int(opt_in or 1)
+   opt_in = input(' Weight the spectra by the mass of each interval (default n)? ')
+   wopt = str(opt_in or 'n')
+
+# Memory-map the data:
+phi_frames=FrameFile('phi.r8',n,np.float64)
+u_frames=FrameFile('u.r8',n,np.float64)
+v_frames=FrameFile('v.r8',n,np.float64)
+nt=len(phi_frames)
 print (' Number of time frames: %d' %nt)
-print('')
-frames = range(nt)
-print (' Reading data from phi.r8...')
-in_file = open(datafile,'r')
-raw_array = np.fromfile(in_file,dtype=np.float64)
-d = np.empty((nt,n))
-for i in frames:
-   d[i,:] = raw_array[i*(n+1)+1:(i+1)*(n+1)] - phi0
-in_file.close()    
-time=np.array([raw_array[i*(n+1)] for i in frames])
-
-datafile='u.r8'
-print (' Reading data from u.r8...')
-in_file = open(datafile,'r')
-raw_array = np.fromfile(in_file,dtype=np.float64)
-u = np.empty((nt,n))
-for i in frames:
-   u[i,:] = raw_array[i*(n+1)+1:(i+1)*(n+1)]
-in_file.close()    
-
-datafile='v.r8'
-print (' Reading data from v.r8...')
-in_file = open(datafile,'r')
-raw_array = np.fromfile(in_file,dtype=np.float64)
-v = np.empty((nt,n))
-for i in frames:
-   v[i,:] = raw_array[i*(n+1)+1:(i+1)*(n+1)]
-in_file.close()    
 
 print('')
 print (' Creating frequency spectra...')
 
-# Create array holding the frequencies:
-time_step = time[1] - time[0]
-freqs = np.fft.fftfreq(time.size, time_step)
-
-# Accumulate power spectra:
-Sd=np.zeros(nt)
-Su=np.zeros(nt)
-Sv=np.zeros(nt)
-for k in range(n):
-   ps=np.abs(np.fft.fft(d[:,k]))**2
-   Sd=Sd+w[k]*ps
-   ps=np.abs(np.fft.fft(u[:,k]))**2
-   Su=Su+w[k]*ps
-   ps=np.abs(np.fft.fft(v[:,k]))**2
-   Sv=Sv+w[k]*ps
-
-# As signal is real, fold over and add spectrum:
-nh_times=int((nt-1)/2)
-for i in range(1,nh_times):
-   Sd[i]=Sd[i]+Sd[nt-i]
-   Su[i]=Su[i]+Su[nt-i]
-   Sv[i]=Sv[i]+Sv[nt-i]
-
-logomega=np.log10(freqs[1:nh_times])
-logSd=np.log10(Sd[1:nh_times])
-logSu=np.log10(Su[1:nh_times])
-logSv=np.log10(Sv[1:nh_times])
+# Power spectra in each interval, found a few intervals at a time:
+freqs,Sd=frame_spectra(phi_frames,phi0)
+freqs,Su=frame_spectra(u_frames)
+freqs,Sv=frame_spectra(v_frames)
+
+logomega=np.log10(freqs)
 
 # Limits in log_10{f}:
 xlims=[-1.0,0.4]
@@ -127,36 +97,47 @@ f_lin=np.log10(f_lin)
 c_lin=['m','g','m','g','m','g','m','g','m','g','m','g','m','g','m','g','m','g']
 
 #------------------------------------------------------------------------
-# Plot S vs omega:
-fig1 = plt.figure(1,figsize=[10,6])
-ax1 = fig1.add_subplot(111)
-ax1.set_xlabel('$\log_{10}f$', fontsize=30)
-ax1.set_ylabel('$\log_{10}{\mathcal{P}}_d$', fontsize=30)
-ax1.set_xlim(xlims)
-ax1.plot(logomega,logSd,c='k',lw=1)
-for m,f in enumerate(f_lin):
-   ax1.axvline(f,color=c_lin[m],linestyle='--')
-fig1.savefig('d_fspec.eps', format='eps', dpi=600)
-
-fig2 = plt.figure(2,figsize=[10,6])
-ax2 = fig2.add_subplot(111)
-ax2.set_xlabel('$\log_{10}f$', fontsize=30)
-ax2.set_ylabel('$\log_{10}{\mathcal{P}}_u$', fontsize=30)
-ax2.set_xlim(xlims)
-ax2.plot(logomega,logSu,c='k',lw=1)
-for m,f in enumerate(f_lin):
-   ax2.axvline(f,color=c_lin[m],linestyle='--')
-fig2.savefig('u_fspec.eps', format='eps', dpi=600)
-
-fig3 = plt.figure(3,figsize=[10,6])
-ax3 = fig3.add_subplot(111)
-ax3.set_xlabel('$\log_{10}f$', fontsize=30)
-ax3.set_ylabel('$\log_{10}{\mathcal{P}}_v$', fontsize=30)
-ax3.set_xlim(xlims)
-ax3.plot(logomega,logSv,c='k',lw=1)
-for m,f in enumerate(f_lin):
-   ax3.axvline(f,color=c_lin[m],linestyle='--')
-fig3.savefig('v_fspec.eps', format='eps', dpi=600)
+# Plot the mass-weighted sum of the spectra vs omega:
+for fig,S,var in [(1,Sd,'d'),(2,Su,'u'),(3,Sv,'v')]:
+   fig1 = plt.figure(fig,figsize=[10,6])
+   ax1 = fig1.add_subplot(111)
+   ax1.set_xlabel('$\log_{10}f$', fontsize=30)
+   ax1.set_ylabel('$\log_{10}{\mathcal{P}}_'+var+'$', fontsize=30)
+   ax1.set_xlim(xlims)
+   ax1.plot(logomega,np.log10(np.dot(w,S)),c='k',lw=1)
+   for m,f in enumerate(f_lin):
+      ax1.axvline(f,color=c_lin[m],linestyle='--')
+   fig1.savefig(var+'_fspec.eps', format='eps', dpi=600)
 
 print('')
 print(' Frequency spectra available in d_fspec.eps, u_fspec.eps & v_fspec.eps')
+
+if mode==2:
+   #------------------------------------------------------------------------
+   # Plot the spectrum in each interval vs latitude (or mass) and omega,
+   # with the frequencies of the linear modes found by linear.py:
+   if ycoord==2:
+      # Fraction of the total mass south of the centre of each interval:
+      y=(np.cumsum(w)-0.5*w)/np.sum(w)
+      ylabel='$m/M$'
+   else:
+      y=phi0*180.0/np.pi
+      ylabel='$\phi_0$'
+
+   for fig,S,var in [(4,Sd,'d'),(5,Su,'u'),(6,Sv,'v')]:
+      if wopt=='y':
+         S=w[:,None]*S
+      fig1 = plt.figure(fig,figsize=[10,8])
+      ax1 = fig1.add_subplot(111)
+      ax1.set_xlabel('$\log_{10}f$', fontsize=30)
+      ax1.set_ylabel(ylabel, fontsize=30)
+      ax1.set_xlim(xlims)
+      im=ax1.pcolormesh(logomega,y,np.log10(S),cmap=cm.viridis,shading='nearest')
+      cbar=fig1.colorbar(im)
+      cbar.set_label('$\log_{10}{\mathcal{P}}_'+var+'$', fontsize=30)
+      for m,f in enumerate(f_lin):
+         ax1.axvline(f,color=c_lin[m],linestyle='--')
+      fig1.savefig(var+'_lfspec.eps', format='eps', dpi=600)
+
+   print('')
+   print(' Latitude-frequency diagrams available in d_lfspec.eps, u_lfspec.eps & v_lfspec.eps')
@@ -2,88 +2,127 @@
 
 #=====perform various generic imports=====
 import numpy as np
-from numpy import linalg as LA
+from scipy.linalg import eigh_tridiagonal
+import zonal
 #=========================================
 
+def operator(n):
+   # The linear operator acting on the interior values 1 to n-1 is
+   # tridiagonal, A = diag(1/r)*K with K symmetric, and is symmetrised
+   # as R^(1/2)*A*R^(-1/2) (where R = diag(r)), which has the same
+   # eigenvalues.  Returns the diagonal without the gamma^2*z^2 term,
+   # z^2, the off-diagonal and sqrt(r) (to recover the eigenvectors).
+   a=np.linspace(-np.pi/2.0,np.pi/2.0,n+1)
+   r=np.cos(a)
+   rsq=r*r
+   z=np.sin(a)
+   zsq=z*z
+   da=a[1]-a[0]
+   dasq=da*da
+   ah=np.linspace(-(np.pi-da)/2.0,(np.pi-da)/2.0,n)
+   rh=np.cos(ah)
+
+   diag=(rh[0:n-1]+rh[1:n])/(dasq*r[1:n])+1.0/rsq[1:n]
+   offdiag=-rh[1:n-1]/(dasq*np.sqrt(r[1:n-1]*r[2:n]))
+   return diag,zsq[1:n],offdiag,np.sqrt(r[1:n])
+
+def lowest_modes(gammas,n,nlow,vectors=False):
+   """
+   Finds the nlow lowest frequencies omega/(2*pi) of the linear modes
+   for each gamma = 1/L_d in gammas, returning an array of shape
+   (len(gammas), nlow), and if vectors is set the corresponding
+   eigenvectors (of shape (len(gammas), n-1, nlow)).  Only the wanted
+   eigenpairs of the symmetric tridiagonal operator are computed.
+   """
+   gammas=np.atleast_1d(np.asarray(gammas,dtype=float))
+   diag,zsq,offdiag,rroot=operator(n)
+   # The diagonal for all gamma at once:
+   diags=diag+gammas[:,None]**2*zsq
+   # omega/(2*pi) = sqrt(eigenvalue)*c_gw/(2*pi) where c_gw = f_pole/gamma:
+   sfac=zonal.fpole/(2.0*np.pi*gammas)
+
+   sig=np.empty((len(gammas),nlow))
+   vecs=np.empty((len(gammas),n-1,nlow)) if vectors else None
+   for i in range(len(gammas)):
+      if vectors:
+         lam,vec=eigh_tridiagonal(diags[i],offdiag,select='i',select_range=(0,nlow-1))
+         vecs[i]=vec/rroot[:,None]
+      else:
+         lam=eigh_tridiagonal(diags[i],offdiag,eigvals_only=True,select='i',select_range=(0,nlow-1))
+      sig[i]=sfac[i]*np.sqrt(lam)
+   return sig,vecs
+
+#-------------------------------------------------------------------------
+print(' Enter several values of gamma (separated by commas, or as')
+print(' start:end:increment) to tabulate the frequencies against gamma.')
 gamma_in = input(' Enter gamma = 1/L_d (default: 20)? ')
-gamma = float(gamma_in or 20.0)
-gsq=gamma**2
-
-fpole=4.0*np.pi
-cgw=fpole/gamma
+gammas = zonal.parse_list(gamma_in or '20')
 
 n_in = input(' Enter n (default: 500)? ')
 n = int(n_in or 500)
 
-n1=n-1
-n2=n-2
-
-a=np.linspace(-np.pi/2.0,np.pi/2.0,n+1)
-r=np.cos(a)
-rsq=r*r
-
-z=np.sin(a)
-zsq=z*z
-
-da=a[1]-a[0]
-dasq=da*da
-
-ah=np.linspace(-(np.pi-da)/2.0,(np.pi-da)/2.0,n)
-rh=np.cos(ah)
-
-Amat = np.zeros([n1,n1])
-for j in range(n1):
-   Amat[j,j]=(rh[j]+rh[j+1])/(dasq*r[j+1])+1.0/rsq[j+1]+gsq*zsq[j+1]
-
-for j in range(1,n1):
-   Amat[j-1,j]=-rh[j]/(dasq*r[j])
-   Amat[j,j-1]=-rh[j]/(dasq*r[j+1])
-
-#Compute eigenvalues (sig) and eigenvectors (vec):
-sig, vec = LA.eig(Amat)
-
-sfac=cgw/(2.0*np.pi)
-sig = sfac*np.sqrt(sig)
-
-freq_file = open('freq.asc','w')
-
-print('')
-print(' Minimum frequencies, omega/(2*pi):')
-
 nlow=10
-for m in range(nlow):
-
-   i=np.argmin(sig)
-   print (sig[i])
-   freq_file.write("%f \n" % sig[i])
-
-   if sum(r[1:n]*vec[:,i]) < 0.0:
-      vec[:,i]=-vec[:,i]
-
-   vnorm=np.sqrt(da*sum(r[1:n]*vec[:,i]**2))
-   vec[:,i]=vec[:,i]/vnorm
-      
-   vect_file = open('d'+str(m+1)+'.asc','w')
-   vect_file.write("%f %f \n" % (0.0, a[0]))
-   for j in range(n1):
-      vect_file.write("%f %f \n" % (vec[j,i], a[j+1]))
-   vect_file.write("%f %f \n" % (0.0, a[n]))
-   vect_file.close()
-
-   vect_file = open('u'+str(m+1)+'.asc','w')
-   vect_file.write("%f %f \n" % (0.0, a[0]))
-   for j in range(n1):
-      vect_file.write("%f %f \n" % (z[j+1]*vec[j,i], a[j+1]))
-   vect_file.write("%f %f \n" % (0.0, a[n]))
-   vect_file.close()
-
-   vect_file = open('h'+str(m+1)+'.asc','w')
-   vect_file.write("%f %f \n" % (-r[1]*vec[0,i]/(da*rh[0]), ah[0]))
-   for j in range(1,n1):
-      vect_file.write("%f %f \n" % ((r[j]*vec[j-1,i]-r[j+1]*vec[j,i])/(da*rh[j]), a[j]))
-   vect_file.write("%f %f \n" % (r[n1]*vec[n2,i]/(da*rh[n1]), ah[n1]))
-   vect_file.close()
-
-   sig[i]=1.e9
-
-freq_file.close()
+
+if len(gammas) > 1:
+   # Tabulate the lowest frequencies only:
+   sig,vecs=lowest_modes(gammas,n,nlow)
+   freq_file = open('freq_table.asc','w')
+   for i,gamma in enumerate(gammas):
+      freq_file.write(("%f"+nlow*" %f"+" \n") % ((gamma,)+tuple(sig[i])))
+   freq_file.close()
+
+   print('')
+   print(' gamma and the ',nlow,' lowest frequencies, omega/(2*pi), are listed in freq_table.asc')
+
+else:
+   sig,vecs=lowest_modes(gammas,n,nlow,vectors=True)
+   sig=sig[0]
+   vec=vecs[0]
+
+   n1=n-1
+   n2=n-2
+
+   a=np.linspace(-np.pi/2.0,np.pi/2.0,n+1)
+   r=np.cos(a)
+   z=np.sin(a)
+   da=a[1]-a[0]
+   ah=np.linspace(-(np.pi-da)/2.0,(np.pi-da)/2.0,n)
+   rh=np.cos(ah)
+
+   freq_file = open('freq.asc','w')
+
+   print('')
+   print(' Minimum frequencies, omega/(2*pi):')
+
+   for m in range(nlow):
+      print (sig[m])
+      freq_file.write("%f \n" % sig[m])
+
+      if sum(r[1:n]*vec[:,m]) < 0.0:
+         vec[:,m]=-vec[:,m]
+
+      vnorm=np.sqrt(da*sum(r[1:n]*vec[:,m]**2))
+      vec[:,m]=vec[:,m]/vnorm
+
+      vect_file = open('d'+str(m+1)+'.asc','w')
+      vect_file.write("%f %f \n" % (0.0, a[0]))
+      for j in range(n1):
+         vect_file.write("%f %f \n" % (vec[j,m], a[j+1]))
+      vect_file.write("%f %f \n" % (0.0, a[n]))
+      vect_file.close()
+
+      vect_file = open('u'+str(m+1)+'.asc','w')
+      vect_file.write("%f %f \n" % (0.0, a[0]))
+      for j in range(n1):
+         vect_file.write("%f %f \n" % (z[j+1]*vec[j,m], a[j+1]))
+      vect_file.write("%f %f \n" % (0.0, a[n]))
+      vect_file.close()
+
+      vect_file = open('h'+str(m+1)+'.asc','w')
+      vect_file.write("%f %f \n" % (-r[1]*vec[0,m]/(da*rh[0]), ah[0]))
+      for j in range(1,n1):
+         vect_file.write("%f %f \n" % ((r[j]*vec[j-1,m]-r[j+1]*vec[j,m])/(da*rh[j]), a[j]))
+      vect_file.write("%f %f \n" % (r[n1]*vec[n2,m]/(da*rh[n1]), ah[n1]))
+      vect_file.close()
+
+   freq_file.close()
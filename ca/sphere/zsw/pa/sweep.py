@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+#=================================================================
+#   Finds balanced zonal spherical shallow water flows over a grid
+#   of parameters gamma, A and w (see balance.py)
+#=================================================================
+
+# For each pair (gamma, w), the flows are found for increasing A by
+# continuation from rest, each iteration starting from the solution
+# for a slightly smaller A (as in allbal.py).  The pairs are
+# independent and are processed in parallel.
+
+# The results are stored in the directory sweep:
+#   sweep/summary.asc lists gamma, w, A, n, the number of iterations,
+#     whether the iteration converged (1) or not (0), and the kinetic,
+#     potential and total energies, for every flow found;
+#   sweep/g<gamma>w<w>/A<A>/ holds, for each flow, init.asc (to
+#     initialise pam.f90), profiles.asc (a, phi-a, u/Omega, h and
+#     zeta, as written by balance.py) and history.asc (the maximum
+#     change in phi at each iteration).
+
+#=====perform various generic imports=====
+import os
+import multiprocessing
+import numpy as np
+import zonal
+#=========================================
+
+def run_branch(args):
+   # Find the flows for one (gamma, w) and all amplitudes:
+   gamma,wid,amps,n,damp=args
+   if n is None:
+      n=zonal.default_resolution(gamma,wid)
+   results=[]
+   for amp,phi,F,history in zonal.continuation(gamma,wid,amps,n,damp):
+      direc=os.path.join('sweep','g'+str(gamma)+'w'+str(wid),'A'+str(round(amp,10)))
+      if not os.path.isdir(direc):
+         os.makedirs(direc)
+      np.savetxt(os.path.join(direc,'history.asc'),history,fmt='%.6e')
+      if not zonal.converged(amp,history):
+         results.append((gamma,wid,amp,n,len(history),0,0.0,0.0,0.0))
+         break
+      dphi,u,h,zeta,mass,energies=zonal.profiles(gamma,amp,wid,phi)
+      zonal.write_profiles(os.path.join(direc,'profiles.asc'),phi,dphi,u,h,zeta)
+      zonal.write_init(os.path.join(direc,'init.asc'),phi,mass)
+      results.append((gamma,wid,amp,n,len(history),1)+energies)
+   return results
+
+#-------------------------------------------------------------------------
+print()
+print(' This routine finds balanced zonal shallow-water flows on a sphere')
+print(' for all combinations of the parameters given.  Enter the values of')
+print(' each as a list separated by commas, or as start:end:increment.')
+print()
+
+gamma_in = input(' Enter gamma = 1/L_d (default: 20)? ')
+gammas = zonal.parse_list(gamma_in or '20')
+
+print()
+print( ' We consider h_bar(a) = 1 - A*tanh(z_bar/w) where z_bar = sin(a).')
+
+amp_in = input(' Enter A (default: 0.1:0.5:0.1)? ')
+amps = sorted(zonal.parse_list(amp_in or '0.1:0.5:0.1'))
+
+damp_in = input(' Maximum increment in A to aid convergence (default: 0.01)? ')
+damp = float(damp_in or 0.01)
+
+wid_in = input(' Enter w (default: 0.1)? ')
+wids = zonal.parse_list(wid_in or '0.1')
+
+n_in = input(' Enter the resolution, n (default: depends on gamma and w)? ')
+n = int(n_in) if n_in else None
+
+nproc_def = os.cpu_count() or 1
+nproc_in = input(' Number of processes (default: '+str(nproc_def)+')? ')
+nproc = int(nproc_in or nproc_def)
+print()
+
+if not os.path.isdir('sweep'):
+   os.makedirs('sweep')
+
+branches=[(gamma,wid,amps,n,damp) for gamma in gammas for wid in wids]
+nproc=min(nproc,len(branches))
+results=[]
+if nproc > 1:
+   with multiprocessing.get_context('fork').Pool(nproc) as pool:
+      for args,branch in zip(branches,pool.imap(run_branch,branches)):
+         results+=branch
+         print(' Done gamma = %g, w = %g' % args[0:2])
+else:
+   for args in branches:
+      results+=run_branch(args)
+      print(' Done gamma = %g, w = %g' % args[0:2])
+
+out_file = open(os.path.join('sweep','summary.asc'),'w')
+nfail=0
+for gamma,wid,amp,n,nit,conv,ekin,epot,etot in results:
+   out_file.write("%g %g %g %d %d %d %15.12f %15.12f %15.12f \n" % \
+                  (gamma, wid, amp, n, nit, conv, ekin, epot, etot))
+   if not conv:
+      nfail+=1
+out_file.close()
+
+print()
+print(' Found',len(results)-nfail,'balanced flows;',nfail,'branches stopped as the iteration diverged.')
+print(' See sweep/summary.asc, and sweep/g<gamma>w<w>/A<A>/ for each flow.')
+print()
@@ -0,0 +1,234 @@
+#=================================================================
+#   Balanced zonal spherical shallow water flows: the iterative
+#   solver used by balance.py, allbal.py and sweep.py
+#=================================================================
+
+# We consider h_bar(a) = 1 - A*tanh(z_bar/w) where z_bar = sin(a), and
+# find the latitude phi(a) of each fluid particle initially at a such
+# that the flow is in balance, on a grid of n intervals in a.
+
+#=====perform various generic imports=====
+import numpy as np
+from scipy.linalg import solve_banded
+#=========================================
+
+Omega=2.0*np.pi
+fpole=2.0*Omega
+
+def parse_list(text):
+   # Values separated by commas, or a range start:end:increment:
+   if ':' in text:
+      start,end,step=[float(x) for x in text.split(':')]
+      return list(np.arange(start,end+0.5*step,step))
+   return [float(x) for x in text.split(',')]
+
+def default_resolution(gamma,wid):
+   # Resolution needed to resolve both L_d and the width w:
+   return max(500,int(25.0*gamma+0.5),int(50.0/wid+0.5))
+
+def derivatives(phi):
+   # Centred differences of phi, as updated during the iteration
+   # (the end values are not used):
+   n=len(phi)-1
+   a=np.linspace(-np.pi/2.0,np.pi/2.0,n+1)
+   da=a[1]-a[0]
+   dpda=np.ones(n+1)
+   d2pda2=np.zeros(n+1)
+   dpda[1:n]=(phi[2:n+1]-phi[0:n-1])/(2.0*da)
+   d2pda2[1:n]=(phi[2:n+1]-2.0*phi[1:n]+phi[0:n-1])/da**2
+   return dpda,d2pda2
+
+def solve(gamma,amp,wid,n,phi=None,relax=0.5,maxit=10000,verbose=False):
+   """
+   Iterates to find the balanced flow for the given gamma = 1/L_d, A and
+   w, starting from the flow phi (e.g. the solution for a nearby A) if
+   given, or from rest (phi = a).  Each iteration solves the linearised
+   (tridiagonal) equations for the correction to phi with a banded
+   solver.
+
+   Returns phi, the error F in the equilibrium equation, and the maximum
+   change in phi at each iteration; the iteration has converged if the
+   last change is below |A|*1.e-11, and is stopped (as diverging) once
+   a change exceeds 1, or after maxit iterations.
+   """
+   gam2=(gamma/2.0)**2
+   wi=1.0/wid
+   np1=n+1
+
+   a=np.linspace(-np.pi/2.0,np.pi/2.0,np1)
+   da=a[1]-a[0]
+   ddai=0.5/da
+   da2i=1.0/da**2
+   tda2i=2.0*da2i
+
+   rb=np.cos(a)
+   rb4=(rb**2)**2
+   zb=np.sin(a)
+   hb=1.0-amp*np.tanh(wi*zb)
+   # r_bar*h_bar:
+   rbhb=rb*hb
+   # d(r_bar*h_bar)/da:
+   drbhbda=-zb*hb-rb*amp*wi/np.cosh(wi*zb)**2
+
+   # Maximum error between successive guesses:
+   toler=abs(amp)*1.e-11
+
+   # Initial guess:
+   if phi is None:
+      phi=a
+      dpda=np.ones(np1)
+      d2pda2=np.zeros(np1)
+   else:
+      phi=np.array(phi,dtype=float)
+      dpda,d2pda2=derivatives(phi)
+   phipre=phi
+
+   # Tridiagonal matrix, stored by diagonals for solve_banded:
+   ab=np.zeros((3,n-1))
+
+   history=[]
+   ddmax=1.0
+   while ddmax > toler:
+      r=np.cos(phi)
+      r[0]=1.0
+      r[n]=1.0
+      ri=1.0/r
+      r[0]=0.0
+      r[n]=0.0
+      r2=r*r
+      r2i=ri*ri
+      z=np.sin(phi)
+      zdr=z*ri
+
+      dpi=1.0/dpda
+      dpi2=dpi**2
+
+      tt=r2-rb4*r2i
+      dd22=d2pda2*dpi2
+      F=gam2*z*tt+rbhb*dpi*(dd22-zdr)-drbhbda*dpi2
+      F[0]=0.0
+      F[n]=0.0
+      # dF/dphi:
+      G0=gam2*r*(tt-2.0*z*z*(1.0+rb4*r2i**2))-rbhb*dpi*r2i
+      # dF/dphi':
+      G1=dpi2*(rbhb*(zdr-3.0*dd22)+2.0*drbhbda*dpi)
+      # dF/dphi'':
+      G2=rbhb*dpi*dpi2
+
+      # Upper, main and lower diagonals at interior points 1 to n-1:
+      ab[0,1:]=da2i*G2[1:n-1]+ddai*G1[1:n-1]
+      ab[1,:]=G0[1:n]-tda2i*G2[1:n]
+      ab[2,:-1]=da2i*G2[2:n]-ddai*G1[2:n]
+
+      dphi=np.zeros(np1)
+      dphi[1:n]=solve_banded((1,1),ab,-F[1:n],check_finite=False)
+
+      phi=phi+relax*dphi
+      dpda[1:n]=ddai*(phi[2:np1]-phi[0:n-1])
+      d2pda2[1:n]=da2i*(phi[2:np1]-2.0*phi[1:n]+phi[0:n-1])
+
+      ddmax=np.amax(abs(phi-phipre))
+      history.append(ddmax)
+      if verbose:
+         print (' Iter ',len(history),'  Error = ',ddmax)
+
+      if ddmax > 1.0 or not np.isfinite(ddmax) or len(history) == maxit:
+         break
+      phipre=phi
+
+   return phi,F,history
+
+def converged(amp,history):
+   return history[-1] <= abs(amp)*1.e-11
+
+def continuation(gamma,wid,amps,n,damp=0.001,relax=0.5):
+   """
+   Follows the branch of balanced flows for fixed gamma and w through
+   the increasing amplitudes amps, starting from rest at A = 0 and
+   increasing A in steps of at most damp, each solve starting from the
+   solution for the previous A.  For each A in amps, yields A, phi, F
+   and the history of the iteration (see solve).  If the iteration does
+   not converge, the A at which it failed (possibly one of the steps
+   between two of amps) is yielded with its phi, F and history, and
+   the continuation stops.
+   """
+   phi=None
+   amp=0.0
+   for target in amps:
+      nstep=max(1,int(np.ceil((target-amp)/damp-1.e-7)))
+      for a in np.linspace(amp,target,nstep+1)[1:]:
+         phi,F,history=solve(gamma,a,wid,n,phi,relax)
+         if not converged(a,history):
+            yield a,phi,F,history
+            return
+      amp=target
+      yield amp,phi,F,history
+
+def profiles(gamma,amp,wid,phi):
+   """
+   Returns the displacement phi-a, the zonal velocity u/Omega, the
+   dimensionless height h, the vorticity (h*q-f)/(2*Omega) and the mass
+   of each interval for the balanced flow phi, together with the
+   kinetic, potential and total energies.
+   """
+   n=len(phi)-1
+   np1=n+1
+   wi=1.0/wid
+   cgw=fpole/gamma
+
+   a=np.linspace(-np.pi/2.0,np.pi/2.0,np1)
+   rb=np.cos(a)
+   zb=np.sin(a)
+   hb=1.0-amp*np.tanh(wi*zb)
+   dpda,d2pda2=derivatives(phi)
+
+   r=np.cos(phi)
+   r[0]=1.0
+   r[n]=1.0
+   ri=1.0/r
+   r[0]=0.0
+   r[n]=0.0
+   z=np.sin(phi)
+
+   # Displacement:
+   dphi=phi-a
+   # Zonal velocity u / Omega:
+   u=rb*rb*ri-r
+   # Dimensionless height:
+   h=rb*hb*ri
+   h[1:n]=h[1:n]/dpda[1:n]
+   h[0]=(4.0*h[1]-h[2])/3.0
+   h[n]=(4.0*h[n-1]-h[n-2])/3.0
+   # Vorticity (h*q-f) / (2*Omega):
+   zeta=h*zb/hb-z
+
+   # Mass of each interval:
+   fac=amp/wi
+   mass=zb[1:np1]-zb[0:n]-fac*np.log(np.cosh(zb[1:np1]*wi)/np.cosh(zb[0:n]*wi))
+
+   # Compute energy components and total:
+   ekin=0.25*Omega**2*sum(mass*(u[0:n]**2+u[1:np1]**2))
+   epot=0.25*cgw**2*sum(mass*(h[0:n]+h[1:np1]-2.0))
+   etot=ekin+epot
+   return dphi,u,h,zeta,mass,(ekin,epot,etot)
+
+def write_profiles(filename,phi,dphi,u,h,zeta):
+   # Latitude displacement, velocity, height and vorticity versus a:
+   n=len(phi)-1
+   a=np.linspace(-np.pi/2.0,np.pi/2.0,n+1)
+   out_file = open(filename,'w')
+   for j in range(n+1):
+      out_file.write("%15.12f %15.12f %15.12f %15.12f %15.12f \n" % \
+                     (a[j], dphi[j], u[j], h[j], zeta[j]))
+   out_file.close()
+
+def write_init(filename,phi,mass):
+   # Initialisation file for pam.f90 to test equilibrium:
+   n=len(phi)-1
+   zb=np.sin(np.linspace(-np.pi/2.0,np.pi/2.0,n+1))
+   out_file = open(filename,'w')
+   for j in range(1,n+1):
+      qm=Omega*(zb[j]**2-zb[j-1]**2)
+      out_file.write("%15.12f %15.12f %15.12f %15.12f \n" % \
+                     (phi[j], mass[j-1], qm, 0.0))
+   out_file.close()
@@ -1,10 +1,14 @@
 #!/usr/bin/python3
 import subprocess as sbpc
+import os
 import sys
 sys.path.append('/user/stuart/scripts/modules')
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
 import numpy as np
 import matplotlib.pyplot as plt
 import argparse
+from pyio.textframes import ingest
+from pyio.catalogue import FrameCatalogue
 
 
 def parse_args():
@@ -32,43 +36,36 @@ def add_nulls(num, cnt=3):
 
 def running(args):
 
-  # Open input file:
-  try:
-     in_file=open(args.input,'r')# try opening passed filename  
-  except IOError, message:# error if file not found 
-     print >> sys.stderr, 'File could not be opened', message
-     sys.exit()
-  
-
 #  Set up grid point numbers
   nx = int(args.ndim[0])
   ny = int(args.ndim[1])
 
-#  Read in data and close input file:
-  raw_data = np.array(np.fromfile(file=in_file,dtype=float,sep='\n'))
-  in_file.close()
+#  Convert the text dump to a binary frame file (only the frames added
+#  since the last run are converted) and read frames from it on demand:
+  try:
+     frames=ingest(args.input,(nx+1,ny+1))
+  except OSError as message:# error if file not found 
+     print('File could not be opened', message, file=sys.stderr)
+     sys.exit()
 
 # Set the number of frames:
-  nframes = int(len(raw_data)/((nx+1)*(ny+1)+1))  
-  print nframes
+  nframes = len(frames)
+  print(nframes)
   if args.frame > nframes:
-    print >> sys.stderr, 'Cannot find that many frames' 
+    print('Cannot find that many frames', file=sys.stderr)
     sys.exit()
 
-# Shape the data array into a useful shape for plotting:
-  frames=range(0,nframes)
-  tim_eles = [i*((nx+1)*(ny+1)+1) for i in frames]
-  shaped_data = np.delete(raw_data,tim_eles)[0:((nx+1)*(ny+1)*nframes)].reshape((nframes,nx+1,ny+1))
   global ic 
   # Grab the correct sub-array for plotting  
   ic = args.frame-1
-  Z=shaped_data[(args.frame-1)]
+  Z=frames[(args.frame-1)]
 
-  print'Frame '+str(args.frame)+' min/max: %8.5f , %8.5f' % (Z.min(),Z.max())
-  print 'Overall data min/max: %8.5f , %8.5f' % (shaped_data.min(),shaped_data.max())
+  print('Frame '+str(args.frame)+' min/max: %8.5f , %8.5f' % (Z.min(),Z.max()))
+  cat=FrameCatalogue(frames)
+  print('Overall data min/max: %8.5f , %8.5f' % (cat.min(),cat.max()))
 
-#  lev_min=shaped_data.min()
-#  lev_max=shaped_data.max()    
+#  lev_min=cat.min()
+#  lev_max=cat.max()    
   lev_min=Z.min()
   lev_max=Z.max()    
 
@@ -110,9 +107,9 @@ def running(args):
         ic+=1
       xlim=axes.get_xlim()
       ylim=axes.get_ylim()
-      lev_min=shaped_data[ic].min()
-      lev_max=shaped_data[ic].max()
-      axes.imshow(shaped_data[ic].transpose(),cmap=plt.cm.jet,vmin=lev_min,vmax=lev_max,origin='lower',interpolation='nearest')
+      lev_min=frames[ic].min()
+      lev_max=frames[ic].max()
+      axes.imshow(frames[ic].transpose(),cmap=plt.cm.jet,vmin=lev_min,vmax=lev_max,origin='lower',interpolation='nearest')
       if args.noticks:
         ax.set_xticklabels([])
         ax.set_yticklabels([])
@@ -128,9 +125,9 @@ def running(args):
         ic-=1
       xlim=axes.get_xlim()
       ylim=axes.get_ylim()
-      lev_min=shaped_data[ic].min()
-      lev_max=shaped_data[ic].max()
-      axes.imshow(shaped_data[ic].transpose(),cmap=plt.cm.jet,vmin=lev_min,vmax=lev_max,origin='lower',interpolation='nearest')
+      lev_min=frames[ic].min()
+      lev_max=frames[ic].max()
+      axes.imshow(frames[ic].transpose(),cmap=plt.cm.jet,vmin=lev_min,vmax=lev_max,origin='lower',interpolation='nearest')
       if args.noticks:
         ax.set_xticklabels([])
         ax.set_yticklabels([])
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import subprocess as sbpc
-import sys
+import sys,os
 sys.path.append('/user/stuart/hydra/scripts/modules')
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
 import numpy as np
 import matplotlib.pyplot as plt
 import argparse
+from pyio.spectra import read_spectra
 
 
 def parse_args():
@@ -23,33 +25,19 @@ def add_nulls(num, cnt=3):
 
 def running(args):
 
-  # Open input file:
+  # Read in the spectra, shaped as (nframes,kmax,3):
   try:
-     in_file=open(args.input,'r')# try opening passed filename  
-  except IOError, message:# error if file not found 
-     print >> sys.stderr, 'File could not be opened', message
+     header,shaped_data=read_spectra(args.input,nhead=5,ncol=3)
+  except IOError as message:# error if file not found 
+     print('File could not be opened', message, file=sys.stderr)
      sys.exit()
 
+#  t0=header[:,0]
+#  sumzpsec=header[:,1]
+  nframes,kmax=shaped_data.shape[0:2]
+  print(nframes)
+  print(kmax)
 
-  
-#  Read in data and close input file:
-  raw_data = np.array(np.fromfile(file=in_file,dtype=float,sep='\n'))
-  in_file.close()
-
-#  t0=raw_data[0]   
-#  sumzpsec=raw_data[1]   
-  kmax=int(raw_data[4])   
-
-# Set the number of frames:
-  nframes = int(len(raw_data)/(3*kmax+5))  
-  print nframes
-  print kmax
-
-# Shape the data array into a useful shape for plotting:
-  frames=range(0,nframes)
-  tim_eles = [i*(3*kmax+5)+j for i in frames for j in range(0,5)]
-#  print tim_eles
-  shaped_data = np.delete(raw_data,tim_eles)[0:(3*kmax+5)*nframes].reshape((nframes,kmax,3))
   global ic 
   # Grab the correct sub-array for plotting  
   ic = 0
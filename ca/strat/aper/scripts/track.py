@@ -1,67 +1,102 @@
 #!/usr/bin/env python3
+import os
+import sys
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
 import numpy as np
 import matplotlib.pyplot as plt
+import argparse
+from pyio.frames import FORMATS, open_frames
+from pyio.textframes import ingest
+from pyio.fronts import track_fronts
 
 
-# Open input file:
-try:
-   in_file=open('bb.dat','r')# try opening passed filename  
-except IOError, message:# error if file not found 
-   print >> sys.stderr, 'File could not be opened', message
-   sys.exit()
-  
+def parse_args():
+  parser = argparse.ArgumentParser(prog='track.py')
+  # Set up the parser to recognise arguments as needed:
+  parser.add_argument('input', metavar='input_filename' , type=str , nargs='?', default='bb.dat', help='Input file: a text dump (e.g. bb.dat) or a binary .r4/.r8 frame file')
+  parser.add_argument('-ndim', metavar='n_dim' , type=int , nargs=2, default='1024 128'.split(), help='Number of x, and y grid points: nx ny')
+  parser.add_argument('-ellx', metavar='ellx' , type=float , default=8.0, help='Domain length in x')
+  parser.add_argument('-level', metavar='level' , type=float , default=-0.5, help='Value whose crossing marks a front')
+  parser.add_argument('-rows', metavar='rows' , type=int , nargs='+', help='y grid points to track fronts along (default: 0 and ny)')
+  parser.add_argument('-out', metavar='out' , type=str , default='fronts.asc', help='Output file of front positions and speeds')
+  parser.add_argument('-noplot', action='store_true' , help='Only write the output file')
+  # Parse the arguments from the program call and return them:
+  args = parser.parse_args()
+  return args
+
+
+def track(args):
 
 #  Set up grid size etc.:
-nx = 1024
-ny = 128
-
-ellx = 8.0
-hlx = ellx/2.0
-delx = ellx/float(nx)
-
-bmid=-0.5
-
-#  Read in data and close input file:
-raw_data = np.array(np.fromfile(file=in_file,dtype=float,sep='\n'))
-in_file.close()
-
-# Set the number of frames:
-nframes = int(len(raw_data)/((nx+1)*(ny+1)+1))  
-
-
-# Shape the data array into a useful shape for plotting:
-frames=range(0,nframes)
-tim_eles = [i*((nx+1)*(ny+1)+1) for i in frames]
-shaped_data = np.delete(raw_data,tim_eles)[0:((nx+1)*(ny+1)*nframes)].reshape((nframes,nx+1,ny+1))
-
-x=[]
-t=[]
-x2=[]
-for frame in frames:
-  t.append(raw_data[tim_eles[frame]])
-  Z=shaped_data[frame]
-  for ix in range(0,nx+1):
-    if Z[ix,0] > bmid:
-      p=(Z[ix-1,0]-bmid)/(Z[ix-1,0]-Z[ix,0])
-      x.append((ix-1+p)*delx-hlx)
-      break    
-  for ix in range(nx,0,-1):
-    if Z[ix,ny] < bmid:
-      p=(Z[ix,ny]-bmid)/(Z[ix,ny]-Z[ix+1,ny])
-      x2.append(hlx-(ix+p)*delx)
-      break    
-
-
-a=np.arange(0,10,0.01)
-b=0.4*a
-b2=0.5*a
-fig = plt.figure(1)
-ax = fig.add_subplot(111)
-ax.plot(t,x,'r+-')
-ax.plot(t,x2,'bx-')
-ax.plot(a,b,'k-')
-ax.plot(a,b2,'b-')
-
-#im = ax.imshow(Z.transpose(),cmap=plt.cm.jet,origin='lower',interpolation='nearest')
-
-plt.show()
+  nx = int(args.ndim[0])
+  ny = int(args.ndim[1])
+
+  hlx = args.ellx/2.0
+  delx = args.ellx/float(nx)
+
+  rows = args.rows
+  if rows is None:
+    rows = [0,ny]
+
+#  Open the frames: binary frame files are read directly, while text
+#  dumps are first converted to a binary frame file (only the frames
+#  added since the last run are converted):
+  suffix = args.input.split('.')[-1]
+  if suffix in FORMATS and not FORMATS[suffix][1]:
+    print('Fronts can only be tracked in time-stamped .r4 or .r8 files', file=sys.stderr)
+    sys.exit()
+  try:
+    if suffix in FORMATS:
+      frames=open_frames(args.input,(nx+1,ny+1))
+    else:
+      frames=ingest(args.input,(nx+1,ny+1))
+  except OSError as message:# error if file not found
+    print('File could not be opened', message, file=sys.stderr)
+    sys.exit()
+
+  nframes = len(frames)
+  print(nframes,'frames')
+
+#  Find the left and right fronts in all frames (NaN where the level is
+#  not crossed), as x positions:
+  t,left,right=track_fronts(frames,rows,args.level)
+  left=left*delx-hlx
+  right=right*delx-hlx
+
+#  Front speeds, by centred differences in time:
+  if nframes > 1:
+    uleft=np.gradient(left,t,axis=0)
+    uright=np.gradient(right,t,axis=0)
+  else:
+    uleft=np.zeros_like(left)
+    uright=np.zeros_like(right)
+
+#  Write t followed by, for each row, the left front position and
+#  speed, then the right front position and speed:
+  cols=[t]
+  for k in range(len(rows)):
+    cols+=[left[:,k],uleft[:,k],right[:,k],uright[:,k]]
+  np.savetxt(args.out,np.column_stack(cols),fmt='%14.9f')
+  print('Front positions and speeds written to',args.out)
+
+  if args.noplot:
+    return
+
+#  Plot the fronts advancing into the domain from each end, i.e. the
+#  first front in the bottom row and (minus) the last in the top row:
+  a=np.arange(0,10,0.01)
+  b=0.4*a
+  b2=0.5*a
+  fig = plt.figure(1)
+  ax = fig.add_subplot(111)
+  ax.plot(t,left[:,0],'r+-')
+  ax.plot(t,-right[:,-1],'bx-')
+  ax.plot(a,b,'k-')
+  ax.plot(a,b2,'b-')
+
+  plt.show()
+
+
+if __name__ == '__main__':
+  args = parse_args()
+  track(args)
@@ -2,32 +2,76 @@ import scipy.fft
 import numpy as np
 
 class FFT:
+    """
+    Spectral transforms and derivatives of fields of shape (nx, ny), or of
+    a stack of such fields along a leading axis (e.g. the frames of a
+    FrameFile), which are all transformed together.
 
-    def __init__(self, ncells, extent):
+    With real=True the fields are taken to be real and only the half of
+    the spectrum with ky >= 0 is kept (rfft2/irfft2), halving the memory
+    and work; the spectral fields then have shape (nx, ny//2+1).  The
+    transforms use workers threads (by default all cores), and scipy.fft
+    keeps the plans for each size between calls.
+    """
+
+    def __init__(self, ncells, extent, real=False, workers=-1):
         self.nx = ncells[0]
         self.ny = ncells[1]
 
         self.Lx = extent[0]
         self.Ly = extent[1]
 
+        self.real = real
+        self.workers = workers
+
         self.kx = scipy.fft.fftfreq(self.nx , 1.0 / float(self.nx))
-        self.ky = scipy.fft.fftfreq(self.ny , 1.0 / float(self.ny))
+        if real:
+            self.ky = scipy.fft.rfftfreq(self.ny , 1.0 / float(self.ny))
+        else:
+            self.ky = scipy.fft.fftfreq(self.ny , 1.0 / float(self.ny))
 
-        # wave numbers
-        rkx_ = (2.0 * np.pi * self.kx) / self.Lx
-        rky_ = (2.0 * np.pi * self.ky) / self.Ly
+        # wave numbers, shaped to broadcast against (..., nx, ny) arrays
+        self.rkx = ((2.0 * np.pi * self.kx) / self.Lx)[:, None]
+        self.rky = ((2.0 * np.pi * self.ky) / self.Ly)[None, :]
 
-        self.rkx , self.rky = np.meshgrid(rkx_, rky_, indexing='ij')
+        # With the half spectrum, the x Nyquist mode has no derivative that
+        # it can hold (its conjugate partner is implicit), so it is dropped
+        # there, as taking the real part does for the full spectrum:
+        self._ikx = 1j * self.rkx
+        if real and self.nx % 2 == 0:
+            self._ikx[self.nx // 2] = 0.0
+        self._iky = 1j * self.rky
 
 
     def fftxyp2s(self, fp):
-        return scipy.fft.fft2(x=fp, axes=(0, 1), overwrite_x=False, norm='ortho')
+        if self.real:
+            return scipy.fft.rfft2(x=fp, axes=(-2, -1), overwrite_x=False,
+                                   norm='ortho', workers=self.workers)
+        return scipy.fft.fft2(x=fp, axes=(-2, -1), overwrite_x=False,
+                              norm='ortho', workers=self.workers)
+
+    def fftxys2p(self, fs, overwrite_x=False):
+        if self.real:
+            return scipy.fft.irfft2(x=fs, s=(self.nx, self.ny), axes=(-2, -1),
+                                    overwrite_x=overwrite_x, norm='ortho',
+                                    workers=self.workers)
+        return scipy.fft.ifft2(x=fs, axes=(-2, -1), overwrite_x=overwrite_x,
+                               norm='ortho', workers=self.workers).real
 
-    def fftxys2p(self, fs):
-        return scipy.fft.ifft2(x=fs, axes=(0, 1), overwrite_x=False, norm='ortho').real
+    def diffx(self, fs, out=None):
+        return np.multiply(self._ikx, fs, out=out)
 
-    def diffx(self, fs):
-        return 1j * self.rkx * fs
+    def diffy(self, fs, out=None):
+        return np.multiply(self._iky, fs, out=out)
 
-    def diffy(self, fs):
-        return 1j * self.rky * fs
+    def gradient(self, fp):
+        """
+        Returns the x and y derivatives of fp, a field or a stack of
+        fields, in physical space.  The spectral work array is reused for
+        both derivatives.
+        """
+        fs = self.fftxyp2s(fp)
+        work = np.empty_like(fs)
+        dx = self.fftxys2p(self.diffx(fs, out=work))
+        dy = self.fftxys2p(self.diffy(fs, out=work))
+        return dx, dy
@@ -2,8 +2,23 @@ import scipy.fft
 import numpy as np
 
 class FFT:
+    """
+    Spectral transforms and derivatives of fields of shape (nx, ny, nz+1),
+    or of a stack of such fields along a leading axis, as for fft2d.FFT.
+    With real=True the spectral fields have shape (nx, ny//2+1, nz+1).
+    A frame of a 3d/*.r4 file, opened with shape (nz+1, ny, nx), is
+    brought to this shape by its transpose.
 
-    def __init__(self, ncells, extent):
+    The fields are periodic in x and y, and in z are expanded in cosine
+    series (kind='cos', e.g. buoyancy or the vertical vorticity) or sine
+    series (kind='sin', e.g. the vertical velocity, which vanishes at
+    z = 0 and Lz) over the nz+1 levels, as by dct and dst in
+    lib/stafft/stafft.f90.  Coefficient m (from 0 to nz) of either series
+    has vertical wave number rkz = m*pi/Lz; the sine coefficients for
+    m = 0 and nz are zero.
+    """
+
+    def __init__(self, ncells, extent, real=False, workers=-1):
         self.nx = ncells[0]
         self.ny = ncells[1]
         self.nz = ncells[2]
@@ -12,26 +27,129 @@ class FFT:
         self.Ly = extent[1]
         self.Lz = extent[2]
 
+        self.real = real
+        self.workers = workers
+
         self.kx = scipy.fft.fftfreq(self.nx , 1.0 / float(self.nx))
-        self.ky = scipy.fft.fftfreq(self.ny , 1.0 / float(self.ny))
-        self.kz = scipy.fft.fftfreq(self.nz+1 , 1.0 / float(self.nz+1))
+        if real:
+            self.ky = scipy.fft.rfftfreq(self.ny , 1.0 / float(self.ny))
+        else:
+            self.ky = scipy.fft.fftfreq(self.ny , 1.0 / float(self.ny))
+        self.kz = np.arange(self.nz+1, dtype=np.float64)
+
+        # wave numbers, shaped to broadcast against (..., nx, ny, nz+1) arrays
+        self.rkx = ((2.0 * np.pi * self.kx) / self.Lx)[:, None, None]
+        self.rky = ((2.0 * np.pi * self.ky) / self.Ly)[None, :, None]
+        self.rkz = ((np.pi * self.kz) / self.Lz)[None, None, :]
 
-        # wave numbers
-        rkx_ = (2.0 * np.pi * self.kx) / self.Lx
-        rky_ = (2.0 * np.pi * self.ky) / self.Ly
-        rkz_ = (2.0 * np.pi * self.kz) / self.Lz
+        # With the half spectrum, the x Nyquist mode has no derivative that
+        # it can hold (its conjugate partner is implicit), so it is dropped
+        # there, as taking the real part does for the full spectrum:
+        self._ikx = 1j * self.rkx
+        if real and self.nx % 2 == 0:
+            self._ikx[self.nx // 2] = 0.0
+        self._iky = 1j * self.rky
 
-        self.rkx , self.rky , self.rkz = np.meshgrid(rkx_, rky_, rkz_, indexing='ij')
+        # Horizontal and total squared wave numbers, for laplinv:
+        self._khsq = self.rkx**2 + self.rky**2
+        self._rkzsq = self.rkz**2
+
+        # stafft's dct and dst are type I transforms scaled to be their own
+        # inverses:
+        self._zfac = 1.0 / np.sqrt(2.0 * self.nz)
 
 
     def fftxyp2s(self, fp):
-        return scipy.fft.fft2(x=fp, axes=(0, 1), overwrite_x=False, norm='ortho')
+        if self.real:
+            return scipy.fft.rfft2(x=fp, axes=(-3, -2), overwrite_x=False,
+                                   norm='ortho', workers=self.workers)
+        return scipy.fft.fft2(x=fp, axes=(-3, -2), overwrite_x=False,
+                              norm='ortho', workers=self.workers)
+
+    def fftxys2p(self, fs, overwrite_x=False):
+        if self.real:
+            return scipy.fft.irfft2(x=fs, s=(self.nx, self.ny), axes=(-3, -2),
+                                    overwrite_x=overwrite_x, norm='ortho',
+                                    workers=self.workers)
+        return scipy.fft.ifft2(x=fs, axes=(-3, -2), overwrite_x=overwrite_x,
+                               norm='ortho', workers=self.workers).real
+
+    def diffx(self, fs, out=None):
+        return np.multiply(self._ikx, fs, out=out)
+
+    def diffy(self, fs, out=None):
+        return np.multiply(self._iky, fs, out=out)
+
+    def gradient(self, fp):
+        """
+        Returns the x and y derivatives of fp, a field or a stack of
+        fields, in physical space.
+        """
+        fs = self.fftxyp2s(fp)
+        work = np.empty_like(fs)
+        dx = self.fftxys2p(self.diffx(fs, out=work))
+        dy = self.fftxys2p(self.diffy(fs, out=work))
+        return dx, dy
+
+    def fftzp2s(self, fp, kind='cos'):
+        """
+        Returns the coefficients of the vertical cosine or sine series of
+        fp (as selected by kind), transformed along its last axis.  The
+        transform is its own inverse, so fftzs2p is the same operation.
+        """
+        if kind == 'cos':
+            fs = scipy.fft.dct(fp, type=1, axis=-1, workers=self.workers)
+        elif kind == 'sin':
+            interior = scipy.fft.dst(np.asarray(fp)[..., 1:-1], type=1,
+                                     axis=-1, workers=self.workers)
+            fs = np.zeros(interior.shape[:-1] + (self.nz+1,), interior.dtype)
+            fs[..., 1:-1] = interior
+        else:
+            raise ValueError("kind must be 'cos' or 'sin', not %r" % kind)
+        fs *= self._zfac
+        return fs
+
+    fftzs2p = fftzp2s
+
+    def fftp2s(self, fp, kind='cos'):
+        """
+        Transforms fp from physical space to the horizontal Fourier and
+        vertical cosine or sine coefficients.
+        """
+        return self.fftxyp2s(self.fftzp2s(fp, kind))
 
-    def fftxys2p(self, fs):
-        return scipy.fft.ifft2(x=fs, axes=(0, 1), overwrite_x=False, norm='ortho').real
+    def ffts2p(self, fs, kind='cos'):
+        """
+        Transforms fs from spectral space (as returned by fftp2s) back to
+        physical space.
+        """
+        return self.fftzs2p(self.fftxys2p(fs), kind)
 
-    def diffx(self, fs):
-        return 1j * self.rkx * fs
+    def diffz(self, fs, kind='cos', out=None):
+        """
+        Returns the vertical derivative of fs, given as vertical cosine or
+        sine coefficients (as selected by kind), which is a sine or cosine
+        series respectively.  fs may be in physical or spectral space in x
+        and y.
+        """
+        if kind == 'cos':
+            out = np.multiply(-self.rkz, fs, out=out)
+        elif kind == 'sin':
+            out = np.multiply(self.rkz, fs, out=out)
+        else:
+            raise ValueError("kind must be 'cos' or 'sin', not %r" % kind)
+        # The highest mode is a sine series only at the levels, where it
+        # vanishes:
+        out[..., -1] = 0.0
+        return out
 
-    def diffy(self, fs):
-        return 1j * self.rky * fs
+    def laplinv(self, fs, out=None):
+        """
+        Returns the inverse Laplacian of the fully spectral field fs (as
+        returned by fftp2s, of either kind), with the mean mode set to
+        zero.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = np.divide(fs, -(self._khsq + self._rkzsq), out=out)
+        out[..., 0, 0, 0] = 0.0
+        return out
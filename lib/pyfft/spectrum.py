@@ -0,0 +1,184 @@
+import scipy.fft
+import numpy as np
+
+# Shell index, weight and full-plane count of every wave number of the
+# half spectrum returned by rfft2, for each grid and extent used so far:
+_shells = {}
+
+def _half_plane(ncells, extent):
+    # Wave numbers of the half spectrum, and the number of times each
+    # mode stands for itself and its conjugate in the full plane, times
+    # the extra weight stafft's Hermitian storage gives Nyquist modes:
+    nx, ny = ncells
+    rkx = 2.0 * np.pi * scipy.fft.fftfreq(nx, 1.0 / float(nx)) / extent[0]
+    rky = 2.0 * np.pi * scipy.fft.rfftfreq(ny, 1.0 / float(ny)) / extent[1]
+    mult = np.full(len(rky), 2.0)
+    mult[0] = 1.0
+    if ny % 2 == 0:
+        mult[-1] = 1.0
+    wx = np.ones(nx)
+    wy = np.ones(len(rky))
+    if nx % 2 == 0:
+        wx[nx // 2] = 2.0
+    if ny % 2 == 0:
+        wy[-1] = 2.0
+    return rkx, rky, mult, wx[:, None] * wy[None, :] * mult[None, :]
+
+def shells(ncells, extent):
+    """
+    Returns the isotropic shell width dk (the smaller of 2*pi/Lx and
+    2*pi/Ly), the shell index nint(|k|/dk) of every mode of the half
+    spectrum of an (nx, ny) grid, the weight of each mode, and the number
+    of modes of the full plane in each shell.  These are found once for
+    each grid and extent and kept for later calls.
+    """
+    key = (tuple(int(n) for n in ncells), tuple(float(L) for L in extent))
+    if key not in _shells:
+        rkx, rky, mult, weight = _half_plane(*key)
+        dk = 2.0 * np.pi / max(key[1])
+        index = np.rint(np.hypot(rkx[:, None], rky[None, :]) / dk)
+        index = index.astype(np.intp)
+        count = np.bincount(index.ravel(),
+                            weights=np.broadcast_to(mult, index.shape).ravel())
+        _shells[key] = (dk, index, weight, count)
+    return _shells[key]
+
+class Spectrum:
+    """
+    Isotropic (shell-averaged) and anisotropic (kx, ky) power spectra of
+    fields periodic in x and y on a grid of ncells = (nx, ny) points over
+    extent = (Lx, Ly), normalised as by spec1d in the ps codes (e.g. in
+    ps/3d/swnh/nhswps/spectral.f90), so that the spectra agree with those
+    in spectra.asc for the same fields.
+
+    The fields are real and may have any number of leading axes, e.g.
+    frames or levels, which all give a spectrum; axes gives the x and y
+    axes (for instance (-1, -2) for the frames of a .r4 file opened with
+    shape (ny, nx), or (-3, -2) for fields in the layout of fft3d.FFT).
+    The leading axis is processed chunk at a time, so that the frames of
+    a memory-mapped FrameFile are read a block at a time.
+    """
+
+    def __init__(self, ncells, extent, workers=-1):
+        self.nx = ncells[0]
+        self.ny = ncells[1]
+
+        self.Lx = extent[0]
+        self.Ly = extent[1]
+
+        self.workers = workers
+
+        self.dk, self.index, self.weight, self.count = shells(ncells, extent)
+        self.nshell = len(self.count)
+
+        # Only shells which are fully occupied are returned:
+        dkx = 2.0 * np.pi / self.Lx
+        dky = 2.0 * np.pi / self.Ly
+        self.kmax = int(min((self.nx // 2) * dkx, (self.ny // 2) * dky)
+                        / self.dk + 1.0e-8)
+        self.k = self.dk * np.arange(1, self.kmax+1)
+
+        # Spectrum multiplication factor for unevenly sampled shells:
+        shell = np.arange(self.nshell)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.spmf = np.where(self.count > 0, np.pi * shell / self.count,
+                                 0.0) / float(self.nx * self.ny)
+
+        # Index of |kx| of each mode, for anisotropic (ky is >= 0 in the
+        # half spectrum, and indexes itself):
+        rkx = _half_plane(ncells, extent)[0]
+        self.kxindex = np.rint(abs(rkx) / dkx).astype(np.intp)
+        self.kx = dkx * np.arange(1, self.nx // 2 + 1)
+        self.ky = dky * np.arange(1, self.ny // 2 + 1)
+
+    def _power(self, fp, axes, chunk):
+        # Yields the weighted power of the modes of the half spectrum, of
+        # shape (nfields, nx, ny//2+1), for each chunk of the leading axis
+        # of fp with its x and y axes moved last:
+        fp = np.moveaxis(fp, axes, (-2, -1))
+        if fp.ndim == 2:
+            fp = fp[None]
+        if chunk is None:
+            chunk = max(1, 2**24 // (self.nx * self.ny *
+                                     int(np.prod(fp.shape[1:-2]))))
+        for start in range(0, len(fp), chunk):
+            block = np.asarray(fp[start:start+chunk], dtype=np.float64)
+            fs = scipy.fft.rfft2(block.reshape((-1,) + block.shape[-2:]),
+                                 axes=(-2, -1), norm='ortho',
+                                 workers=self.workers)
+            power = fs.real**2 + fs.imag**2
+            power *= self.weight
+            yield power, block.shape[:-2]
+
+    def _shape(self, fp, axes):
+        # Shape of the leading axes of fp, those of the spectra:
+        shape = list(np.shape(fp))
+        for axis in sorted((a % len(shape) for a in axes), reverse=True):
+            del shape[axis]
+        return tuple(shape)
+
+    def isotropic(self, fp, axes=(-2, -1), chunk=None):
+        """
+        Returns the wave numbers k (of shells 1 to kmax) and the
+        isotropic spectra of fp, of shape (leading axes of fp, kmax).
+        """
+        nshell = self.nshell
+        spectra = []
+        for power, shape in self._power(fp, axes, chunk):
+            n = len(power)
+            # All of the fields of the chunk are binned together by giving
+            # each field its own range of nshell bins:
+            bins = self.index.ravel()[None, :] + \
+                   nshell * np.arange(n)[:, None]
+            spec = np.bincount(bins.ravel(), weights=power.ravel(),
+                               minlength=n*nshell).reshape(n, nshell)
+            spectra.append((self.spmf * spec).reshape(shape + (nshell,)))
+        spec = np.concatenate(spectra)
+        return self.k, spec.reshape(self._shape(fp, axes) + (nshell,)) \
+                           [..., 1:self.kmax+1]
+
+    def anisotropic(self, fp, axes=(-2, -1), chunk=None):
+        """
+        Returns the wave numbers kx and the spectrum of fp in kx (summed
+        over ky), then the same for ky, each spectrum having the shape of
+        the leading axes of fp followed by the number of wave numbers.
+        Both are normalised like the isotropic spectrum, i.e. summed over
+        all wave numbers they give about the same total.
+        """
+        norm = 0.5 / float(self.nx * self.ny)
+        nkx = self.nx // 2 + 1
+        nky = self.ny // 2 + 1
+        xspectra = []
+        yspectra = []
+        for power, shape in self._power(fp, axes, chunk):
+            n = len(power)
+            xpower = power.sum(axis=-1)
+            ypower = power.sum(axis=-2)
+            bins = self.kxindex[None, :] + nkx * np.arange(n)[:, None]
+            xspec = np.bincount(bins.ravel(), weights=xpower.ravel(),
+                                minlength=n*nkx).reshape(n, nkx)
+            xspectra.append((norm * xspec).reshape(shape + (nkx,)))
+            yspectra.append((norm * ypower).reshape(shape + (nky,)))
+        shape = self._shape(fp, axes)
+        xspec = np.concatenate(xspectra).reshape(shape + (nkx,))
+        yspec = np.concatenate(yspectra).reshape(shape + (nky,))
+        return (self.kx, xspec[..., 1:len(self.kx)+1],
+                self.ky, yspec[..., 1:len(self.ky)+1])
+
+def write_spectra(filename, times, k, spectra, mode='w'):
+    """
+    Writes spectra in the layout of spectra.asc, as read by
+    pyio.spectra.read_spectra and the compare_spectra scripts: for each
+    time, a line holding the time and the number of wave numbers, then a
+    line for each wave number holding log10(k) followed by log10 of each
+    of the spectra.  spectra is a list of arrays of shape (len(times),
+    len(k)), e.g. for zeta, delta and gamma.
+    """
+    spectra = np.stack([np.reshape(s, (len(times), len(k))) for s in spectra],
+                       axis=-1)
+    alk = np.log10(k)
+    with open(filename, mode) as out_file:
+        for t, spec in zip(times, spectra):
+            out_file.write('%13.6f %5d\n' % (t, len(k)))
+            table = np.column_stack((alk, np.log10(spec + 1.e-32)))
+            np.savetxt(out_file, table, fmt=' %12.8f', delimiter='')
@@ -0,0 +1,303 @@
+import os
+import json
+import struct
+import zlib
+import numpy as np
+
+from pyio.frames import FrameFile
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+# Archive suffixes, appended to the name of the original frame file (e.g.
+# evolution/qq.r4 is archived as evolution/qq.r4.fz or qq.r4.h5):
+SUFFIX = '.fz'
+H5SUFFIX = '.h5'
+
+# The .fz container holds the compressed frames one after the other,
+# followed by a JSON index and finally the length of the index as an
+# 8-byte little-endian integer:
+TRAILER = struct.Struct('<Q')
+
+def archive_name(filename):
+    """
+    Returns the name of the archive of filename, or None if there is none.
+    """
+    for suffix in (SUFFIX, H5SUFFIX):
+        if os.path.exists(filename + suffix):
+            return filename + suffix
+    return None
+
+def _shuffle(values):
+    # Group the bytes of each significance together, which makes the
+    # frames of floating point values far more compressible:
+    return values.view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+def _unshuffle(buf, dtype):
+    dtype = np.dtype(dtype)
+    raw = np.frombuffer(buf, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(raw.T).view(dtype).reshape(-1)
+
+# Numbers of bits available for lossy (quantized) storage:
+BITS = (8, 12, 16)
+
+def _pack12(q):
+    # Packs pairs of 12-bit integers into 3 bytes:
+    q = np.append(q, np.zeros(len(q) % 2, dtype=q.dtype))
+    a, b = q[0::2], q[1::2]
+    return np.stack([a & 0xff, (a >> 8) | ((b & 0xf) << 4), b >> 4],
+                    axis=1).astype(np.uint8)
+
+def _unpack12(raw, n):
+    raw = raw.reshape(-1, 3).astype(np.uint16)
+    q = np.empty(2*len(raw), dtype=np.uint16)
+    q[0::2] = raw[:, 0] | ((raw[:, 1] & 0xf) << 8)
+    q[1::2] = (raw[:, 1] >> 4) | (raw[:, 2] << 4)
+    return q[:n]
+
+def quantize(values, tol=None, rel=False, bits=None):
+    """
+    Quantizes one frame of values to 8, 12 or 16-bit integers, i.e.
+    values = fmin + q*step with q in [0, 2**bits-1].  The fewest bits for
+    which the error is at most tol (relative to the range of values in
+    the frame if rel is set) are used, unless bits is given.  Returns the
+    integers, bits, fmin and step; bits is 0 if not even 16 bits meet the
+    error bound, and the frame should then be stored exactly.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    fmin, fmax = values.min(), values.max()
+    if rel and tol is not None:
+        tol = tol * (fmax - fmin)
+    if bits is None:
+        for bits in BITS:
+            if (fmax - fmin) / (2**bits - 1) <= 2*tol:
+                break
+        else:
+            return None, 0, fmin, 0.0
+    step = (fmax - fmin) / (2**bits - 1) or 1.0
+    q = np.rint((values - fmin) / step).astype(np.uint16)
+    return q, bits, fmin, step
+
+def encode_frame(values, index):
+    """
+    Compresses one frame of stored values according to the codec
+    recorded in the archive index.  Returns the compressed frame and any
+    parameters (bits, fmin and step for quantized frames) needed to
+    decode it, which are kept with its chunk in the index.
+    """
+    if index['codec'] == 'quant':
+        q, bits, fmin, step = quantize(values, index['tol'], index['rel'],
+                                       index['bits'])
+        if bits == 8:
+            buf = q.astype(np.uint8).tobytes()
+        elif bits == 12:
+            buf = _pack12(q).tobytes()
+        elif bits == 16:
+            buf = _shuffle(q)
+        else:
+            buf = _shuffle(np.ascontiguousarray(values))
+        return zlib.compress(buf, index['level']), [bits, fmin, step]
+    return zlib.compress(_shuffle(np.ascontiguousarray(values)),
+                         index['level']), []
+
+def decode_frame(buf, index, chunk):
+    """
+    Inverse of encode_frame: returns the stored values of one frame (for
+    quantized frames, approximate values in the stored precision), given
+    its entry [start, length, parameters...] in the index.
+    """
+    buf = zlib.decompress(buf)
+    dtype = np.dtype(index['dtype'])
+    if index['codec'] == 'quant' and chunk[2] > 0:
+        bits, fmin, step = chunk[2:5]
+        if bits == 8:
+            q = np.frombuffer(buf, dtype=np.uint8)
+        elif bits == 12:
+            q = _unpack12(np.frombuffer(buf, dtype=np.uint8), index['N'])
+        else:
+            q = _unshuffle(buf, np.uint16)
+        return (fmin + step * q).astype(dtype)
+    return _unshuffle(buf, dtype)
+
+def pack(filename, ncells, dtype=None, time=True, level=6, hdf5=False,
+         tol=None, rel=False, bits=None, verify=True):
+    """
+    Packs the frame file filename into a compressed archive in which
+    each frame is compressed separately, so that frames can be read back
+    (and decoded in parallel) in any order.  The archive is an .h5 file
+    if hdf5 is set (h5py is then needed), otherwise an .fz file.  The
+    original file is left in place.
+
+    If an error bound tol (absolute, or relative to the range of each
+    frame if rel is set) or a number of bits (8, 12 or 16) is given, the
+    frames are quantized (see quantize) and so stored only approximately.
+    This is only available for .fz archives.
+
+    Returns the archive name, the sizes of the original and archive, and
+    the maximum error of the archived values, found by decoding them.
+    """
+    frames = FrameFile(filename, ncells, dtype, time)
+    nframes = len(frames)
+    if os.path.getsize(filename) != nframes * frames.recbytes:
+        raise ValueError(filename + ' does not hold a whole number of frames'
+                         ' of this size')
+    stored = frames._map
+    lossy = tol is not None or bits is not None
+    if bits is not None and bits not in BITS:
+        raise ValueError('Frames can only be quantized to 8, 12 or 16 bits')
+
+    if hdf5:
+        if h5py is None:
+            raise ImportError('h5py is needed to write ' + H5SUFFIX + ' archives')
+        if lossy:
+            raise ValueError('Quantized frames can only be stored in '
+                             + SUFFIX + ' archives')
+        archive = filename + H5SUFFIX
+        with h5py.File(archive, 'w') as out_file:
+            # Written a frame at a time, so the file is never read whole:
+            dataset = out_file.create_dataset('frames', shape=(nframes, frames.N),
+                                              dtype=frames.dtype,
+                                              chunks=(1, frames.N), shuffle=True,
+                                              compression='gzip',
+                                              compression_opts=level)
+            for i in range(nframes):
+                dataset[i] = stored[i, frames.itime:]
+            if frames.itime:
+                out_file.create_dataset('times', data=frames.times)
+            out_file.attrs['N'] = frames.N
+    else:
+        archive = filename + SUFFIX
+        index = {'dtype': frames.dtype.str, 'N': frames.N,
+                 'time': bool(frames.itime), 'codec': 'zlib',
+                 'level': level, 'chunks': []}
+        if lossy:
+            index.update(codec='quant', tol=tol, rel=rel, bits=bits)
+        if frames.itime:
+            index['times'] = frames.times.tolist()
+        with open(archive, 'wb') as out_file:
+            start = 0
+            for i in range(nframes):
+                buf, params = encode_frame(stored[i, frames.itime:], index)
+                out_file.write(buf)
+                index['chunks'].append([start, len(buf)] + params)
+                start += len(buf)
+            header = json.dumps(index).encode()
+            out_file.write(header)
+            out_file.write(TRAILER.pack(len(header)))
+
+    maxerr = 0.0
+    if verify:
+        packed = ArchivedFrameFile(filename, ncells, dtype, time)
+        for i in range(nframes):
+            original = stored[i, frames.itime:]
+            err = np.abs(packed._stored(i).astype(np.float64) - original).max()
+            if lossy and tol is not None:
+                # Allow for rounding to the stored precision:
+                bound = tol
+                if rel:
+                    bound = tol * (original.max() - original.min())
+                bound += 2 * np.finfo(frames.dtype).eps * np.abs(original).max()
+            else:
+                bound = 0.0 if not lossy else np.inf
+            if err > bound:
+                raise ValueError('Frame %d of %s differs from the original'
+                                 ' by %g' % (i, archive, err))
+            maxerr = max(maxerr, float(err))
+        packed.close()
+
+    return archive, os.path.getsize(filename), os.path.getsize(archive), maxerr
+
+class ArchivedFrameFile(FrameFile):
+    """
+    Reader for archives written by pack, with the same interface as
+    FrameFile.  Scripts need not use this class directly: FrameFile
+    returns an ArchivedFrameFile when the frame file itself has been
+    replaced by its archive.  Each frame is decompressed when accessed.
+    """
+
+    def __init__(self, filename, ncells, dtype=None, time=True, offset=0):
+        self.archive = archive_name(filename)
+        if self.archive is None:
+            raise IOError('No archive found for ' + filename)
+        self._file = None
+        FrameFile.__init__(self, filename, ncells, dtype, time, offset)
+
+    def refresh(self):
+        self.close()
+        if self.archive.endswith(H5SUFFIX):
+            self._file = h5py.File(self.archive, 'r')
+            self._frames = self._file['frames']
+            N = self._file.attrs['N']
+            self.nframes = self._frames.shape[0]
+            stored_times = self._file['times'][:] if 'times' in self._file else None
+            stored_dtype = self._frames.dtype
+        else:
+            self._file = open(self.archive, 'rb')
+            self._file.seek(-TRAILER.size, os.SEEK_END)
+            nbytes, = TRAILER.unpack(self._file.read(TRAILER.size))
+            self._file.seek(-TRAILER.size - nbytes, os.SEEK_END)
+            self._index = json.loads(self._file.read(nbytes).decode())
+            N = self._index['N']
+            self.nframes = len(self._index['chunks'])
+            stored_times = self._index.get('times')
+            stored_dtype = np.dtype(self._index['dtype'])
+
+        if N != self.N or stored_dtype != self.dtype:
+            raise ValueError('%s holds frames of %d %s values, not %d %s'
+                             % (self.archive, N, stored_dtype, self.N, self.dtype))
+        if self.itime and stored_times is None:
+            raise ValueError(self.archive + ' has no time stamps')
+        self._times = None
+        if self.itime:
+            self._times = np.array(stored_times, dtype=np.float64)
+        return self.nframes
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _stored(self, frame):
+        # Values of one frame as stored in the original file:
+        if self.archive.endswith(H5SUFFIX):
+            return self._frames[frame]
+        chunk = self._index['chunks'][frame]
+        start, length = chunk[0:2]
+        if hasattr(os, 'pread'):
+            # Positional reads let several threads decode frames at once:
+            buf = os.pread(self._file.fileno(), length, start)
+        else:
+            self._file.seek(start)
+            buf = self._file.read(length)
+        return decode_frame(buf, self._index, chunk)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self.frame(key)
+        return np.array([self.frame(i) for i in range(self.nframes)[key]])
+
+    @property
+    def data(self):
+        return np.array([self._stored(i) for i in range(self.nframes)]
+                        ).reshape((self.nframes,) + self.shape)
+
+    @property
+    def times(self):
+        return self._times
+
+    @property
+    def raw(self):
+        records = np.empty((self.nframes, self.reclen), dtype=self.dtype)
+        for i in range(self.nframes):
+            if self.itime:
+                records[i, 0] = self._times[i]
+            records[i, self.itime:] = self._stored(i)
+        return self._decode(records.reshape(-1))
+
+    def frame(self, frame):
+        return self._decode(self._stored(frame).reshape(self.shape))
+
+    def time(self, frame):
+        return float(self._times[frame])
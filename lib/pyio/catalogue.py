@@ -0,0 +1,147 @@
+import os
+import zlib
+import numpy as np
+
+# Per-frame quantities held in the catalogue:
+FIELDS = ('times', 'offsets', 'fmin', 'fmax', 'mean', 'rms')
+
+class FrameCatalogue:
+    """
+    Summary of every frame in a binary frame file (see frames.FrameFile):
+    its time, byte offset within the file, and the min, max, mean and rms
+    of the field.  The file is scanned once and the catalogue is kept in a
+    sidecar file (.<name>.cat.npz next to the frame file).  Frames which
+    have been appended since, e.g. by a job which is still running, are
+    added by scanning only the new frames.  A checksum of the first and
+    last frames catalogued is kept too, so that a file which has been
+    rewritten (e.g. by a restarted job) is scanned again even if its
+    times are unchanged.
+
+    A partially written frame at the end of the file is not catalogued;
+    its size in bytes is given by the truncated attribute.
+    """
+
+    def __init__(self, frames, cache=True):
+        self.frames = frames
+        self.cache = cache
+        direc, name = os.path.split(frames.filename)
+        self.filename = os.path.join(direc, '.' + name + '.cat.npz')
+        # Identifies the record layout the catalogue was built for:
+        self._key = np.array([frames.recbytes, frames.itime, frames.N])
+
+        for field in FIELDS:
+            setattr(self, field, np.empty(0))
+        self.check = self._checksum(0)
+        if cache and os.path.exists(self.filename):
+            self._load()
+        self.update()
+
+    def _load(self):
+        try:
+            with np.load(self.filename) as cached:
+                if np.array_equal(cached['key'], self._key):
+                    for field in FIELDS:
+                        setattr(self, field, cached[field])
+                    self.check = cached['check']
+        except (OSError, KeyError, ValueError):
+            pass
+
+    def _save(self):
+        try:
+            with open(self.filename, 'wb') as out_file:
+                np.savez(out_file, key=self._key, check=self.check,
+                         **{field: getattr(self, field) for field in FIELDS})
+        except OSError:
+            # Read-only run directory; just go without a cache:
+            pass
+
+    def _checksum(self, n):
+        # Checksums of the values of the first and last of n frames:
+        if n == 0:
+            return np.zeros(2, dtype=np.int64)
+        return np.array([zlib.crc32(np.ascontiguousarray(
+                             self.frames.frame(i)).tobytes())
+                         for i in (0, n-1)], dtype=np.int64)
+
+    def update(self):
+        """
+        Catalogues any frames added to the file since the last update,
+        and returns the number of frames.  If the file has been
+        overwritten or truncated (e.g. by a restarted job) the whole file
+        is scanned again.
+        """
+        frames = self.frames
+        nframes = frames.refresh()
+        if os.path.exists(frames.filename):
+            size = os.path.getsize(frames.filename)
+            self.truncated = size - nframes * frames.recbytes
+        else:
+            # Archived file (see archive.py), which holds complete frames:
+            self.truncated = 0
+
+        nold = len(self.times)
+        if nold > nframes or (nold > 0 and frames.itime and
+                              frames.time(nold-1) != self.times[-1]):
+            nold = 0
+        if nold > 0 and not np.array_equal(self._checksum(nold), self.check):
+            nold = 0
+        if nold == nframes and nold == len(self.times):
+            return nframes
+
+        new = range(nold, nframes)
+        stats = np.empty((len(new), 4))
+        for j, i in enumerate(new):
+            f = np.asarray(frames.frame(i), dtype=np.float64)
+            stats[j] = (f.min(), f.max(), f.mean(), np.sqrt(np.mean(f**2)))
+        if frames.itime:
+            times = np.array([frames.time(i) for i in new])
+        else:
+            times = np.full(len(new), np.nan)
+        offsets = np.arange(nold, nframes, dtype=np.int64) * frames.recbytes
+
+        self.times = np.append(self.times[:nold], times)
+        self.offsets = np.append(self.offsets[:nold], offsets).astype(np.int64)
+        self.fmin = np.append(self.fmin[:nold], stats[:, 0])
+        self.fmax = np.append(self.fmax[:nold], stats[:, 1])
+        self.mean = np.append(self.mean[:nold], stats[:, 2])
+        self.rms = np.append(self.rms[:nold], stats[:, 3])
+        self.check = self._checksum(nframes)
+
+        if self.cache:
+            self._save()
+        return nframes
+
+    def __len__(self):
+        return len(self.times)
+
+    def index(self, t):
+        """
+        Returns the index of the frame whose time is closest to t.
+        """
+        if not self.frames.itime:
+            raise ValueError(self.frames.filename + ' has no time stamps')
+        n = len(self.times)
+        if n == 0:
+            raise IndexError(self.frames.filename + ' contains no frames')
+        i = int(np.searchsorted(self.times, t))
+        if i == n or (i > 0 and t - self.times[i-1] <= self.times[i] - t):
+            i -= 1
+        return i
+
+    # Global extrema over all frames:
+    def min(self):
+        return self.fmin.min()
+
+    def max(self):
+        return self.fmax.max()
+
+    def limits(self, symmetric=False):
+        """
+        Returns the global colour limits (min, max) or, if symmetric,
+        +/- the maximum absolute value over all frames.
+        """
+        fmin, fmax = self.min(), self.max()
+        if symmetric:
+            fmax = max(abs(fmin), abs(fmax))
+            fmin = -fmax
+        return fmin, fmax
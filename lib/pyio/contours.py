@@ -0,0 +1,211 @@
+import os
+from itertools import islice
+import numpy as np
+
+# Per-frame quantities held in the index of a contour dump:
+FIELDS = ('offsets', 'times', 'nc', 'npt')
+
+def _read_frame(in_file):
+    # Reads the frame starting at the current position of in_file (opened
+    # in binary mode), returning the time, the values on the line of each
+    # contour (as an array of shape (nc, number of values)) and the x and
+    # y coordinates of all nodes:
+    record = in_file.readline().split()
+    nc = int(record[0])
+    npt = int(record[1])
+    t = float(record[2])
+    heads = np.fromstring(b''.join(islice(in_file, nc)), dtype=np.float64,
+                          sep=' ')
+    heads = heads.reshape(nc, -1) if nc > 0 else np.empty((0, 4))
+    nodes = np.fromstring(b''.join(islice(in_file, npt)), dtype=np.float64,
+                          sep=' ').reshape(npt, 2)
+    return t, heads, nodes[:, 0], nodes[:, 1]
+
+def _skip_lines(in_file, nlines, blocksize=2**20):
+    # Moves the position of in_file on by nlines lines, counting the line
+    # ends a block at a time; returns False if the file ends first:
+    while nlines > 0:
+        block = in_file.read(blocksize)
+        if not block:
+            return False
+        ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+        if len(ends) >= nlines:
+            in_file.seek(ends[nlines-1] + 1 - len(block), os.SEEK_CUR)
+            return True
+        nlines -= len(ends)
+    return True
+
+def read_contours(filename):
+    """
+    Reads a contour file written by g2c (e.g. 3d/qlcontours.asc), which
+    holds a line with the number of contours, the number of nodes and the
+    time, then a line for each contour (its number of nodes, the index of
+    its first node, its level index, its layer and the contour interval)
+    and then the x, y coordinates of all of the nodes, one per line.  The
+    whole file is parsed in one pass.
+
+    Returns the time, the number of nodes, level index and layer of each
+    contour, and the x and y coordinates of all nodes, those of each
+    contour following those of the previous one.
+    """
+    with open(filename, 'rb') as in_file:
+        t, heads, x, y = _read_frame(in_file)
+    heads = heads.astype(int)
+    return t, heads[:, 0], heads[:, 2], heads[:, 3], x, y
+
+class ContourIndex:
+    """
+    Index of the frames of a contour dump holding many frames one after
+    another, e.g. pvcont.dat written by the casl codes, each in the form
+    read by read_contours (with a line of the number of nodes, the index
+    of the first node and the level index for each contour).  The byte
+    offset, time and numbers of contours (nc) and nodes (npt) of every
+    frame are found by scanning the file once, and are kept in a sidecar
+    file (.<name>.idx.npz next to the dump).  Frames appended since are
+    added by scanning only the new frames; a partially written frame at
+    the end of the file is not indexed.
+
+    Any frame can then be read directly with frame(), and the times, nc
+    and npt attributes give the growth of the contours with time.
+    """
+
+    def __init__(self, filename, cache=True):
+        self.filename = filename
+        self.cache = cache
+        direc, name = os.path.split(filename)
+        self.indexfile = os.path.join(direc, '.' + name + '.idx.npz')
+
+        self.offsets = np.empty(0, dtype=np.int64)
+        self.times = np.empty(0)
+        self.nc = np.empty(0, dtype=np.int64)
+        self.npt = np.empty(0, dtype=np.int64)
+        if cache and os.path.exists(self.indexfile):
+            self._load()
+        self.update()
+
+    def _load(self):
+        try:
+            with np.load(self.indexfile) as cached:
+                for field in FIELDS:
+                    setattr(self, field, cached[field])
+        except (OSError, KeyError, ValueError):
+            pass
+
+    def _save(self):
+        try:
+            with open(self.indexfile, 'wb') as out_file:
+                np.savez(out_file,
+                         **{field: getattr(self, field) for field in FIELDS})
+        except OSError:
+            # Read-only run directory; just go without a cache:
+            pass
+
+    def _header(self, in_file, offset):
+        # The numbers of contours and nodes and the time of the frame at
+        # offset, or None if there is no complete header line there:
+        in_file.seek(offset)
+        line = in_file.readline()
+        record = line.split()
+        if not line.endswith(b'\n') or len(record) < 3:
+            return None
+        return int(record[0]), int(record[1]), float(record[2])
+
+    def update(self):
+        """
+        Indexes any frames added to the file since the last update, and
+        returns the number of frames.  If the file has been overwritten
+        or truncated the whole file is scanned again.
+        """
+        size = os.path.getsize(self.filename)
+        with open(self.filename, 'rb') as in_file:
+            n = len(self.offsets)
+            if n > 0:
+                last = (int(self.nc[-1]), int(self.npt[-1]),
+                        float(self.times[-1]))
+                if (self.offsets[-1] >= size or
+                        self._header(in_file, self.offsets[-1]) != last):
+                    n = 0
+            # Start of the first frame not yet indexed:
+            if n > 0:
+                in_file.seek(self.offsets[-1])
+                in_file.readline()
+                if _skip_lines(in_file, self.nc[-1] + self.npt[-1]):
+                    offset = in_file.tell()
+                else:
+                    # The last frame indexed has since been cut short:
+                    n = 0
+            if n == 0:
+                offset = 0
+
+            new = []
+            while offset < size:
+                header = self._header(in_file, offset)
+                if header is None:
+                    break
+                if not _skip_lines(in_file, header[0] + header[1]):
+                    break
+                new.append((offset,) + header)
+                offset = in_file.tell()
+
+        if n == len(self.offsets) and not new:
+            return n
+        new = np.array(new, dtype=np.float64).reshape(-1, 4)
+        self.offsets = np.append(self.offsets[:n], new[:, 0]).astype(np.int64)
+        self.nc = np.append(self.nc[:n], new[:, 1]).astype(np.int64)
+        self.npt = np.append(self.npt[:n], new[:, 2]).astype(np.int64)
+        self.times = np.append(self.times[:n], new[:, 3])
+        if self.cache:
+            self._save()
+        return len(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def frame(self, frame):
+        """
+        Reads frame number frame (from 0), returning the time, the number
+        of nodes and level index of each contour, and the x and y
+        coordinates of all nodes.
+        """
+        with open(self.filename, 'rb') as in_file:
+            in_file.seek(self.offsets[frame])
+            t, heads, x, y = _read_frame(in_file)
+        heads = heads.astype(int)
+        return t, heads[:, 0], heads[:, 2], x, y
+
+def periodic_pieces(x, y, npts, jump=np.pi):
+    """
+    Splits the closed contours with nodes x, y (npts[j] nodes for contour
+    j, as returned by read_contours) into the pieces lying between the
+    crossings of the edges of a periodic domain, i.e. where consecutive
+    nodes differ by more than jump in x or y.  The first node of each
+    contour is repeated at its end to close it.
+
+    Returns the x and y coordinates of the vertices of all of the pieces
+    in order, the contour each vertex belongs to, and the indices at which
+    the vertices are to be split into pieces (as for numpy.split).
+    """
+    npts = np.asarray(npts)
+    nc = len(npts)
+    ends = np.cumsum(npts)
+    starts = ends - npts
+    contour = np.repeat(np.arange(nc), npts)
+
+    # Steps from each node to the next one around its contour:
+    nxt = np.arange(len(x)) + 1
+    nxt[ends-1] = starts
+    jumps = (abs(x[nxt] - x) > jump) | (abs(y[nxt] - y) > jump)
+
+    # Node i is vertex i+contour[i], allowing for the closing vertex
+    # added to each contour:
+    vertex = np.arange(len(x)) + contour
+    closing = ends + np.arange(nc)
+    xv = np.empty(len(x) + nc)
+    yv = np.empty(len(x) + nc)
+    xv[vertex] = x
+    yv[vertex] = y
+    xv[closing] = x[starts]
+    yv[closing] = y[starts]
+
+    breaks = np.union1d(vertex[jumps] + 1, closing[:-1] + 1)
+    return xv, yv, np.repeat(np.arange(nc), npts + 1), breaks
@@ -0,0 +1,229 @@
+import os
+import numpy as np
+
+# Binary frame formats, keyed by file suffix: (dtype, time stamped, offset
+# added on decoding).  The .c2 files hold big-endian byte pairs and the
+# .i2 files hold values shifted down by 2**15-1.
+FORMATS = {
+    'r4': (np.float32, True,  0),
+    'r8': (np.float64, True,  0),
+    'i4': (np.int32,   False, 0),
+    'i2': (np.uint16,  False, 2**15-1),
+    'c1': (np.uint8,   False, 0),
+    'c2': ('>u2',      False, 0),
+}
+
+def open_frames(filename, ncells, notime=False):
+    """
+    Opens a binary frame file according to its suffix (.r4, .r8, .i4,
+    .i2, .c1 or .c2).  Frames are decoded one at a time when accessed.
+    """
+    suffix = filename.split('.')[-1]
+    if suffix not in FORMATS:
+        raise ValueError('Unknown frame file format: ' + filename)
+    dtype, time, offset = FORMATS[suffix]
+    return FrameFile(filename, ncells, dtype, time and not notime, offset)
+
+class FrameFile:
+    """
+    Random-access reader for the unformatted frame files written by the
+    hydra codes (e.g. evolution/qq.r4 or zz.r8).  Each record holds the
+    time followed by the field values, [t, f(1), ..., f(N)], in single
+    (.r4) or double (.r8) precision.
+
+    The file is memory-mapped, so only the frames actually accessed are
+    read from disk.  Frames are returned as zero-copy views of shape
+    ncells (which may also be a single integer N for flat frames), unless
+    the stored values are integers (or need an offset added), in which case
+    each frame is decoded into a double precision copy.
+    """
+
+    def __new__(cls, filename, *args, **kwargs):
+        # Frame files which have been packed into an archive (see
+        # archive.py) and removed are read from the archive instead:
+        if cls is FrameFile and not os.path.exists(filename):
+            from pyio import archive
+            if archive.archive_name(filename) is not None:
+                cls = archive.ArchivedFrameFile
+        return object.__new__(cls)
+
+    def __init__(self, filename, ncells, dtype=None, time=True, offset=0):
+        self.filename = filename
+
+        if dtype is None:
+            suffix = filename.split('.')[-1]
+            if suffix == 'r8':
+                dtype = np.float64
+            else:
+                dtype = np.float32
+        self.dtype = np.dtype(dtype)
+        self.offset = offset
+
+        if np.ndim(ncells) == 0:
+            self.shape = (int(ncells),)
+        else:
+            self.shape = tuple(int(n) for n in ncells)
+        self.N = int(np.prod(self.shape))
+
+        # Offset of the field data within a record and record length:
+        self.itime = 1 if time else 0
+        self.reclen = self.N + self.itime
+        self.recbytes = self.reclen * self.dtype.itemsize
+
+        self.refresh()
+
+    def refresh(self):
+        """
+        (Re-)maps the file, picking up any complete frames appended
+        since it was opened.  A partially written trailing frame is
+        ignored.
+        """
+        self.nframes = os.path.getsize(self.filename) // self.recbytes
+        if self.nframes > 0:
+            self._map = np.memmap(self.filename, dtype=self.dtype, mode='r',
+                                  shape=(self.nframes, self.reclen))
+        else:
+            self._map = np.empty((0, self.reclen), dtype=self.dtype)
+        self._times = None
+        return self.nframes
+
+    def close(self):
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.nframes
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self.frame(key)
+        return self._decode(self.data[key])
+
+    def __iter__(self):
+        for frame in range(self.nframes):
+            yield self.frame(frame)
+
+    @property
+    def data(self):
+        # All frames as a (nframes, *shape) view (strided over the times):
+        return self._map[:, self.itime:].reshape((self.nframes,) + self.shape)
+
+    @property
+    def times(self):
+        if not self.itime:
+            return None
+        if self._times is None:
+            self._times = np.array(self._map[:, 0], dtype=np.float64)
+        return self._times
+
+    @property
+    def raw(self):
+        # The whole file as a flat array, including any time stamps:
+        return self._decode(self._map.reshape(-1))
+
+    def _decode(self, values):
+        # Integer and character data are returned in double precision:
+        if self.offset:
+            values = values + self.dtype.type(self.offset)
+        if self.dtype.kind in 'iu':
+            return values.astype(np.float64)
+        return values
+
+    def frame(self, frame):
+        return self._decode(self._map[frame, self.itime:].reshape(self.shape))
+
+    def time(self, frame):
+        return float(self._map[frame, 0])
+
+    def index(self, t):
+        """
+        Returns the index of the frame whose time is closest to t.
+        """
+        times = self.times
+        if times is None:
+            raise ValueError(self.filename + ' has no time stamps')
+        if self.nframes == 0:
+            raise IndexError(self.filename + ' contains no frames')
+        i = int(np.searchsorted(times, t))
+        if i == self.nframes or (i > 0 and t - times[i-1] <= times[i] - t):
+            i -= 1
+        return i
+
+    def at_time(self, t):
+        return self.frame(self.index(t))
+
+    # Global extrema, accumulated one frame at a time:
+    def min(self):
+        return min(self.frame(i).min() for i in range(self.nframes))
+
+    def max(self):
+        return max(self.frame(i).max() for i in range(self.nframes))
+
+class FrameDifference:
+    """
+    Frame-by-frame difference a - b of two sequences of frames, over the
+    frames common to both.  Each difference is only formed when the frame
+    is accessed.
+    """
+
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+        self.nframes = min(len(a), len(b))
+
+    def __len__(self):
+        return self.nframes
+
+    def __getitem__(self, frame):
+        return self.a[frame] - self.b[frame]
+
+    def min(self):
+        return min(self[i].min() for i in range(self.nframes))
+
+    def max(self):
+        return max(self[i].max() for i in range(self.nframes))
+
+class FrameLimits:
+    """
+    Colour limits of each frame of a sequence of frames, evaluated only
+    when a frame is first needed.  The limits are either the frame min
+    and max or, if symmetric, +/- the maximum absolute value.  Use the
+    lower and upper attributes in place of lists of limits.
+    """
+
+    def __init__(self, frames, symmetric=False):
+        self.frames = frames
+        self.symmetric = symmetric
+        self._lims = {}
+        self.lower = _Limit(self, 0)
+        self.upper = _Limit(self, 1)
+
+    def __getitem__(self, frame):
+        if frame not in self._lims:
+            f = self.frames[frame]
+            fmin, fmax = f.min(), f.max()
+            if self.symmetric:
+                fmax = max(abs(fmin), abs(fmax))
+                fmin = -fmax
+            self._lims[frame] = (fmin, fmax)
+        return self._lims[frame]
+
+    def __len__(self):
+        return len(self.frames)
+
+class _Limit:
+
+    def __init__(self, lims, k):
+        self.lims = lims
+        self.k = k
+
+    def __getitem__(self, frame):
+        return self.lims[frame][self.k]
+
+    def __len__(self):
+        return len(self.lims)
@@ -0,0 +1,135 @@
+import os
+import multiprocessing
+import numpy as np
+import scipy.fft
+import scipy.signal
+import scipy.stats
+
+from pyio.spectra import read_samples
+
+METHODS = ('periodogram', 'welch', 'multitaper')
+
+def _one_sided(power, nt):
+    # Fold the power at negative frequencies onto the positive ones:
+    power[1:(nt+1)//2] *= 2.0
+    return power
+
+def frequency_spectrum(time, values, method='periodogram', segments=8,
+                       bandwidth=4.0, confidence=0.95, average=True):
+    """
+    Computes the one-sided frequency power spectrum (power spectral
+    density, i.e. power per unit frequency) of each column of values,
+    sampled at the equally spaced times in time, and returns the average
+    over the columns (e.g. over the sample points in dsamp.asc), or the
+    spectrum of each column if average is False.  All columns are
+    transformed at once.  The spectrum is estimated by
+
+    - 'periodogram': the squared amplitude of the Fourier transform of
+      the whole record;
+    - 'welch': the average of periodograms of Hann-windowed segments,
+      overlapping by half, about segments of them spanning the record;
+    - 'multitaper': the average of the periodograms found with the
+      2*bandwidth-1 orthogonal (discrete prolate spheroidal) tapers of
+      time-bandwidth product bandwidth.
+
+    Returns the frequencies (excluding zero), the spectrum, and the
+    lower and upper bounds of its confidence interval at the level
+    confidence, from the chi-squared distribution of the estimate (with
+    2 degrees of freedom per segment or taper, fewer for overlapping
+    segments as they are correlated).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    nt = len(values)
+    dt = time[1] - time[0]
+    values = values - values.mean(axis=0)
+
+    if method == 'periodogram':
+        power = np.abs(scipy.fft.rfft(values, axis=0))**2 * dt / nt
+        spectrum = _one_sided(power, nt)
+        dof = 2
+    elif method == 'welch':
+        nperseg = max(1, min(nt, 2*nt // (segments+1)))
+        freqs, power = scipy.signal.welch(values, fs=1.0/dt, nperseg=nperseg,
+                                          axis=0)
+        spectrum = power
+        step = nperseg - nperseg//2
+        nseg = (nt - nperseg) // step + 1
+        # Equivalent degrees of freedom of overlapping segments (Percival
+        # & Walden 1993, eq. 292b); only neighbouring segments overlap:
+        window = scipy.signal.get_window('hann', nperseg)
+        rho = np.sum(window[step:] * window[:nperseg-step])**2 \
+              / np.sum(window**2)**2
+        dof = 2.0 * nseg / (1.0 + 2.0 * (1.0 - 1.0/nseg) * rho)
+    elif method == 'multitaper':
+        ntapers = max(1, int(2*bandwidth) - 1)
+        tapers = scipy.signal.windows.dpss(nt, bandwidth, Kmax=ntapers)
+        # Transform all tapered columns in one call:
+        power = np.abs(scipy.fft.rfft(tapers[:, :, None] * values[None],
+                                      axis=1))**2 * dt
+        spectrum = _one_sided(power.mean(axis=0), nt)
+        dof = 2 * ntapers
+    else:
+        raise ValueError('Unknown method ' + str(method) + '; use one of '
+                         + ', '.join(METHODS))
+
+    if method != 'welch':
+        freqs = scipy.fft.rfftfreq(nt, dt)
+    if average:
+        spectrum = spectrum.mean(axis=1)
+    alpha = 1.0 - confidence
+    lower = dof * spectrum / scipy.stats.chi2.ppf(1.0 - alpha/2.0, dof)
+    upper = dof * spectrum / scipy.stats.chi2.ppf(alpha/2.0, dof)
+    return freqs[1:], spectrum[1:], lower[1:], upper[1:]
+
+def frame_spectra(frames, reference=None, chunk=64, **kwargs):
+    """
+    Computes the frequency spectrum (see frequency_spectrum, whose
+    keyword arguments may be given) of each of the values in the frames
+    of a FrameFile, e.g. at each latitude or mass interval in the phi.r8,
+    u.r8 or v.r8 files of the zsw codes, after subtracting reference (if
+    given) from each frame.  The values are processed chunk at a time,
+    reading only those values of each frame from the memory-mapped file
+    and transforming them along time together, so that the whole time
+    series is never held in memory.
+
+    Returns the frequencies (excluding zero) and the spectra, of shape
+    (number of values, number of frequencies).
+    """
+    time = frames.times
+    values = frames.data.reshape(len(frames), -1)
+    spectra = []
+    for start in range(0, values.shape[1], chunk):
+        block = values[:, start:start+chunk]
+        if reference is not None:
+            block = block - reference[start:start+chunk]
+        freqs, spectrum = frequency_spectrum(time, block, average=False,
+                                             **kwargs)[0:2]
+        spectra.append(spectrum.T)
+    return freqs, np.concatenate(spectra)
+
+def _sample_spectrum(args):
+    filename, kwargs = args
+    time, values = read_samples(filename)
+    return frequency_spectrum(time, values, **kwargs)
+
+def sample_spectra(filenames, processes=None, **kwargs):
+    """
+    Computes frequency_spectrum (with the keyword arguments given) of
+    the point samples in each of filenames (e.g. dsamp.asc in several
+    run directories), reading and transforming the files in a pool of
+    processes (by default, one per core or file if fewer).  Returns a
+    list of the results for each file, in order.
+    """
+    filenames = list(filenames)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(filenames))
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        processes = 1
+    tasks = [(filename, kwargs) for filename in filenames]
+    if processes > 1:
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            return pool.map(_sample_spectrum, tasks)
+    return [_sample_spectrum(task) for task in tasks]
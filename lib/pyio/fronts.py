@@ -0,0 +1,51 @@
+import numpy as np
+
+def crossing(Z, level, reverse=False):
+    """
+    Returns the fractional index along the last axis of Z at which each
+    row of values first crosses level, scanning from the first value (or
+    from the last, if reverse), found by linear interpolation between the
+    two values either side of the crossing.  A crossing is a change in
+    the side of level from that of the value scanning starts at.  Rows
+    which do not cross level give NaN.
+    """
+    Z = np.asarray(Z, dtype=np.float64)
+    if reverse:
+        Z = Z[..., ::-1]
+    above = Z > level
+    crossed = above != above[..., :1]
+    i = np.argmax(crossed, axis=-1)
+    found = crossed.any(axis=-1)
+    i = np.where(found, i, 1)
+    z0 = np.take_along_axis(Z, (i-1)[..., None], axis=-1)[..., 0]
+    z1 = np.take_along_axis(Z, i[..., None], axis=-1)[..., 0]
+    pos = np.where(found, i - 1 + (z0 - level)/(z0 - z1), np.nan)
+    if reverse:
+        pos = Z.shape[-1] - 1 - pos
+    return pos
+
+def track_fronts(frames, rows, level, chunk=256):
+    """
+    Finds the first crossings of level from the left and from the right
+    (see crossing) along x in the given rows (y grid indices) of every
+    frame of frames, a FrameFile of frames of shape (nx+1, ny+1), e.g.
+    as returned by textframes.ingest for bb.dat, which must be time
+    stamped.  Frames are processed chunk at a time, reading only the
+    rows needed from the file.
+
+    Returns the times and the fractional x grid indices of the left and
+    right crossings, each of shape (nframes, len(rows)).
+    """
+    if frames.times is None:
+        raise ValueError(frames.filename + ' has no time stamps')
+    rows = list(rows)
+    nframes = len(frames)
+    left = np.empty((nframes, len(rows)))
+    right = np.empty((nframes, len(rows)))
+    for start in range(0, nframes, chunk):
+        # Rows as (frames, rows, x):
+        Z = np.swapaxes(frames._decode(frames.data[start:start+chunk][:, :, rows]),
+                        1, 2)
+        left[start:start+chunk] = crossing(Z, level)
+        right[start:start+chunk] = crossing(Z, level, reverse=True)
+    return frames.times, left, right
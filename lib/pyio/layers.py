@@ -0,0 +1,155 @@
+import multiprocessing
+import numpy as np
+
+from pyio.frames import FrameFile
+
+def read_modes(filename, nz):
+    """
+    Reads the vertical mode matrix from modes.asc (written by the
+    multi-layer codes, after nz eigenvalues), returning vec with the
+    modes as columns, i.e. vec[iz,m] is mode m in layer iz.
+    """
+    values = np.loadtxt(filename, usecols=0)
+    return values[nz:nz+nz*nz].reshape(nz, nz).T
+
+class LayerFrames:
+    """
+    Memory-mapped multi-layer frame file (e.g. evolution/qq.r4 from the
+    qgml codes), each frame holding nz layers of nx*ny values after the
+    time.  Frames are returned as double precision arrays of shape
+    (nz, nx, ny), optionally
+
+    - projected onto vertical modes: pass modes as read by read_modes,
+      and element m of each frame is then sum_iz modes[iz,m]*f[iz];
+    - with a background (e.g. beta*y) subtracted: background is either
+      an (nx, ny) array subtracted from every layer or mode, or an array
+      of shape (nz, nx, ny) with one background per layer or mode.
+
+    Any slice of frames is transformed with one (batched) matrix
+    product, and quantities over all frames (min_max, mean) are
+    accumulated a chunk of frames at a time, so the whole time series is
+    never held in memory.  By default a chunk holds about 2**24 values
+    (at least one frame).
+    """
+
+    def __init__(self, filename, nz, nx, ny, modes=None, background=None,
+                 chunk=None):
+        self.frames = FrameFile(filename, (nz, nx, ny), np.float32)
+        self.nz, self.nx, self.ny = nz, nx, ny
+        self.modes = None if modes is None else np.asarray(modes, dtype=np.float64)
+        self.background = background
+        if chunk is None:
+            chunk = max(1, 2**24 // (nz * nx * ny))
+        self.chunk = chunk
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._transform(self.frames.data[key][None])[0]
+        return self._transform(self.frames.data[key])
+
+    def time(self, frame):
+        return self.frames.time(frame)
+
+    def _transform(self, data):
+        # data has shape (nframes, nz, nx, ny):
+        data = np.array(data, dtype=np.float64)
+        if self.modes is not None:
+            n = len(data)
+            data = np.matmul(self.modes.T, data.reshape(n, self.nz, -1)
+                             ).reshape(data.shape)
+        if self.background is not None:
+            data -= self.background
+        return data
+
+    def chunks(self):
+        """
+        Iterates over the frames a chunk at a time, giving the index of
+        the first frame and the transformed frames of the chunk.
+        """
+        for start in range(0, len(self), self.chunk):
+            yield start, self[start:start+self.chunk]
+
+    def min_max(self):
+        """
+        Returns the minimum and maximum of each layer (or mode) over all
+        frames.
+        """
+        layer_min = np.full(self.nz, np.inf)
+        layer_max = np.full(self.nz, -np.inf)
+        for start, block in self.chunks():
+            layer_min = np.minimum(layer_min, block.min(axis=(0, 2, 3)))
+            layer_max = np.maximum(layer_max, block.max(axis=(0, 2, 3)))
+        return layer_min, layer_max
+
+    def mean(self):
+        """
+        Returns the time average of each layer (or mode), shape (nz, nx, ny).
+        """
+        total = np.zeros((self.nz, self.nx, self.ny))
+        for start, block in self.chunks():
+            total += block.sum(axis=0)
+        return total / len(self)
+
+# Set in each worker process by area_distribution:
+_area_args = None
+
+def _area_chunk(start):
+    frames, nq, bins = _area_args
+    return _area_block(frames[start:start+frames.chunk], nq, bins)
+
+def _area_block(block, nq, bins):
+    # Cumulative area distributions of each layer of a block of frames:
+    nframes, nz = block.shape[0:2]
+    q = block.reshape(nframes*nz, -1)
+    if bins is None:
+        qmin = q.min(axis=1)
+        qmax = q.max(axis=1)
+    else:
+        qmin = np.tile(bins[0], nframes)
+        qmax = np.tile(bins[1], nframes)
+    dq = (qmax - qmin) / float(nq)
+    dq[dq == 0.0] = 1.0
+
+    # Interval k of each value, where interval k is centred on the
+    # threshold qmin+k*dq:
+    k = ((q - (qmin - dq/2.0)[:, None]) / dq[:, None]).astype(int)
+    k = np.clip(k, 0, nq) + (nq + 1) * np.arange(nframes*nz)[:, None]
+    counts = np.bincount(k.ravel(), minlength=nframes*nz*(nq+1))
+    farea = np.cumsum(counts.reshape(nframes, nz, nq+1), axis=2) / float(q.shape[1])
+    return (q.min(axis=1).reshape(nframes, nz), q.max(axis=1).reshape(nframes, nz),
+            farea)
+
+def area_distribution(frames, nq, bins=None, processes=1):
+    """
+    Computes the PV "measure" of each layer of each frame of frames (a
+    LayerFrames object): the fractional area of the layer with values
+    below each of nq+1 thresholds spanning the range of values (the
+    thresholds are the centres of nq+1 intervals, of which the first and
+    last are centred on the min and max).  By default the thresholds
+    span the min and max in each layer at each time; if bins=(qmin,
+    qmax), arrays of the min and max in each layer (e.g. from
+    frames.min_max()), are given, the same thresholds are used at all
+    times, so that the distributions can be compared.
+
+    The frames are processed a chunk at a time, in a pool of forked
+    processes if processes > 1.  Returns the min and max in each layer
+    at each time, of shape (nt, nz), and the distributions, of shape
+    (nt, nz, nq+1).
+    """
+    global _area_args
+    starts = range(0, len(frames), frames.chunk)
+    if processes > 1:
+        _area_args = (frames, nq, bins)
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            results = pool.map(_area_chunk, starts)
+        _area_args = None
+    else:
+        results = [_area_block(block, nq, bins) for start, block in frames.chunks()]
+
+    qmin = np.concatenate([r[0] for r in results])
+    qmax = np.concatenate([r[1] for r in results])
+    farea = np.concatenate([r[2] for r in results])
+    return qmin, qmax, farea
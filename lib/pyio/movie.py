@@ -0,0 +1,77 @@
+import os
+import matplotlib.animation as anim
+
+class MovieWriter:
+    """
+    Writes a movie of a figure one frame at a time.  The figure is set up
+    once and updated in place between frames (e.g. with set_data or
+    set_text), and each frame is piped to ffmpeg as a raw image when
+    grab is called, so memory use does not grow with the number of
+    frames.  If ffmpeg is not available, the frames are saved as a
+    numbered sequence of png files instead, from which the movie can be
+    made later.
+    """
+
+    def __init__(self, fig, filename, fps=10, dpi=None,
+                 extra_args=('-vcodec', 'libx264')):
+        self.fig = fig
+        self.filename = filename
+        self.fps = fps
+        self.dpi = dpi or fig.dpi
+        self.extra_args = list(extra_args)
+        self.nframes = 0
+
+        if anim.FFMpegWriter.isAvailable():
+            self.framedir = None
+            self._writer = anim.FFMpegWriter(fps=fps, extra_args=self.extra_args)
+            self._writer.setup(fig, filename, self.dpi)
+        else:
+            self.framedir = os.path.splitext(filename)[0] + '_frames'
+            if not os.path.isdir(self.framedir):
+                os.makedirs(self.framedir)
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def grab(self):
+        """
+        Adds the current state of the figure to the movie.
+        """
+        if self._writer is not None:
+            self._writer.grab_frame()
+        else:
+            self.fig.savefig(os.path.join(self.framedir, '%04d.png' % self.nframes),
+                             dpi=self.dpi)
+        self.nframes += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.finish()
+            self._writer = None
+        elif self.framedir is not None:
+            print(' ffmpeg was not found, so the frames have been saved in '
+                  + self.framedir + '; to make the movie, type')
+            print('')
+            print(' ffmpeg -r %d -i %s/%%04d.png %s %s'
+                  % (self.fps, self.framedir, ' '.join(self.extra_args), self.filename))
+            print('')
+            self.framedir = None
+
+def select_frames(frames, first=0, last=None, stride=1, t1=None, t2=None):
+    """
+    Returns the indices of the frames to show, from first to last (both
+    included, default all frames) taking every stride-th frame.  If a
+    time range t1 to t2 is given instead, the frames closest to these
+    times (see FrameFile.index) are used for first and last.
+    """
+    if t1 is not None:
+        first = frames.index(t1)
+    if t2 is not None:
+        last = frames.index(t2)
+    if last is None:
+        last = len(frames) - 1
+    return range(first, last + 1, stride)
@@ -0,0 +1,113 @@
+import numpy as np
+
+# Norms of the difference a - b of each run a from the reference b, in
+# the order of the columns written by write_norms: the mean absolute, rms
+# and maximum absolute differences, the same divided by the corresponding
+# norm of b, the correlation of a with b and the mean difference (bias):
+COLUMNS = ('l1', 'l2', 'linf', 'rel_l1', 'rel_l2', 'rel_linf', 'corr', 'bias')
+
+def align(times, reference, tol=None):
+    """
+    Returns, for each of the reference times, the index of the nearest of
+    times, or -1 if none lies within tol (by default half the smallest
+    interval between the reference times).
+    """
+    times = np.asarray(times)
+    reference = np.asarray(reference)
+    if tol is None:
+        tol = 0.5*np.diff(reference).min() if len(reference) > 1 else np.inf
+    n = len(times)
+    if n == 0:
+        return np.full(len(reference), -1)
+    i = np.searchsorted(times, reference)
+    lo = np.clip(i-1, 0, n-1)
+    hi = np.clip(i, 0, n-1)
+    i = np.where(abs(times[lo] - reference) <= abs(times[hi] - reference),
+                 lo, hi)
+    return np.where(abs(times[i] - reference) <= tol, i, -1)
+
+def _strides(shape, reference):
+    # Subsampling of frames of shape onto the coarser grid of the
+    # reference, when each dimension is a whole multiple of it:
+    if len(shape) != len(reference) or \
+       any(n % m for n, m in zip(shape, reference)):
+        raise ValueError('Cannot compare frames of shape %s with %s'
+                         % (shape, reference))
+    return tuple(slice(None, None, n // m) for n, m in zip(shape, reference))
+
+def compare(runs, reference, tol=None, chunk=None):
+    """
+    Computes the norms in COLUMNS of the differences between each frame
+    of the reference (a FrameFile) and the frame nearest in time of each
+    of the runs (a list of FrameFiles), using only frames within tol in
+    time (see align).  Frames on a finer grid than the other are compared
+    at the points of the coarser grid, which must be a subsample of it.
+
+    The frames are read from the memory-mapped files chunk frames at a
+    time (by default, about 16 million values), each chunk of the
+    reference being compared with all of the runs, and all norms of a
+    chunk are found together in double precision, after decoding (see
+    frames.FORMATS) as for single frames.
+
+    Returns the reference times and the norms, of shape (len(runs),
+    number of reference frames, len(COLUMNS)), which are NaN where a run
+    has no frame at the reference time.
+    """
+    nframes = len(reference)
+    times = reference.times
+    if times is None:
+        times = np.arange(nframes, dtype=np.float64)
+
+    shape = reference.shape
+    index = []
+    for run in runs:
+        shape = tuple(min(n, m) for n, m in zip(shape, run.shape))
+        if run.times is None or reference.times is None:
+            index.append(np.where(np.arange(nframes) < len(run),
+                                  np.arange(nframes), -1))
+        else:
+            index.append(align(run.times, times, tol))
+    subsample = [_strides(f.shape, shape) for f in [reference] + list(runs)]
+
+    if chunk is None:
+        chunk = max(1, 2**24 // int(np.prod(shape)))
+    axes = tuple(range(1, len(shape)+1))
+    norms = np.full((len(runs), nframes, len(COLUMNS)), np.nan)
+    for start in range(0, nframes, chunk):
+        frames = np.arange(start, min(start+chunk, nframes))
+        b = reference._decode(reference.data[frames][(slice(None),) + subsample[0]])
+        b = np.asarray(b, dtype=np.float64)
+        bmean = b.mean(axis=axes)
+        bdev = b - bmean.reshape((-1,) + (1,)*len(shape))
+        bnorms = (abs(b).mean(axis=axes), np.sqrt((b**2).mean(axis=axes)),
+                  abs(b).max(axis=axes))
+        bvar = (bdev**2).mean(axis=axes)
+        for k, run in enumerate(runs):
+            i = index[k][frames]
+            ok = i >= 0
+            if not ok.any():
+                continue
+            a = run._decode(run.data[i[ok]][(slice(None),) + subsample[k+1]])
+            a = np.asarray(a, dtype=np.float64)
+            d = a - b[ok]
+            l1 = abs(d).mean(axis=axes)
+            l2 = np.sqrt((d**2).mean(axis=axes))
+            linf = abs(d).max(axis=axes)
+            adev = a - a.mean(axis=axes).reshape((-1,) + (1,)*len(shape))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = (adev*bdev[ok]).mean(axis=axes) / \
+                       np.sqrt((adev**2).mean(axis=axes)*bvar[ok])
+                norms[k, frames[ok]] = np.column_stack(
+                    (l1, l2, linf, l1/bnorms[0][ok], l2/bnorms[1][ok],
+                     linf/bnorms[2][ok], corr, d.mean(axis=axes)))
+    return times, norms
+
+def write_norms(filename, times, norms, labels):
+    """
+    Writes the time and the norms (as returned by compare) of each run,
+    one line per frame, with a header naming the columns by run label.
+    """
+    header = 't ' + ' '.join(label + ':' + column for label in labels
+                             for column in COLUMNS)
+    table = np.column_stack([times] + [norms[k] for k in range(len(norms))])
+    np.savetxt(filename, table, fmt='%.8e', header=header)
@@ -0,0 +1,141 @@
+import os
+import zlib
+import struct
+import numpy as np
+
+from pyio.render import render_frames
+
+def colour_table(cmap, n=None):
+    """
+    Returns a look-up table of n colours, as an (n, 3) array of uint8 RGB
+    values, sampled evenly from cmap: a matplotlib colour map (such as
+    those returned by get_colourmap in scripts/graphics/utils.py or by
+    cmap_wbgyr in lib/wbgyr.py) or a list of RGB colours, either from 0
+    to 1 or from 0 to 255, which are interpolated linearly.  By default
+    n is the number of colours of the colour map (or 256 for a list), so
+    that the colours are exactly those matplotlib would use.
+    """
+    if n is None:
+        n = getattr(cmap, 'N', 256)
+    if callable(cmap):
+        # The colour at the middle of each of the n intervals:
+        rgb = np.asarray(cmap((np.arange(n) + 0.5) / n))[:, :3]
+    else:
+        x = np.linspace(0.0, 1.0, n)
+        colours = np.asarray(cmap, dtype=np.float64)[:, :3]
+        if colours.max() > 1.0:
+            colours = colours / 255.0
+        xc = np.linspace(0.0, 1.0, len(colours))
+        rgb = np.column_stack([np.interp(x, xc, c) for c in colours.T])
+    # Truncated as by matplotlib:
+    return (255.0 * rgb).astype(np.uint8)
+
+class Raster:
+    """
+    Turns frames of shape (nx, ny) straight into RGB images, one pixel per
+    grid point (or upscale by upscale pixels), with x to the right and y
+    upwards as shown by imshow(frame.T, origin='lower'), but without
+    matplotlib: the values are scaled to indices into a look-up table of
+    ncolours colours of cmap (see colour_table; e.g. 4096 for smooth
+    shading), and the pixels are found with a single np.take.  Values
+    outside vmin to vmax take the end colours, and NaN the first colour;
+    with no limits, each frame is scaled by its own min and max.
+    """
+
+    def __init__(self, cmap, vmin=None, vmax=None, ncolours=None, upscale=1):
+        self.lut = colour_table(cmap, ncolours)
+        self.vmin = vmin
+        self.vmax = vmax
+        self.upscale = int(upscale)
+
+    def rgb(self, frame, vmin=None, vmax=None):
+        """
+        Returns the image of frame as an (ny*upscale, nx*upscale, 3) array
+        of uint8, its first row being the top (largest y) of the frame.
+        vmin and vmax, if given, replace those of the Raster.
+        """
+        frame = np.asarray(frame)
+        if vmin is None:
+            vmin = self.vmin if self.vmin is not None else frame.min()
+        if vmax is None:
+            vmax = self.vmax if self.vmax is not None else frame.max()
+        n = len(self.lut)
+        scale = n / (vmax - vmin) if vmax > vmin else 0.0
+
+        # Colour indices, in image order:
+        x = np.subtract(frame.T[::-1], vmin, dtype=np.float32)
+        x *= scale
+        np.clip(x, 0, n - 1, out=x)
+        np.nan_to_num(x, copy=False)
+        index = x.astype(np.uint16)
+        if self.upscale > 1:
+            index = np.repeat(np.repeat(index, self.upscale, axis=0),
+                              self.upscale, axis=1)
+        return np.take(self.lut, index, axis=0)
+
+def write_png(filename, rgb, level=1):
+    """
+    Writes an (height, width, 3) array of uint8 as a png file, compressed
+    at zlib level (1, the default, is fastest).
+    """
+    height, width = rgb.shape[:2]
+    # Each row starts with a filter type byte (0, no filter):
+    rows = np.zeros((height, 3*width + 1), dtype=np.uint8)
+    rows[:, 1:] = rgb.reshape(height, 3*width)
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    with open(filename, 'wb') as out_file:
+        out_file.write(b'\x89PNG\r\n\x1a\n')
+        out_file.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height,
+                                                  8, 2, 0, 0, 0)))
+        out_file.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), level)))
+        out_file.write(chunk(b'IEND', b''))
+
+def write_ppm(filename, rgb):
+    """
+    Writes an (height, width, 3) array of uint8 as a binary ppm file.
+    """
+    height, width = rgb.shape[:2]
+    with open(filename, 'wb') as out_file:
+        out_file.write(b'P6\n%d %d\n255\n' % (width, height))
+        out_file.write(np.ascontiguousarray(rgb, dtype=np.uint8).tobytes())
+
+def write_image(filename, rgb):
+    """
+    Writes rgb as a png or ppm file, according to the suffix of filename.
+    """
+    if os.path.splitext(filename)[1].lower() == '.ppm':
+        write_ppm(filename, rgb)
+    else:
+        write_png(filename, rgb)
+
+def export_frames(frames, pattern, raster, indices=None, lower=None,
+                  upper=None, skip=1, processes=None):
+    """
+    Writes an image of each of the given frames (by default all) of
+    frames, a FrameFile or an array of frames, to pattern % frame (e.g.
+    'frames/qq%04d.png'), using raster.  lower and upper, if given, hold
+    the colour limits of each frame (e.g. those of a FrameLimits), and
+    only every skip-th point in x and y is shown.  The frames are shared
+    out over processes processes, as by render_frames.
+    Returns the time taken by each frame.
+    """
+    if indices is None:
+        indices = range(len(frames))
+    direc = os.path.dirname(pattern % 0)
+    if direc and not os.path.isdir(direc):
+        os.makedirs(direc)
+
+    def setup():
+        return raster
+
+    def render(raster, frame):
+        vmin = lower[frame] if lower is not None else None
+        vmax = upper[frame] if upper is not None else None
+        image = raster.rgb(frames[frame][::skip, ::skip], vmin, vmax)
+        write_image(pattern % frame, image)
+
+    return render_frames(setup, render, indices, processes)
@@ -0,0 +1,62 @@
+import os
+import time
+import multiprocessing
+
+# Set in each worker process by _init:
+_setup_state = None
+_render = None
+
+def _init(setup, render):
+    global _setup_state, _render
+    _setup_state = setup()
+    _render = render
+
+def _render_frame(frame):
+    start = time.time()
+    _render(_setup_state, frame)
+    return frame, time.time() - start
+
+def render_frames(setup, render, frames, processes=None):
+    """
+    Renders a sequence of frames (e.g. one png file per frame) in a pool
+    of processes.  setup() is called once in each process to create and
+    configure its own figure, and returns whatever render needs; then
+    render(state, frame) draws and saves a single frame.  All data needed
+    (including any global colour limits) should be set up beforehand, as
+    the processes are forked from the calling one and so share its data.
+
+    The frames are handed out in order, and progress is reported in the
+    same order.  processes defaults to the number of cores; with one
+    process (or where processes cannot be forked) the frames are rendered
+    in the calling process.  Returns the time taken by each frame.
+    """
+    frames = list(frames)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(frames))
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        processes = 1
+
+    print(' Rendering %d frames using %d processes' % (len(frames), max(processes, 1)))
+    start = time.time()
+    timings = []
+    if processes > 1:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes, _init, (setup, render)) as pool:
+            for frame, dt in pool.imap(_render_frame, frames):
+                timings.append(dt)
+                print(' Frame %d done (%d of %d) in %.2f s'
+                      % (frame, len(timings), len(frames), dt))
+    else:
+        _init(setup, render)
+        for frame in frames:
+            frame, dt = _render_frame(frame)
+            timings.append(dt)
+            print(' Frame %d done (%d of %d) in %.2f s'
+                  % (frame, len(timings), len(frames), dt))
+
+    elapsed = time.time() - start
+    if timings:
+        print(' %d frames rendered in %.1f s (%.2f s per frame, %.2f s on average in each process)'
+              % (len(frames), elapsed, elapsed/len(frames), sum(timings)/len(timings)))
+    return timings
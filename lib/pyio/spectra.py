@@ -0,0 +1,111 @@
+import os
+import numpy as np
+
+# Parsed text files are kept in a binary sidecar file (.<name>.npz next
+# to the text file), which is reused for as long as the size and
+# modification time of the text file (and the way it was parsed) are
+# unchanged:
+
+def _cache_key(filename, layout):
+    stat = os.stat(filename)
+    return np.array([stat.st_size, stat.st_mtime, layout])
+
+def _cache_name(filename):
+    direc, name = os.path.split(filename)
+    return os.path.join(direc, '.' + name + '.npz')
+
+def _load_cache(filename, layout):
+    cachefile = _cache_name(filename)
+    if not os.path.exists(cachefile):
+        return None
+    try:
+        with np.load(cachefile) as cached:
+            if np.array_equal(cached['key'], _cache_key(filename, layout)):
+                return dict(cached)
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+def _save_cache(filename, layout, **arrays):
+    try:
+        with open(_cache_name(filename), 'wb') as out_file:
+            np.savez(out_file, key=_cache_key(filename, layout), **arrays)
+    except OSError:
+        # Read-only run directory; just go without a cache:
+        pass
+
+def read_spectra(filename, nhead=2, ncol=None, cache=True):
+    """
+    Reads a time series of spectra written as formatted text, e.g. in
+    spectra.asc, alt-spectra.asc, bspectra.asc or ispectra.asc.  Each
+    frame consists of a header of nhead values, the first being the time
+    and the last being kmax, followed by kmax lines of ncol values (ncol
+    is found from the first data line if not given).  The strat codes
+    use nhead=5 and ncol=3.
+
+    Returns header (nframes, nhead) and data (nframes, kmax, ncol).  An
+    incomplete frame at the end of the file is ignored.
+
+    The parsed arrays are kept in a binary sidecar file (.<name>.npz next
+    to the text file), which is reused for as long as the size and
+    modification time of the text file are unchanged.
+    """
+    if cache:
+        cached = _load_cache(filename, nhead)
+        if cached is not None:
+            data = cached['data']
+            if ncol is None or data.shape[2] == ncol:
+                return cached['header'], data
+
+    with open(filename, 'r') as in_file:
+        first_line = in_file.readline()
+        if ncol is None:
+            # Skip the rest of the header, then count the data columns:
+            nread = len(first_line.split())
+            line = in_file.readline()
+            while nread < nhead:
+                nread += len(line.split())
+                line = in_file.readline()
+            ncol = len(line.split())
+        in_file.seek(0)
+        raw_data = np.fromfile(in_file, dtype=float, sep=' ')
+
+    kmax = int(raw_data[nhead-1])
+    reclen = nhead + kmax*ncol
+    nframes = len(raw_data) // reclen
+    raw_data = raw_data[:nframes*reclen].reshape(nframes, reclen)
+    header = raw_data[:, :nhead]
+    data = raw_data[:, nhead:].reshape(nframes, kmax, ncol)
+
+    if cache:
+        _save_cache(filename, nhead, header=header, data=data)
+
+    return header, data
+
+def read_samples(filename, cache=True):
+    """
+    Reads a time series of point samples written as formatted text, one
+    line per time holding the time followed by the value at each sample
+    point, e.g. spectra/dsamp.asc.  Returns time (nt) and values (nt,
+    npoints).  An incomplete line at the end of the file is ignored.  As
+    for read_spectra, the arrays are kept in a binary sidecar file.
+    """
+    if cache:
+        cached = _load_cache(filename, 0)
+        if cached is not None:
+            return cached['time'], cached['values']
+
+    with open(filename, 'r') as in_file:
+        ncol = len(in_file.readline().split())
+        in_file.seek(0)
+        raw_data = np.fromfile(in_file, dtype=float, sep=' ')
+
+    nt = len(raw_data) // ncol
+    raw_data = raw_data[:nt*ncol].reshape(nt, ncol)
+    time = raw_data[:, 0]
+    values = raw_data[:, 1:]
+
+    if cache:
+        _save_cache(filename, 0, time=time, values=values)
+
+    return time, values
@@ -0,0 +1,115 @@
+import os
+import numpy as np
+import scipy.sparse
+
+# Projection matrices already built in this process, by view:
+_projections = {}
+
+class Orthographic:
+    """
+    Orthographic projection of fields on the ng latitudes by 2*ng
+    longitudes grid of the spherical codes, as viewed from the direction
+    (rlatc, rlonc) in degrees, onto an npix by npix image (npix defaults
+    to ng) covering [-1,1] x [-1,1].  Points off the sphere are set to 0.
+
+    The bilinear interpolation from the grid to each pixel is found once
+    and stored as a sparse matrix, so that any number of frames can then
+    be projected with one sparse matrix product.  If cachedir is given
+    (e.g. the evolution subdirectory of a run), the matrix is also saved
+    there, in a hidden .ortho_*.npz file, for re-use by later scripts.
+    """
+
+    def __init__(self, ng, rlatc=0.0, rlonc=0.0, npix=None, cachedir=None):
+        self.ng = ng
+        self.nt = 2*ng
+        self.npix = npix or ng
+        self.rlatc = rlatc
+        self.rlonc = rlonc
+
+        key = (ng, self.npix, float(rlatc), float(rlonc))
+        self.matrix = _projections.get(key)
+        if self.matrix is not None:
+            return
+        cachefile = None
+        if cachedir is not None:
+            cachefile = os.path.join(cachedir, '.ortho_n%d_p%d_lat%g_lon%g.npz' % key)
+            try:
+                self.matrix = scipy.sparse.load_npz(cachefile)
+            except (IOError, OSError, ValueError):
+                pass
+        if self.matrix is None:
+            self.matrix = self._weights()
+            if cachefile is not None:
+                try:
+                    scipy.sparse.save_npz(cachefile, self.matrix)
+                except OSError:
+                    pass
+        _projections[key] = self.matrix
+
+    def _weights(self):
+        ng, nt, npix = self.ng, self.nt, self.npix
+        dl = np.pi/float(ng)
+        dli = float(ng)/(np.pi+1.e-12)
+        hpidl = (np.pi+dl)/2.0
+        clatc = np.cos(self.rlatc*np.pi/180.)
+        slatc = np.sin(self.rlatc*np.pi/180.)
+        clonc = np.cos(self.rlonc*np.pi/180.)
+        slonc = np.sin(self.rlonc*np.pi/180.)
+
+        # Pixel centres on the sphere (pixel p = iy*npix+iz):
+        h = 2.0/float(npix)
+        g = h*(np.arange(npix)+0.5)-1.0
+        yp, zp = np.meshgrid(g, g, indexing='ij')
+        det = 1.0-yp**2-zp**2
+        pixels = np.flatnonzero(det > 0.0)
+        yp = yp.ravel()[pixels]
+        zp = zp.ravel()[pixels]
+        xp = np.sqrt(det.ravel()[pixels])
+
+        # Rotate to the view direction:
+        xm = xp*clatc-zp*slatc
+        zt = zp*clatc+xp*slatc
+        yt = yp*clonc+xm*slonc
+        xt = xm*clonc-yp*slonc
+
+        # Longitude and latitude indices and interpolation weights:
+        ri = dli*(np.pi+np.arctan2(yt, xt))
+        i = ri.astype(int)
+        aa = ri-i
+        i = i % nt
+        ip1 = (i+1) % nt
+
+        rj = dli*(hpidl+np.arcsin(zt))
+        j = rj.astype(int)
+        cc = rj-j
+        dd = 1.0-cc
+
+        # Latitudes j run from 0 to ng+1, where 0 and ng+1 lie beyond the
+        # poles and are found at the first and last latitude pi away in
+        # longitude; grid point (i,j) is value i*ng+j-1 of a frame:
+        def column(i, j):
+            beyond = (j == 0) | (j == ng+1)
+            i = np.where(beyond, (i+ng) % nt, i)
+            j = np.clip(j, 1, ng)
+            return i*ng+j-1
+
+        rows = np.tile(pixels, 4)
+        cols = np.concatenate([column(i, j), column(i, j+1),
+                               column(ip1, j), column(ip1, j+1)])
+        vals = np.concatenate([(1.0-aa)*dd, (1.0-aa)*cc, aa*dd, aa*cc])
+        return scipy.sparse.csr_matrix((vals, (rows, cols)),
+                                       shape=(npix*npix, nt*ng))
+
+    def __call__(self, frames):
+        """
+        Projects one frame of nt*ng values (as saved by the codes, in any
+        shape), returning an (npix, npix) image indexed as [iy, iz], or
+        an array of frames (of shape (nframes, nt*ng) or (nframes, nt,
+        ng)), returning images of shape (nframes, npix, npix).
+        """
+        frames = np.asarray(frames, dtype=np.float64)
+        if frames.size == self.nt*self.ng:
+            return (self.matrix @ frames.ravel()).reshape(self.npix, self.npix)
+        frames = frames.reshape(len(frames), -1)
+        images = (self.matrix @ frames.T).T
+        return images.reshape(len(frames), self.npix, self.npix)
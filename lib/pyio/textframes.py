@@ -0,0 +1,87 @@
+import os
+from itertools import islice
+import numpy as np
+
+from pyio.frames import FrameFile
+
+def _names(filename):
+    # Binary frame file and ingest state, hidden next to the text file:
+    direc, name = os.path.split(filename)
+    return (os.path.join(direc, '.' + name + '.r8'),
+            os.path.join(direc, '.' + name + '.ingest.npz'))
+
+def _head(filename, nbytes=64):
+    # The start of the text file, to recognise a file written afresh:
+    with open(filename, 'rb') as in_file:
+        return np.frombuffer(in_file.read(nbytes), dtype=np.uint8)
+
+def ingest(filename, ncells, binfile=None):
+    """
+    Converts a text dump of frames, such as bb.dat or zz.dat written by
+    the casl codes in ca/strat/aper (the time on one line, followed by
+    the field values one per line), into a binary frame file of time
+    stamped double precision records, and returns it opened as a
+    FrameFile with frames of shape ncells.
+
+    The binary file (by default .<name>.r8 next to the text file) is
+    kept, together with the position in the text file reached, so that
+    later calls only convert the frames appended since, e.g. by a job
+    which is still running.  A partially written frame at the end of the
+    text file is left for the next call.  If the text file has been
+    written afresh (or truncated), it is converted again from the start.
+    """
+    if np.ndim(ncells) == 0:
+        ncells = (int(ncells),)
+    N = int(np.prod(ncells))
+    reclen = N + 1
+    recbytes = reclen * np.dtype(np.float64).itemsize
+
+    default, statefile = _names(filename)
+    if binfile is None:
+        binfile = default
+    head = _head(filename)
+
+    # Resume from the last call if it converted the same text file:
+    offset = 0
+    nframes = 0
+    try:
+        with np.load(statefile) as state:
+            if (state['N'] == N and np.array_equal(state['head'], head)
+                    and state['binfile'] == os.path.abspath(binfile)
+                    and state['offset'] <= os.path.getsize(filename)
+                    and os.path.getsize(binfile) >= state['nframes']*recbytes):
+                offset = int(state['offset'])
+                nframes = int(state['nframes'])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    with open(filename, 'rb') as in_file, \
+         open(binfile, 'r+b' if nframes else 'wb') as out_file:
+        # Discard anything written after the last complete conversion:
+        out_file.truncate(nframes * recbytes)
+        out_file.seek(nframes * recbytes)
+        in_file.seek(offset)
+        try:
+            while True:
+                lines = list(islice(in_file, reclen))
+                if len(lines) < reclen or not lines[-1].endswith(b'\n'):
+                    break
+                values = np.fromstring(b''.join(lines), dtype=np.float64,
+                                       sep=' ')
+                if len(values) != reclen:
+                    raise ValueError('Frame %d of %s does not hold %d values'
+                                     % (nframes+1, filename, reclen))
+                out_file.write(values.tobytes())
+                offset += sum(len(line) for line in lines)
+                nframes += 1
+        finally:
+            out_file.flush()
+            try:
+                with open(statefile, 'wb') as state_file:
+                    np.savez(state_file, N=N, head=head, offset=offset,
+                             nframes=nframes,
+                             binfile=os.path.abspath(binfile))
+            except OSError:
+                pass
+
+    return FrameFile(binfile, ncells, np.float64)
@@ -4,6 +4,7 @@
 # GN and 3D, for the fields of delta, zeta, gamma and w.
 
 #========== Perform the generic imports =========
+import os,sys
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -12,6 +13,9 @@ import matplotlib as mpl
 from matplotlib import rc
 from matplotlib import rcParams
 rcParams.update({'figure.autolayout': True})
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import open_frames
+from pyio.norms import COLUMNS, compare, write_norms
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -36,8 +40,8 @@ mpl.rcParams['axes.linewidth'] = 3
 
 #=================================================================
 # Select resolution:
-print
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
+print()
+ng=int(input(' Resolution (default 256)? ') or 256)
 
 #=================================================================
 # Set up figure:
@@ -73,110 +77,37 @@ label_list=['SW -- 3D','GN -- 3D']
 colorlist=[(0.0,0.0,0.0),(0.4,0.4,0.4)]
 
 #=================================================================
-# Read field data and compute rms differences:
-N=ng*ng
-Zsw=np.empty(N)
-Zgn=np.empty(N)
-Z3d=np.empty(N)
-sumfac=1.0/float(N)
+# Read field data and compute rms differences (all norms of each field
+# are also written to norms_<field>_n<ng>.asc):
+l2col=COLUMNS.index('l2')
 
 # Divergence:
-sw_file=open(direc[0]+'dd.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(direc[1]+'dd.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(direc[2]+'2d/d.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-time=np.empty(nframes)
-dsw=np.empty(nframes)
-dgn=np.empty(nframes)
-
-for frame in range(nframes):
-   time[frame]=sw_array[frame*(N+1)]
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   dsw[frame]=np.sqrt(sumfac*sum((Zsw-Z3d)**2))
-   dgn[frame]=np.sqrt(sumfac*sum((Zgn-Z3d)**2))
+time,norms=compare([open_frames(direc[0]+'dd.r4',(ng,ng)),open_frames(direc[1]+'dd.r4',(ng,ng))],
+                   open_frames(direc[2]+'2d/d.r4',(ng,ng)))
+write_norms('norms_dd_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+dsw=norms[0,:,l2col]
+dgn=norms[1,:,l2col]
 
 # Vertical vorticity:
-sw_file=open(direc[0]+'zz.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(direc[1]+'zz.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(direc[2]+'2d/zeta.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-zsw=np.empty(nframes)
-zgn=np.empty(nframes)
-
-for frame in range(nframes):
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   zsw[frame]=np.sqrt(sumfac*sum((Zsw-Z3d)**2))
-   zgn[frame]=np.sqrt(sumfac*sum((Zgn-Z3d)**2))
+time,norms=compare([open_frames(direc[0]+'zz.r4',(ng,ng)),open_frames(direc[1]+'zz.r4',(ng,ng))],
+                   open_frames(direc[2]+'2d/zeta.r4',(ng,ng)))
+write_norms('norms_zz_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+zsw=norms[0,:,l2col]
+zgn=norms[1,:,l2col]
 
 # Gamma:
-sw_file=open(direc[0]+'gg.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(direc[1]+'gg.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(direc[2]+'2d/g.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-gsw=np.empty(nframes)
-ggn=np.empty(nframes)
-
-for frame in range(nframes):
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   gsw[frame]=np.sqrt(sumfac*sum((Zsw-Z3d)**2))
-   ggn[frame]=np.sqrt(sumfac*sum((Zgn-Z3d)**2))
+time,norms=compare([open_frames(direc[0]+'gg.r4',(ng,ng)),open_frames(direc[1]+'gg.r4',(ng,ng))],
+                   open_frames(direc[2]+'2d/g.r4',(ng,ng)))
+write_norms('norms_gg_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+gsw=norms[0,:,l2col]
+ggn=norms[1,:,l2col]
 
 # Vertical velocity:
-sw_file=open(direc[0]+'ww.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(direc[1]+'ww.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(direc[2]+'2d/w.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-wsw=np.empty(nframes)
-wgn=np.empty(nframes)
-
-for frame in range(nframes):
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   wsw[frame]=np.sqrt(sumfac*sum((Zsw-Z3d)**2))
-   wgn[frame]=np.sqrt(sumfac*sum((Zgn-Z3d)**2))
+time,norms=compare([open_frames(direc[0]+'ww.r4',(ng,ng)),open_frames(direc[1]+'ww.r4',(ng,ng))],
+                   open_frames(direc[2]+'2d/w.r4',(ng,ng)))
+write_norms('norms_ww_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+wsw=norms[0,:,l2col]
+wgn=norms[1,:,l2col]
 
 #=========================================================================
 # Plot results in the appropriate panel:
@@ -207,8 +138,8 @@ plt.tight_layout(pad=1.0, w_pad=1.0, h_pad=1.0)
 # Save figure:
 fig.savefig(outfile, format='eps', dpi=1200)
 
-print
-print ' To view the image, type'
-print
-print ' gv ',outfile
-print
+print()
+print(' To view the image, type')
+print()
+print(' gv ',outfile)
+print()
@@ -4,7 +4,7 @@
 # for the SW, GN and VA models.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -84,28 +86,28 @@ dirgn='../plane/gn/hbar0.4ng256ld0.5/'
 dirva='../plane/va/hbar0.4ng256ld0.5/'
 
 # Select data to compare:
-print ' Choose one of the following fields to plot:'
-print
-print ' (1) h;  (2) zeta;  (3) delta;  (4) gamma-tilde;  (5) P_n'
-print
-iopt=int(raw_input(' Choice (default 3): ') or 3)
-print
+print(' Choose one of the following fields to plot:')
+print()
+print(' (1) h;  (2) zeta;  (3) delta;  (4) gamma-tilde;  (5) P_n')
+print()
+iopt=int(input(' Choice (default 3): ') or 3)
+print()
 
-t=float(raw_input(' Time to compare (default 25): ') or 25)
-print
+t=float(input(' Time to compare (default 25): ') or 25)
+print()
 
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
+ng=int(input(' Resolution (default 256)? ') or 256)
 N=ng*ng
-print
+print()
 
-hbar=float(raw_input('Mean depth H (default 0.4)? ') or 0.4)
-print
+hbar=float(input('Mean depth H (default 0.4)? ') or 0.4)
+print()
 
 # Open input files:
-in_file3d=open(dir3d+'h.r4','r')
-in_filesw=open(dirsw+'hh.r4','r')
-in_filegn=open(dirgn+'hh.r4','r')
-in_fileva=open(dirva+'hh.r4','r')
+in_file3d=FrameFile(dir3d+'h.r4',N,np.float32)
+in_filesw=FrameFile(dirsw+'hh.r4',N,np.float32)
+in_filegn=FrameFile(dirgn+'hh.r4',N,np.float32)
+in_fileva=FrameFile(dirva+'hh.r4',N,np.float32)
 
 if iopt == 1:
    title_label='$\\tilde{h}$'
@@ -173,18 +175,18 @@ fig.suptitle(title_label, fontsize=32)
 
 # 3D data:
 Z0=np.empty([ng+1,ng+1])
-raw_array=np.fromfile(in_file3d,dtype=np.float32)
+raw_array=in_file3d[frame]
 in_file3d.close()
-Z0[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z0[0:ng,0:ng]=raw_array.reshape(ng,ng).T
 # Add periodic edges:
 Z0[ng,0:ng]=Z0[0,0:ng]
 Z0[0:ng+1,ng]=Z0[0:ng+1,0]
 
 # SW data:
 Z1=np.empty([ng+1,ng+1])
-raw_array=np.fromfile(in_filesw,dtype=np.float32)
+raw_array=in_filesw[frame]
 in_filesw.close()
-Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z1[0:ng,0:ng]=raw_array.reshape(ng,ng).T
 Z1[ng,0:ng]=Z1[0,0:ng]
 Z1[0:ng+1,ng]=Z1[0:ng+1,0]
 # Compute differences from the vertically-averaged 3D field:
@@ -199,9 +201,9 @@ zmax1=zmag
 
 # GN data:
 Z2=np.empty([ng+1,ng+1])
-raw_array=np.fromfile(in_filegn,dtype=np.float32)
+raw_array=in_filegn[frame]
 in_filegn.close()
-Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z2[0:ng,0:ng]=raw_array.reshape(ng,ng).T
 Z2[ng,0:ng]=Z2[0,0:ng]
 Z2[0:ng+1,ng]=Z2[0:ng+1,0]
 # Compute differences from the vertically-averaged 3D field:
@@ -216,9 +218,9 @@ zmax2=zmag
 
 # VA data:
 Z3=np.empty([ng+1,ng+1])
-raw_array=np.fromfile(in_fileva,dtype=np.float32)
+raw_array=in_fileva[frame]
 in_fileva.close()
-Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z3[0:ng,0:ng]=raw_array.reshape(ng,ng).T
 Z3[ng,0:ng]=Z3[0,0:ng]
 Z3[0:ng+1,ng]=Z3[0:ng+1,0]
 # Compute differences from the vertically-averaged 3D field:
@@ -275,8 +277,8 @@ cbar=fig.colorbar(im3, cax=cax)
 outfile='cross_'+field+'_H{x:.1f}'.format(x=hbar)+'n'+str(ng)+'t{x:.0f}'.format(x=t)+'.eps'
 fig.savefig(outfile, format='eps', dpi=1200)
 
-print
-print ' To view the image, type'
-print
-print ' gv',outfile,'&'
-print
+print()
+print(' To view the image, type')
+print()
+print(' gv',outfile,'&')
+print()
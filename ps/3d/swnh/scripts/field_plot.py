@@ -17,6 +17,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -78,26 +80,24 @@ def contint(fmin,fmax):
     return ci
 
 #===========================================================================
-print
-nx=int(raw_input(' Grid resolution (default 256)? ') or 256)
+print()
+nx=int(input(' Grid resolution (default 256)? ') or 256)
 ng=nx
 N=ng*ng
 #dpi=int(raw_input(' DPI to save plot with (default 600)? ') or 600)
 dpi=300
 
-field=str(raw_input(' Field to show (a, d, g, h, g, q or zeta; default d)? ') or 'd')
+field=str(input(' Field to show (a, d, g, h, g, q or zeta; default d)? ') or 'd')
 
-frame=int(raw_input(' Frame to show (1, 2, ...; default 51)? ') or 51)
-yam=int(raw_input(' Max |y| to show (default 1)? ') or 1.0)
-cbopt=str(raw_input(' Add a colourbar (default y)? ') or 'y')
+frame=int(input(' Frame to show (1, 2, ...; default 51)? ') or 51)
+yam=int(input(' Max |y| to show (default 1)? ') or 1.0)
+cbopt=str(input(' Add a colourbar (default y)? ') or 'y')
 
 # Read data:
-in_file=open('../3d/swnh/ng'+str(ng)+'ld0.5r001/2d/'+field+'.r4','r')
-raw_array=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
+raw_array=FrameFile('../3d/swnh/ng'+str(ng)+'ld0.5r001/2d/'+field+'.r4',N,np.float32)
 
 Z=np.empty([ng+1,ng+1])
-Z[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+Z[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 # Add periodic edges:
 Z[ng,0:ng]=Z[0,0:ng]
@@ -156,8 +156,8 @@ else:
 # Save image:
 fig.savefig(field+str(frame)+'.eps', format='eps', dpi=dpi, bbox_inches = 'tight')
 
-print
-print ' To view the image, type'
-print
-print ' gv '+field+str(frame)+'.eps'
-print
+print()
+print(' To view the image, type')
+print()
+print(' gv '+field+str(frame)+'.eps')
+print()
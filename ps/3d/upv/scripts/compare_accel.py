@@ -4,7 +4,7 @@
 # from simulations initially balanced or imbalanced.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -16,6 +16,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -78,17 +80,17 @@ def contint(fmin,fmax):
 
 #=================================================================
 # Select data to compare:
-print
-iopt=int(raw_input(' Model type: (1) GN or (2) 3D (default 1)? ') or 1)
+print()
+iopt=int(input(' Model type: (1) GN or (2) 3D (default 1)? ') or 1)
 
-print
-print ' The times to be shown are t = 0, 0.5, 1, 1.5, 3, 5, 15 and 20.'
+print()
+print(' The times to be shown are t = 0, 0.5, 1, 1.5, 3, 5, 15 and 20.')
 times=np.array([0.0,0.5,1.0,1.5,3.0,5.0,15.0,20.0])
 title=['$t=0$','$t=0.5$','$t=1$','$t=1.5$','$t=3$','$t=5$','$t=15$','$t=20$']
 
-print
-ng=int(raw_input(' Resolution (default 512)? ') or 512)
-print
+print()
+ng=int(input(' Resolution (default 512)? ') or 512)
+print()
 
 # Total number of grid points:
 N=ng*ng
@@ -112,12 +114,10 @@ for t in times:
 # Read in all data to get max abs value for imaging:
 d=np.empty((8,ng+1,ng+1))
 
-in_file=open(indata,'r')
-raw_array=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
+raw_array=FrameFile(indata,N,np.float32)
 for i in range(8):
    frame=frames[i]
-   d[i,0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   d[i,0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
 # Add periodic edges:
 for i in range(8):
@@ -131,11 +131,11 @@ d=np.log10(d+1.e-20)
 dmin = d.min()
 dmax = d.max()
 
-print
-print '     The minimum log_10(accel) = ',dmin
-print ' and the maximum log_10(accel) = ',dmax
+print()
+print('     The minimum log_10(accel) = ',dmin)
+print(' and the maximum log_10(accel) = ',dmax)
 dmind=dmax-5.0
-dmin=int(raw_input(' Minimum value to use in the plot (default '+str(dmind)+')? ') or dmind)
+dmin=int(input(' Minimum value to use in the plot (default '+str(dmind)+')? ') or dmind)
 
 # Obtain contour levels for plotting the colorbar:
 dd=contint(dmin,dmax)
@@ -189,13 +189,13 @@ setp(cbar.ax.xaxis.set_ticklabels(clevels), fontsize=24)
 #=========================================================================
 # Save image:
 
-print
-print ' To view the image, type'
-print
+print()
+print(' To view the image, type')
+print()
 if iopt == 1:
    fig.savefig('a_gn'+str(ng)+'.eps', format='eps', dpi=300)
-   print ' gv a_gn'+str(ng)+'.eps'
+   print(' gv a_gn'+str(ng)+'.eps')
 else:
    fig.savefig('a_3d'+str(ng)+'.eps', format='eps', dpi=300)
-   print ' gv a_3d'+str(ng)+'.eps'
-print
+   print(' gv a_3d'+str(ng)+'.eps')
+print()
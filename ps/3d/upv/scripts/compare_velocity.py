@@ -6,7 +6,7 @@
 # NOTE: The differences SW-3D and GN-3D are plotted.
 
 #========== Perform the generic imports =========
-import warnings
+import sys,os,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -18,6 +18,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -84,14 +86,14 @@ field_list=['u','v']
 field_2d=['uu','vv']
 field_3d=['u','v']
 
-print
+print()
 t_list=[5.0,15.0,25.0]
-print ' Showing times ',t_list[0],', ',t_list[1],' and ',t_list[2]
+print(' Showing times ',t_list[0],', ',t_list[1],' and ',t_list[2])
 t_list=np.array(t_list)
 
-print
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
-print
+print()
+ng=int(input(' Resolution (default 256)? ') or 256)
+print()
 
 # Define grid:
 #xg=np.linspace(-np.pi,np.pi,ng+1)
@@ -117,7 +119,7 @@ for t in t_list:
 
 #=================================================================
 # Loop over fields (u & v):
-print ' To view the images, type'
+print(' To view the images, type')
 for k in range(len(field_list)):
 # Set up figure:
    fig, ((ax1, ax2, ax3), (ax4, ax5, ax6)) = plt.subplots(figsize=[20,13], nrows=2, ncols=3)
@@ -185,20 +187,14 @@ for k in range(len(field_list)):
    Z3=np.empty([ng+1,ng+1])
 
    # Read full fields in all directories:
-   in_file=open(direc[0]+acro2+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[0]+acro2+'.r4',N,np.float32)
+   Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-   in_file=open(direc[1]+acro2+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[1]+acro2+'.r4',N,np.float32)
+   Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-   in_file=open(direc[2]+acro3+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[2]+acro3+'.r4',N,np.float32)
+   Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
    # Add periodic edges:
    Z1[ng,0:ng]=Z1[0,0:ng]
@@ -259,20 +255,14 @@ for k in range(len(field_list)):
    Z3=np.empty([ng+1,ng+1])
 
    # Read full fields in all directories:
-   in_file=open(direc[0]+acro2+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[0]+acro2+'.r4',N,np.float32)
+   Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-   in_file=open(direc[1]+acro2+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[1]+acro2+'.r4',N,np.float32)
+   Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-   in_file=open(direc[2]+acro3+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[2]+acro3+'.r4',N,np.float32)
+   Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
    # Add periodic edges:
    Z1[ng,0:ng]=Z1[0,0:ng]
@@ -333,20 +323,14 @@ for k in range(len(field_list)):
    Z3=np.empty([ng+1,ng+1])
 
    # Read full fields in all directories:
-   in_file=open(direc[0]+acro2+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z1[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[0]+acro2+'.r4',N,np.float32)
+   Z1[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-   in_file=open(direc[1]+acro2+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z2[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[1]+acro2+'.r4',N,np.float32)
+   Z2[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
-   in_file=open(direc[2]+acro3+'.r4','r')
-   raw_array=np.fromfile(in_file,dtype=np.float32)
-   in_file.close()
-   Z3[0:ng,0:ng]=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(ng,ng).T
+   raw_array=FrameFile(direc[2]+acro3+'.r4',N,np.float32)
+   Z3[0:ng,0:ng]=raw_array[frame].reshape(ng,ng).T
 
    # Add periodic edges:
    Z1[ng,0:ng]=Z1[0,0:ng]
@@ -401,4 +385,4 @@ for k in range(len(field_list)):
    # Save image:
    fig.savefig(outfile, format='eps', dpi=300)
 
-   print ' gv',outfile
+   print(' gv',outfile)
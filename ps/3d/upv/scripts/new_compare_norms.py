@@ -6,7 +6,7 @@
 # The data directories are specified below
 
 #========== Perform the generic imports =========
-import warnings
+import os,sys,warnings
 import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -18,6 +18,9 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import open_frames
+from pyio.norms import COLUMNS, compare, write_norms
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -46,95 +49,36 @@ dir3d='../3d/swnh/hbar0.4ng256ld0.5/2d/'
 dirsw='../plane/sw/ng256/'
 dirgn='../plane/gn/hbar0.4ng256ld0.5/'
 
-ng=int(raw_input(' Resolution (default 256)? ') or 256)
-N=ng*ng
-print
+ng=int(input(' Resolution (default 256)? ') or 256)
+print()
 
-hbar=float(raw_input('Mean depth H (default 0.4)? ') or 0.4)
-print
+hbar=float(input('Mean depth H (default 0.4)? ') or 0.4)
+print()
 
-# Read field data and compute rms differences:
-Zsw=np.empty(N)
-Zgn=np.empty(N)
-Z3d=np.empty(N)
+# Read field data and compute relative rms differences (all norms of
+# each field are also written to norms_<field>_n<ng>.asc):
+l2col=COLUMNS.index('rel_l2')
 
 # Height anomaly:
-sw_file=open(dirsw+'hh.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(dirgn+'hh.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(dir3d+'h.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-time=np.empty(nframes)
-hsw=np.empty(nframes)
-hgn=np.empty(nframes)
-
-for frame in range(nframes):
-   time[frame]=sw_array[frame*(N+1)]
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   hsw[frame]=np.sqrt(sum((Zsw-Z3d)**2)/sum(Z3d**2))
-   hgn[frame]=np.sqrt(sum((Zgn-Z3d)**2)/sum(Z3d**2))
+time,norms=compare([open_frames(dirsw+'hh.r4',(ng,ng)),open_frames(dirgn+'hh.r4',(ng,ng))],
+                   open_frames(dir3d+'h.r4',(ng,ng)))
+write_norms('norms_hh_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+hsw=norms[0,:,l2col]
+hgn=norms[1,:,l2col]
 
 # Relative vorticity:
-sw_file=open(dirsw+'zz.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(dirgn+'zz.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(dir3d+'zeta.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-time=np.empty(nframes)
-zsw=np.empty(nframes)
-zgn=np.empty(nframes)
-
-for frame in range(nframes):
-   time[frame]=sw_array[frame*(N+1)]
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   zsw[frame]=np.sqrt(sum((Zsw-Z3d)**2)/sum(Z3d**2))
-   zgn[frame]=np.sqrt(sum((Zgn-Z3d)**2)/sum(Z3d**2))
+time,norms=compare([open_frames(dirsw+'zz.r4',(ng,ng)),open_frames(dirgn+'zz.r4',(ng,ng))],
+                   open_frames(dir3d+'zeta.r4',(ng,ng)))
+write_norms('norms_zz_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+zsw=norms[0,:,l2col]
+zgn=norms[1,:,l2col]
 
 # Divergence:
-sw_file=open(dirsw+'dd.r4','r')
-sw_array=np.fromfile(sw_file,dtype=np.float32)
-sw_file.close()
-
-gn_file=open(dirgn+'dd.r4','r')
-gn_array=np.fromfile(gn_file,dtype=np.float32)
-gn_file.close()
-
-three_file=open(dir3d+'d.r4','r')
-three_array=np.fromfile(three_file,dtype=np.float32)
-three_file.close()
-
-nframes = int(len(sw_array)/(N+1))
-time=np.empty(nframes)
-dsw=np.empty(nframes)
-dgn=np.empty(nframes)
-
-for frame in range(nframes):
-   time[frame]=sw_array[frame*(N+1)]
-   Zsw=sw_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Zgn=gn_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   Z3d=three_array[frame*(N+1)+1:(frame+1)*(N+1)]
-   dsw[frame]=np.sqrt(sum((Zsw-Z3d)**2)/sum(Z3d**2))
-   dgn[frame]=np.sqrt(sum((Zgn-Z3d)**2)/sum(Z3d**2))
+time,norms=compare([open_frames(dirsw+'dd.r4',(ng,ng)),open_frames(dirgn+'dd.r4',(ng,ng))],
+                   open_frames(dir3d+'d.r4',(ng,ng)))
+write_norms('norms_dd_n'+str(ng)+'.asc',time,norms,['SW','GN'])
+dsw=norms[0,:,l2col]
+dgn=norms[1,:,l2col]
 
 #=================================================================
 # Set up figure:
@@ -195,8 +139,8 @@ ax1.text( 0.06, 0.84, '$H = {x:.1f}$'.format(x=hbar), transform=ax1.transAxes, f
 outfile='hzd_rmsdiff_H{x:.1f}'.format(x=hbar)+'n'+str(ng)+'.eps'
 fig.savefig(outfile, format='eps', dpi=1200)
 
-print
-print ' To view the image, type'
-print
-print ' gv',outfile,'&'
-print
+print()
+print(' To view the image, type')
+print()
+print(' gv',outfile,'&')
+print()
@@ -17,6 +17,8 @@ from matplotlib import rcParams
 from matplotlib import rc
 rcParams.update({'figure.autolayout': True})
 warnings.simplefilter("ignore",DeprecationWarning)
+sys.path.append(os.path.expandvars('${HOME}/hydra/lib/'))
+from pyio.frames import FrameFile
 
 # Ensure latex fonts throughout:
 rc('font', **{'family': 'Times New Roman'})
@@ -124,12 +126,10 @@ print(' Plotting time',time[frame])
 
 #-----------------------------------------------------------------
 # Read data into array for plotting:
-in_file=open(fname,'r')
-raw_array=np.fromfile(in_file,dtype=np.float32)
-in_file.close()
-Z=np.empty([nx,ny])
 N=nx*ny
-Z=raw_array[frame*(N+1)+1:(frame+1)*(N+1)].reshape(nx,ny)
+raw_array=FrameFile(fname,N,np.float32)
+Z=np.empty([nx,ny])
+Z=raw_array[frame].reshape(nx,ny)
 
 # Work out the overall min/max values:
 zmin=np.amin(Z)